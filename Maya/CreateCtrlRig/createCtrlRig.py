@@ -1,7 +1,9 @@
 '''
 This script is for making a control rig based off user input.
+The rig is made by ctrlRigBuilder, buildRig makes one without the UI.
 It contains these functions:
     - getMayaWindow()
+    - warn(text)
     - makeUI()
     - connectSignals()
     - makeTitleLabel(label, page)
@@ -29,10 +31,17 @@ It contains these functions:
     - parentCtrls()
     - enable()
     - getJoint(dropDown)
+    - sendToDaemon()
+    - buttonName(ids, checkedId)
+    - buildCtrls(controlType, startJoint, endJoint, middleJoint, ctrlColor, scaleFactor, poleVectorPostion)
+    - buildWorldCtrl(scaleFactor)
+    - buildCog(cogJoint, scaleFactor)
+    - buildRig(chains, worldScale, cogJoint, cogScale)
 '''
 #------------------
 #Imports
 #------------------
+import os
 import pymel.core as pm 
 import maya.OpenMayaUI as omui
 
@@ -45,6 +54,11 @@ except:
     from shiboken import wrapInstance
     from PySide import QtCore
     from PySide import QtGui as QtWidgets 
+
+#the ids of the UI's radio buttons, a button group numbers its buttons from -2 in the order they are added
+CONTROL_TYPES = {'fk': -2, 'ik': -3, 'ikFk': -4}
+CONTROL_LOCATIONS = {'middle': -2, 'right': -3, 'left': -4, 'extra': -5}
+POLE_VECTOR_POSTIONS = {'front': -2, 'back': -3, 'right': -4, 'left': -5}
     
 #------------------
 #General Functions
@@ -55,92 +69,562 @@ def getMayaWindow():
     mayaWindowptr = omui.MQtUtil.mainWindow()
     window = wrapInstance(long(mayaWindowptr), QtWidgets.QWidget)
     return window 
+
+#gets the name of a radio button id in CONTROL_TYPES, CONTROL_LOCATIONS or POLE_VECTOR_POSTIONS, None if none is checked
+def buttonName(ids, checkedId):
+    for name in ids:
+        if ids[name] == checkedId:
+            return name
+    return None
     
 #------------------
 #Class
 #------------------
 
-class ctrlRigUI(QtWidgets.QMainWindow):
-    def __init__(self, parent = getMayaWindow()):
-        super(ctrlRigUI, self).__init__(parent)
-        self.makeUI()
-        self.populateJointDropdowns()
-        self.enable()
-        self.connectSignals()
-        self.show()
-    
-    def makeUI(self):
-        #list to keep track of dropdowns created
-        self.dropdownList = []
-        #makes the main window
-        self.window = QtWidgets.QWidget()
-        self.setWindowTitle('Make Control Rig')
-        self.window.resize(600, 550)
-        self.window.setMaximumSize(600, 620)
-        self.window.setMinimumSize(600, 620)
-        self.verticalWindowLayout = QtWidgets.QVBoxLayout(self.window)
-        
-        #makes a frame
-        self.frame = QtWidgets.QFrame(self.window)
-        self.frame.setFrameShape(QtWidgets.QFrame.StyledPanel)
-        self.verticalFrameLayout = QtWidgets.QHBoxLayout(self.frame)
-        self.verticalWindowLayout.addWidget(self.frame)
+#this class makes the rig, ctrlRigUI gives it the joints and settings from the UI and buildRig gives them without it
+class ctrlRigBuilder(object):
+    def __init__(self):
+        #the warnings given while making the rig, a build without the UI returns them
+        self.warnings = []
+        self.worldCtrl = None
 
-        self.verticalMidLayout = QtWidgets.QVBoxLayout()
-        self.verticalFrameLayout.addLayout(self.verticalMidLayout)
+    #tells the user what is wrong, without the UI it is a maya warning
+    def warn(self, text):
+        self.warnings.append(text)
+        pm.warning(text)
 
-        #make control
-        self.makeLine(self.verticalMidLayout)
-        self.makeTitleLabel('Make Controls', self.verticalMidLayout)
-        self.makeLine(self.verticalMidLayout)
-        
-        self.spacer6 = QtWidgets.QSpacerItem(480, 10)
-        self.verticalMidLayout.addItem(self.spacer6) 
+    #this function finds all the joints in the scene 
+    def findJoints(self):
+        #gets all objects with type joint in the scene
+        joints = pm.ls(et = 'joint')
+        return joints
+
+    #duplicates joints based off given joint list
+    def duplicateJoints(self, jointList, prefix):
+        dupJointList = []
+        #duplicates all joints in joint list without their children and adds them to a list
+        for joint in jointList:
+            dupJoint = pm.duplicate(joint, name = prefix + str(joint), po = True)
+            pm.parent(dupJoint[0], world = True)
+            dupJointList.append(dupJoint)
         
-        #control type
-        self.ctrlTypeHorizontalLayout = QtWidgets.QHBoxLayout()
-        self.verticalMidLayout.addLayout(self.ctrlTypeHorizontalLayout)
+        #parents the joints together     
+        for i in range(len(dupJointList) -1):
+            prnt = dupJointList[i +1]
+            child = dupJointList[i]
+            self.parentObject(prnt[0], child[0])
+            
+        #hides the created joints to clean up the viewport
+        pm.hide(dupJointList[len(dupJointList) - 1])
         
-        #makes a label for the control type row
-        self.ctrlTypeLabel = QtWidgets.QLabel()
-        self.ctrlTypeLabel.setText('Control Type:')
-        self.ctrlTypeHorizontalLayout.addWidget(self.ctrlTypeLabel)
+        #returns the duplicated joints
+        return dupJointList
+
+    #makes Ik handle for given start and end joints
+    def makeIk(self, ctrlType):
+        if self.startJoint == self.endJoint:
+            self.warn('Can\'t make an Ik chain one joint in length. Please select two different joints to continue.')
+            #deletes the created control joints that were made by the make controls function
+            ctrlJoint = self.findCtrlJoint(self.startJoint)
+            pm.delete(ctrlJoint)
+        else:
+            #makes joints to be driven by ik controls directly 
+            ikJoints = self.duplicateJoints(self.jointList, 'IK_')
+            #for the joints in the list of ikJoints
+            for j in range(len(ikJoints)):
+                #if not being used for an IK/FK switch constrain control joints
+                if self.switch == False:
+                    ctrlJoint = self.findCtrlJoint(self.jointList[j])
+                    self.parentConstrainObject(ikJoints[j], ctrlJoint)
+       
+            #makes the Ik handle
+            handle = pm.ikHandle(sj = ikJoints[len(ikJoints) - 1][0], ee = ikJoints[0][0])
+            #hides the handle to clean up the veiwport
+            pm.hide(handle[0])
         
-        self.spacer10 = QtWidgets.QSpacerItem(40, 10)
-        self.ctrlTypeHorizontalLayout.addItem(self.spacer10)
+            #makes a control 
+            ctrl = self.getSetPostion((10.0 * self.scaleFactor), 'IK_' + str(self.endJoint), self.endJoint, ctrlType)
+            
+            #hides attributes on the ik control that the user doesn't need
+            attrList = ['scaleX', 'scaleY', 'scaleZ', 'visibility']
+            for attr in attrList:
+                pm.setAttr(str(ctrl[1][0]) + '.' + attr,  k = False, cb = False)
+            
+            #parents the IK handle under the ctrl 
+            self.parentObject(ctrl[1][0], handle[0])
+            
+            #makes a control for the pole vector 
+            poleCtrl = self.getSetPostion((5.0 * self.scaleFactor), 'IK' + str(self.middleJoint) + '_Pole_Vector', self.middleJoint, ctrlType)
+            
+            #hides attributes the pole vector control doesn't need 
+            for attr in attrList:
+                pm.setAttr(str(poleCtrl[1][0]) + '.' + attr,  k = False, cb = False)
+            
+            #finds offset group for the pole vector control
+            children = pm.listRelatives(poleCtrl[0], ad = True)
+            offset = children[len(children)-1]
+            
+            #gets the world space postion of the joint to use for placing the pole vector 
+            jointTrans = pm.xform(self.middleJoint, query = True, ws = True, t = True)
+            #determines the x, y and z values to move the pole vector control based off user selection 
+            #if the user selected front 
+            if self.poleVectorPostion == -2:
+                x = jointTrans[0]
+                y = jointTrans[1]
+                z = (100 * self.scaleFactor)
+            #if the user selected back
+            elif self.poleVectorPostion == -3:
+                x = jointTrans[0]
+                y = jointTrans[1]
+                z = (-100 * self.scaleFactor)
+            #if the user selcted right 
+            elif self.poleVectorPostion == -4:
+                x = (-100 * self.scaleFactor)
+                y = jointTrans[1]
+                z = jointTrans[2]
+            #if the user selcted left 
+            elif self.poleVectorPostion == -5:
+               x = (100 * self.scaleFactor)
+               y = jointTrans[1]
+               z = jointTrans[2]
+           #if the user didn't make a selection gives a warning 
+            else:
+               self.warn('No pole vector postion selected. Please select a pole vector postion to continue.')
+              
+               #removes non functioning partial rig
+               pm.delete(ikJoints)
+               pm.delete(poleCtrl)
+               pm.delete(ctrl)
+               ctrlJoint = self.findCtrlJoint(self.startJoint)
+               pm.delete(ctrlJoint)
+               return
+            
+            #moves the pole vector
+            pm.xform(offset, ws = True, t = (x,y,z))
+            #constrains the ik handle to the pole vector 
+            pm.poleVectorConstraint(poleCtrl[1][0], handle[0])
+                  
+            #makes a control for the top of the ik chain and constrains the ik chain to it 
+            topCtrl = self.getSetPostion((10.0 * self.scaleFactor), 'Ik_' + str(self.startJoint), self.startJoint, ctrlType)
+            self.parentConstrainObject(topCtrl[1][0], ikJoints[len(ikJoints) - 1])
+            
+            #locks and hides unnecessary attributes from the control
+            for attr in attrList:
+                pm.setAttr(str(topCtrl[1][0]) + '.' + attr, k = False, cb = False)
+               
+            #tries to find a child joint to make a secondary ik handle to enable rotation of the end of the ik chain
+            try:
+                #finds the children of the end joint 
+                childJoint = pm.listRelatives(self.endJoint, c = True, type = 'joint')[0]
+                childJointList = [childJoint]
+                
+                #makes an ik joint and parents it to the rest of the ik chain 
+                ikChildJoint = self.duplicateJoints(childJointList, 'IK_')
+                self.parentObject(ikJoints[0][0], ikChildJoint[0])
         
-        #makes a button group to contain the control type buttons
-        self.ctrlTypeButtonGroup = QtWidgets.QButtonGroup()
+                #makes an ik handle and parents it the other handle to enable rotation at the end of the ik chain 
+                ikChildHandle = pm.ikHandle(sj = ikJoints[0][0], ee = ikChildJoint[0][0])
+                self.parentObject(handle[0], ikChildHandle[0])
+                
+                #hides the ik handles 
+                pm.hide(ikChildHandle[0])
+            
+            #if there are no child joints lets the user know that rotation won't work but leaves the control    
+            except:
+                self.warn('No child joints after the end of the IK chain. The control on the end of the chain will not be able to rotate.')
+
+            #returns the list of ik joints and all the controls for use in ik/fk switching function
+            return ikJoints, ctrl, poleCtrl, topCtrl
+
+    #parents objects given a parent and a child object        
+    def parentObject(self, parentObject, childObject):
+        pm.parent(childObject, parentObject)
+
+    #parent constrains 2 objects
+    def parentConstrainObject(self, parent, child):
+        pm.parentConstraint(parent, child)
+
+    #this function makes controls using nurbs circles     
+    def makeCtrl(self, radius = 50, name = 'circle', ctrlType = ''):
+        #makes a nurbs circle
+        ctrl = pm.circle(r = radius,n = name + '_ctrl', nr = (1.0, 0.0, 0.0))
         
-        #makes a fk button and label
-        self.fkButton = QtWidgets.QRadioButton()
-        self.ctrlTypeButtonGroup.addButton(self.fkButton) 
-        self.ctrlTypeHorizontalLayout.addWidget(self.fkButton)
-        self.fkLabel = QtWidgets.QLabel()
-        self.fkLabel.setText('FK')
-        self.ctrlTypeHorizontalLayout.addWidget(self.fkLabel)
-        self.spacer11 = QtWidgets.QSpacerItem(40, 10)
-        self.ctrlTypeHorizontalLayout.addItem(self.spacer11)
+        #gets the shape associated with the control 
+        shape = pm.listRelatives(ctrl, ad = True, s = True)
+        #allows color to be changed 
+        pm.setAttr(shape[0] + '.overrideEnabled', True)
+        #if it's a middle control make it yellow
+        if ctrlType == -2:
+            pm.setAttr(shape[0] + '.overrideColor', 17)
+        #if it's a right control make it red
+        elif ctrlType == -3:
+            pm.setAttr(shape[0]+'.overrideColor', 13)
+        #if it's a left control make it blue
+        elif ctrlType == -4:
+            pm.setAttr(shape[0] + '.overrideColor', 6)
+        #if it's an extra control or the user didn't specify make it green 
+        else:
+            pm.setAttr(shape[0] + '.overrideColor', 14)
+            
+        #make offset and parent groups 
+        offset = pm.group(ctrl, n = 'offset_' + name)
+        prnt = pm.group(offset, n = 'prnt_' + name)
         
-        #makes an ik button and label
-        self.ikButton = QtWidgets.QRadioButton()
-        self.ctrlTypeButtonGroup.addButton(self.ikButton) 
-        self.ctrlTypeHorizontalLayout.addWidget(self.ikButton)
-        self.ikLabel = QtWidgets.QLabel()
-        self.ikLabel.setText('IK')
-        self.ctrlTypeHorizontalLayout.addWidget(self.ikLabel)
-        self.spacer12 = QtWidgets.QSpacerItem(40, 10)
-        self.ctrlTypeHorizontalLayout.addItem(self.spacer12)
+        #returns parent group and the circle object
+        return prnt, ctrl
+
+    #places controls around joint   
+    def getSetPostion(self, radius, name, joint, ctrlType):
+        ctrl = self.makeCtrl(radius, name, ctrlType)
         
-        #makes an ik/fk button and label
-        self.ikFkButton = QtWidgets.QRadioButton()
-        self.ctrlTypeButtonGroup.addButton(self.ikFkButton) 
-        self.ctrlTypeHorizontalLayout.addWidget(self.ikFkButton)
-        self.ikFkLabel = QtWidgets.QLabel()
-        self.ikFkLabel.setText('IK/FK')
-        self.ctrlTypeHorizontalLayout.addWidget(self.ikFkLabel)
-        self.spacer13 = QtWidgets.QSpacerItem(120, 10)
-        self.ctrlTypeHorizontalLayout.addItem(self.spacer13)
+        #gets joint translation 
+        t = pm.xform(joint, translation = True, query = True, ws = True)
+        #gets joint rotation
+        r = pm.xform(joint, rotation = True, query = True, ws = True)
+       
+        #places the control 
+        pm.move(ctrl[0], t)
+        pm.rotate(ctrl[0], (r[0], r[1], r[2]))
+        return ctrl
+
+    #this function sets up an fk control given a skinning joint 
+    def makeFKCtrl(self, skJoint, fkJoint, name, ctrlType):
+        joint = self.findCtrlJoint(skJoint)
+        
+        #if this chain is not for an IK/FK switch parent constrain control joint to the fk joint 
+        if self.switch == False:
+            #constrains the control joint to the fk joint 
+            self.parentConstrainObject(fkJoint, joint)
+        
+        #makes a control and places it on the fk joint
+        ctrl = self.getSetPostion((10.0 * self.scaleFactor), name, fkJoint, ctrlType)
+        #constrains the fk joint to the fk control 
+        self.parentConstrainObject(ctrl[1], fkJoint)
+        
+        #hides unnecessary attributes on the control 
+        attrList = ['translateX', 'translateY', 'translateZ', 'scaleX', 'scaleY', 'scaleZ', 'visibility']
+        for attr in attrList:
+            pm.setAttr(str(ctrl[1][0]) + '.' + attr, k = False, cb = False)
+        
+        return ctrl
+
+    #makes a chain of fk controls for all the specified joint and it's children     
+    def makeFKChain(self, ctrlType):
+        #makes joints to be driven by fk controls directly 
+        fkJoints = self.duplicateJoints(self.jointList, 'FK_')
+
+        #ctrlList will contain ctrl and prnt groups 
+        #starting with bottom of the chain 
+        self.ctrlList = []
+        #makes controls and adds there prnt groups and ctrls to a list
+        for joint in range(len(fkJoints)):
+            childName = str(fkJoints[joint][0])
+            childCtrl = self.makeFKCtrl(self.jointList[joint], fkJoints[joint], childName, ctrlType)
+            self.ctrlList.append(childCtrl)
+        
+        #parents the fk controls together 
+        for i in range(len(self.ctrlList)-1):
+            prnt = self.ctrlList[i +1]
+            child = self.ctrlList[i]
+            self.parentObject(prnt[1][0], child[0])
+            
+        return fkJoints
+
+    #makes a control to hold an IK, FK switch 
+    def makeIkFkSwitchCtrl(self, name, ctrlType):
+        ctrl = self.makeCtrl((5.0 * self.scaleFactor), name, ctrlType)
+        #gets all the keyable attributes(ones found in channel box)
+        channelAttr =  pm.listAttr(ctrl[1][0], k = True)
+        #this locks and hides the attributes 
+        for attr in channelAttr:
+            pm.setAttr(ctrl[1][0] + '.' + attr, l = True, k = False, cb = False)
+        #adds attribute for IK/FK switch      
+        pm.addAttr(ctrl[1][0], ln = 'IK_FK_Switch', at = 'float', max = 1.0, min = 0.0, k = True)
+        return ctrl
+
+    #makes an Ik/Fk switch     
+    def ikFkSwitch(self, fkJoint, IkJoint, skJoint):
+        #makes a control for the ik/fk switch attribute
+        ctrl = self.makeIkFkSwitchCtrl('Switch', 'Extra')
+
+        #gets the Ik/Fk switch attribute off the Ik/Fk control
+        switchAttr =  pm.listAttr(ctrl[1][0], c = True, k = True)[0]
+
+        #constrains the rest of the joints and keeps track of them in a list
+        constraintList = []
+        for j in range(len(fkJoint)):
+            ctrlJoint = self.findCtrlJoint(self.jointList[j])
+            childC = pm.parentConstraint(fkJoint[j], IkJoint[0][j], ctrlJoint)
+            constraintList.append(childC)
+
+        #make a reverse node
+        reverseNode = pm.shadingNode('reverse', asUtility = True)
+        #connect the switch attribute to the input of the reverse node 
+        pm.connectAttr(ctrl[1][0] + '.' + switchAttr, reverseNode + '.input.inputX')
+       
+        #connect the constraint weights to the fk/ik switch 
+        #also connects control visibility to the switch 
+        for constraint in range(len(constraintList)):
+            attributes = pm.listAttr(constraintList[constraint], c = True, k = True)
+            pm.connectAttr(ctrl[1][0] + '.' + switchAttr, constraintList[constraint] + '.' + attributes[len(attributes) -1])
+            pm.connectAttr(reverseNode + '.output.outputX', constraintList[constraint] + '.' + attributes[len(attributes) -2]) 
+            pm.connectAttr(reverseNode + '.output.outputX', self.ctrlList[constraint][1][0] + '.visibility') 
+            pm.connectAttr(ctrl[1][0] + '.' + switchAttr, IkJoint[constraint + 1][0] + '.visibility')
+    
+        #positions the Ik/Fk switch opposite to the position of the pole vector
+        ctrlJoint = self.findCtrlJoint(skJoint)
+        self.parentConstrainObject(ctrlJoint, ctrl[0])
+        child = pm.listRelatives(ctrl[0], c = True, type = 'transform')
+        offset = child[0]
+        ctrlJointTrans = pm.xform(ctrlJoint, query = True, ws = True, t = True)
+        #if the user picked front
+        if self.poleVectorPostion == -2:
+            x = ctrlJointTrans[0]
+            y = ctrlJointTrans[1]
+            z = (-20 * self.scaleFactor)
+        #if the user picked back 
+        elif self.poleVectorPostion == -3:
+            x = ctrlJointTrans[0]
+            y = ctrlJointTrans[1]
+            z = (20 * self.scaleFactor)
+        #if the user picked right
+        elif self.poleVectorPostion == -4:
+            x = (20 * self.scaleFactor)
+            y = ctrlJointTrans[1]
+            z = ctrlJointTrans[2]
+        #if the user picked left
+        else:
+            x = (-20 * self.scaleFactor)
+            y = ctrlJointTrans[1]
+            z = ctrlJointTrans[2]
+        #places the switch in the world
+        pm.xform(offset, ws = True, t = (x, y, z))
+
+    #duplicates joints to make a ctrl skeleton     
+    def makeCtrlSkeleton(self):
+        #makes joints to be driven by fk controls directly 
+        self.ctrlJoints = self.duplicateJoints(self.jointList, 'ctrl_')
+        
+        for joint in range(len(self.jointList)):
+            self.parentConstrainObject(self.ctrlJoints[joint], self.jointList[joint])
+             
+        return self.ctrlJoints
+
+    #finds ctrl joint to match the given skinning joint      
+    def findCtrlJoint(self, skJoint):
+        skName = str(skJoint)
+        #iterates through the list looking for the corresponding control joint 
+        for j in range(len(self.ctrlJoints)):
+            #if it finds a match it returns the joint
+            if str(self.ctrlJoints[j][0]).endswith(skName) == True:
+                return self.ctrlJoints[j]
+
+    #makes the controls for the joints from the start joint down to the end joint
+    #controlType, ctrlColor and poleVectorPostion are ids from CONTROL_TYPES, CONTROL_LOCATIONS and POLE_VECTOR_POSTIONS
+    def buildCtrls(self, controlType, startJoint, endJoint, middleJoint, ctrlColor, scaleFactor, poleVectorPostion):
+        self.startJoint = startJoint
+        self.endJoint = endJoint
+        self.middleJoint = middleJoint
+        self.scaleFactor = scaleFactor
+        #make a list to hold joints that will have controls 
+        self.jointList = []
+        joint = self.endJoint
+
+        #this gives a list of joints from start to end joint 
+        #gives a complete list of skJoints 
+        while str(self.startJoint) != str(joint):
+            self.jointList.append(joint)
+            jointParent = pm.listRelatives(joint, p = True)[0]
+            joint = jointParent 
+            
+        self.jointList.append(self.startJoint)
+        #finds all the joints currently in the scene
+        jointsInScene = self.findJoints()
+        
+        #Checks to make sure that the joints don't already have controls before rigging them 
+        for joint in self.jointList:
+            ctrlJointName = 'ctrl_' + str(joint)
+            for j in jointsInScene:
+                #if they do have controls gives the user a warning 
+                if str(j) == ctrlJointName:
+                    self.warn('Joints in range of start and end joint already have controls. Pick joints without controls to continue.')
+                    return
+                    
+        self.poleVectorPostion = poleVectorPostion
+
+        #duplicate joints
+        #assume not making an FK/IK switch 
+        self.switch = False
+
+        self.ctrlRoot = self.makeCtrlSkeleton() 
+        
+        #if control type = -3  
+        #make ik controls
+        if controlType == -3:
+            ikJoint = self.makeIk(ctrlColor)    
+
+        #if control type is -4
+        #make an Ik/Fk switch
+        elif controlType == -4:
+            self.switch = True
+            fkJoint = self.makeFKChain(ctrlColor)
+            ikJoint = self.makeIk(ctrlColor) 
+            ctrlJoint = self.findCtrlJoint(self.startJoint)
+            self.ikFkSwitch(fkJoint, ikJoint, self.endJoint)
+            
+        #make fk chain 
+        else: 
+            fkJoint = self.makeFKChain(ctrlColor)
+
+    #makes the world control for the rig             
+    def buildWorldCtrl(self, scaleFactor):
+        #looks to see if there is a world control already in the scene
+        transforms = pm.ls(type = 'transform')
+        worldList = []
+        for trans in range(len(transforms)):
+            if transforms[trans].endswith('World') == True:
+                worldList.append(transforms[trans])
+        #if there is already a world control in the scene give the user a warning
+        if worldList:
+            self.warn('There is already a world control made. There can only be one world control per rig.')
+            return
+        name = 'World'
+        self.worldCtrl = pm.circle(r = (100 * scaleFactor), name = name, nr = (0.0, 1.0, 0.0))
+        
+        #hides attributes on the control that are unnecessary 
+        attrList = ['scaleX', 'scaleY', 'scaleZ', 'visibility']
+        for attr in attrList:
+            pm.setAttr(str(self.worldCtrl[0]) + '.' + attr, l = True, k = False, cb = False)
+            
+        #gets the shape associated with the control 
+        shape = pm.listRelatives(self.worldCtrl, ad = True, s = True)
+        #allows color to be changed 
+        pm.setAttr(shape[0] + '.overrideEnabled', True)
+        pm.setAttr(shape[0] + '.overrideColor', 17)
+            
+        #make offset and parent groups 
+        offset = pm.group(self.worldCtrl, n = 'offset_' + name)
+        prnt = pm.group(offset, n = 'prnt_' + name)
+
+    #function for making the world control     
+    def parentWorld(self):
+        #tries to parent all controls and control joints to the world control 
+        try:
+            #gets list of top level items in the scene
+            topLevelList =  pm.ls(assemblies = True)  
+            list = []
+            #filters through list for all controls and control joints made except for the world control
+            for i in range(len(topLevelList)):
+                if (str(topLevelList[i])[:2] == ('IK')) or (str(topLevelList[i])[:2] == ('FK')) or ((str(topLevelList[i])[:4] == 'prnt') and str(topLevelList[i]).endswith('World') == False)  or (str(topLevelList[i])[:4] == 'ctrl'):
+                    list.append(topLevelList[i])
+    
+            #parents items in the list to the world control 
+            for j in range(len(list)):
+                self.parentObject(self.worldCtrl[0], list[j])
+        #if it fails tells the user that there isn't a world control         
+        except:
+            self.warn('No world control in the scene. Please make a world control to continue.')
+
+    #makes a cog control for the rig on the cog joint
+    def buildCog(self, cogJoint, scaleFactor):
+        #makes the cog control
+        ctrl = self.getSetPostion((25.0 * scaleFactor), 'COG', cogJoint, -2)
+        #locks and hides unnecessary attributes on the control 
+        attrList = ['scaleX', 'scaleY', 'scaleZ', 'visibility']
+        for attr in attrList:
+            pm.setAttr(str(ctrl[1][0]) + '.' + attr, l = True, k = False, cb = False)
+
+#this class makes the UI
+class ctrlRigUI(QtWidgets.QMainWindow, ctrlRigBuilder):
+    def __init__(self, parent = None):
+        super(ctrlRigUI, self).__init__(parent or getMayaWindow())
+        ctrlRigBuilder.__init__(self)
+        self.makeUI()
+        self.populateJointDropdowns()
+        self.enable()
+        self.connectSignals()
+        self.show()
+
+    #tells the user what is wrong in a message box
+    def warn(self, text):
+        self.warnings.append(text)
+        warning = QtWidgets.QMessageBox()
+        warning.setWindowTitle('Warning')
+        warning.setText(text)
+        warning.exec_()
+
+    def makeUI(self):
+        #list to keep track of dropdowns created
+        self.dropdownList = []
+        #makes the main window
+        self.window = QtWidgets.QWidget()
+        self.setWindowTitle('Make Control Rig')
+        self.window.resize(600, 550)
+        self.window.setMaximumSize(600, 670)
+        self.window.setMinimumSize(600, 670)
+        self.verticalWindowLayout = QtWidgets.QVBoxLayout(self.window)
+        
+        #makes a frame
+        self.frame = QtWidgets.QFrame(self.window)
+        self.frame.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.verticalFrameLayout = QtWidgets.QHBoxLayout(self.frame)
+        self.verticalWindowLayout.addWidget(self.frame)
+
+        self.verticalMidLayout = QtWidgets.QVBoxLayout()
+        self.verticalFrameLayout.addLayout(self.verticalMidLayout)
+
+        #make control
+        self.makeLine(self.verticalMidLayout)
+        self.makeTitleLabel('Make Controls', self.verticalMidLayout)
+        self.makeLine(self.verticalMidLayout)
+        
+        self.spacer6 = QtWidgets.QSpacerItem(480, 10)
+        self.verticalMidLayout.addItem(self.spacer6) 
+        
+        #control type
+        self.ctrlTypeHorizontalLayout = QtWidgets.QHBoxLayout()
+        self.verticalMidLayout.addLayout(self.ctrlTypeHorizontalLayout)
+        
+        #makes a label for the control type row
+        self.ctrlTypeLabel = QtWidgets.QLabel()
+        self.ctrlTypeLabel.setText('Control Type:')
+        self.ctrlTypeHorizontalLayout.addWidget(self.ctrlTypeLabel)
+        
+        self.spacer10 = QtWidgets.QSpacerItem(40, 10)
+        self.ctrlTypeHorizontalLayout.addItem(self.spacer10)
+        
+        #makes a button group to contain the control type buttons
+        self.ctrlTypeButtonGroup = QtWidgets.QButtonGroup()
+        
+        #makes a fk button and label
+        self.fkButton = QtWidgets.QRadioButton()
+        self.ctrlTypeButtonGroup.addButton(self.fkButton) 
+        self.ctrlTypeHorizontalLayout.addWidget(self.fkButton)
+        self.fkLabel = QtWidgets.QLabel()
+        self.fkLabel.setText('FK')
+        self.ctrlTypeHorizontalLayout.addWidget(self.fkLabel)
+        self.spacer11 = QtWidgets.QSpacerItem(40, 10)
+        self.ctrlTypeHorizontalLayout.addItem(self.spacer11)
+        
+        #makes an ik button and label
+        self.ikButton = QtWidgets.QRadioButton()
+        self.ctrlTypeButtonGroup.addButton(self.ikButton) 
+        self.ctrlTypeHorizontalLayout.addWidget(self.ikButton)
+        self.ikLabel = QtWidgets.QLabel()
+        self.ikLabel.setText('IK')
+        self.ctrlTypeHorizontalLayout.addWidget(self.ikLabel)
+        self.spacer12 = QtWidgets.QSpacerItem(40, 10)
+        self.ctrlTypeHorizontalLayout.addItem(self.spacer12)
+        
+        #makes an ik/fk button and label
+        self.ikFkButton = QtWidgets.QRadioButton()
+        self.ctrlTypeButtonGroup.addButton(self.ikFkButton) 
+        self.ctrlTypeHorizontalLayout.addWidget(self.ikFkButton)
+        self.ikFkLabel = QtWidgets.QLabel()
+        self.ikFkLabel.setText('IK/FK')
+        self.ctrlTypeHorizontalLayout.addWidget(self.ikFkLabel)
+        self.spacer13 = QtWidgets.QSpacerItem(120, 10)
+        self.ctrlTypeHorizontalLayout.addItem(self.spacer13)
         
         #ctrl location 
         self.ctrlLocationHorizontalLayout = QtWidgets.QHBoxLayout()
@@ -420,421 +904,93 @@ class ctrlRigUI(QtWidgets.QMainWindow):
         self.parentControlHorizontalLayout = QtWidgets.QHBoxLayout()
         self.verticalMidLayout.addLayout(self.parentControlHorizontalLayout)
         self.parentControlLabel = QtWidgets.QLabel()
-        self.parentControlLabel.setText('Parent Control:')
-        self.parentControlHorizontalLayout.addWidget(self.parentControlLabel)
-        
-        #makes a text box to hold the name of the parent control 
-        self.parentControlTextBox = QtWidgets.QLineEdit()
-        self.parentControlTextBox.setReadOnly(True)
-        self.parentControlTextBox.setMaximumSize(180, 20)
-        self.parentControlTextBox.setMinimumSize(180, 20)
-        self.parentControlHorizontalLayout.addWidget(self.parentControlTextBox)
-        
-        #makes a button to identify the selected control as the parent control 
-        self.parentControlButton = QtWidgets.QPushButton()
-        self.parentControlButton.setText('Add Selected Control')
-        self.parentControlHorizontalLayout.addWidget(self.parentControlButton)
-        self.spacerParent = QtWidgets.QSpacerItem(240, 10)
-        self.parentControlHorizontalLayout.addItem(self.spacerParent)
-        
-        #makes a label for the child control
-        self.childControlHorizontalLayout = QtWidgets.QHBoxLayout()
-        self.verticalMidLayout.addLayout(self.childControlHorizontalLayout)
-        self.childControlLabel = QtWidgets.QLabel()
-        self.childControlLabel.setText('Child Control:')
-        self.childControlHorizontalLayout.addWidget(self.childControlLabel)
-        
-        #makes a text box to hold the name of the child control
-        self.childControlTextBox = QtWidgets.QLineEdit()
-        self.childControlTextBox.setReadOnly(True)
-        self.childControlTextBox.setMaximumSize(180, 20)
-        self.childControlTextBox.setMinimumSize(180, 20)
-        self.childControlHorizontalLayout.addWidget(self.childControlTextBox)
-        
-        #makes a button to identify the selected control as the child control 
-        self.childControlButton = QtWidgets.QPushButton()
-        self.childControlButton.setText('Add Selected Control')
-        self.childControlHorizontalLayout.addWidget(self.childControlButton)
-        self.spacerChild = QtWidgets.QSpacerItem(240, 10)
-        self.childControlHorizontalLayout.addItem(self.spacerChild)
-        
-        #makes a button to parent the parent and child controls together 
-        self.parentControlsButton = QtWidgets.QPushButton()
-        self.parentControlsButton.setText('Parent Controls')
-        self.parentControlsButton.setMinimumSize(560, 40)
-        self.parentControlsButton.setMaximumSize(560, 40)
-        self.verticalMidLayout.addWidget(self.parentControlsButton)
-
-        self.setCentralWidget(self.window)
-      
-    #function for connecting UI signals to functions 
-    def connectSignals(self):
-        QtCore.QObject.connect(self.ctrlButton, QtCore.SIGNAL('clicked()'), self.makeCtrls)
-        QtCore.QObject.connect(self.worldCtrlButton, QtCore.SIGNAL('clicked()'), self.makeWorldCtrl)
-        QtCore.QObject.connect(self.worldParentButton, QtCore.SIGNAL('clicked()'), self.parentWorld)
-        QtCore.QObject.connect(self.cogButton, QtCore.SIGNAL('clicked()'), self.makeCog)
-        QtCore.QObject.connect(self.parentControlButton, QtCore.SIGNAL('clicked()'), self.getSelectedParentControl)
-        QtCore.QObject.connect(self.childControlButton, QtCore.SIGNAL('clicked()'), self.getSelectedChildControl)
-        QtCore.QObject.connect(self.parentControlsButton, QtCore.SIGNAL('clicked()'), self.parentCtrls)
-        QtCore.QObject.connect(self.ctrlTypeButtonGroup, QtCore.SIGNAL('buttonClicked(int)'), self.enable)
-        
-    #makes a bold label for the UI   
-    def makeTitleLabel(self, label, layout):
-        self.Label = QtWidgets.QLabel()
-        self.Label.setText('<b>' + label + '<\b>')
-        layout.addWidget(self.Label)
-    
-    #makes a line for the UI    
-    def makeLine(self, layout):
-        self.line = QtWidgets.QFrame()
-        self.line.setFrameShape(QtWidgets.QFrame.HLine)
-        self.line.setFrameShadow(QtWidgets.QFrame.Sunken)
-        layout.addWidget(self.line)
-    
-    #this function is for adding items to the dropdown menus     
-    def populateJointDropdowns(self):
-        #finds all the joints in the scene
-        self.intialJointList = self.findJoints()
-        #adds found joints to the dropdown menus 
-        for dropdown in range(len(self.dropdownList)):
-            for joint in range(len(self.intialJointList)):
-                self.dropdownList[dropdown].addItem(str(self.intialJointList[joint]))
-
-    #this function finds all the joints in the scene 
-    def findJoints(self):
-        #gets all objects with type joint in the scene
-        joints = pm.ls(et = 'joint')
-        return joints
-
-    #duplicates joints based off given joint list
-    def duplicateJoints(self, jointList, prefix):
-        dupJointList = []
-        #duplicates all joints in joint list without their children and adds them to a list
-        for joint in jointList:
-            dupJoint = pm.duplicate(joint, name = prefix + str(joint), po = True)
-            pm.parent(dupJoint[0], world = True)
-            dupJointList.append(dupJoint)
-        
-        #parents the joints together     
-        for i in range(len(dupJointList) -1):
-            prnt = dupJointList[i +1]
-            child = dupJointList[i]
-            self.parentObject(prnt[0], child[0])
-            
-        #hides the created joints to clean up the viewport
-        pm.hide(dupJointList[len(dupJointList) - 1])
-        
-        #returns the duplicated joints
-        return dupJointList
-
-    #makes Ik handle for given start and end joints
-    def makeIk(self, ctrlType):
-        if self.startJoint == self.endJoint:
-            ikChainWarning = QtWidgets.QMessageBox()
-            ikChainWarning.setWindowTitle('Warning')
-            ikChainWarning.setText('Can\'t make an Ik chain one joint in length. Please select two different joints to continue.')
-            ikChainWarning.exec_()
-            #deletes the created control joints that were made by the make controls function
-            ctrlJoint = self.findCtrlJoint(self.startJoint)
-            pm.delete(ctrlJoint)
-        else:
-            #makes joints to be driven by ik controls directly 
-            ikJoints = self.duplicateJoints(self.jointList, 'IK_')
-            #for the joints in the list of ikJoints
-            for j in range(len(ikJoints)):
-                #if not being used for an IK/FK switch constrain control joints
-                if self.switch == False:
-                    ctrlJoint = self.findCtrlJoint(self.jointList[j])
-                    self.parentConstrainObject(ikJoints[j], ctrlJoint)
-       
-            #makes the Ik handle
-            handle = pm.ikHandle(sj = ikJoints[len(ikJoints) - 1][0], ee = ikJoints[0][0])
-            #hides the handle to clean up the veiwport
-            pm.hide(handle[0])
-        
-            #makes a control 
-            ctrl = self.getSetPostion((10.0 * self.scaleFactor), 'IK_' + str(self.endJoint), self.endJoint, ctrlType)
-            
-            #hides attributes on the ik control that the user doesn't need
-            attrList = ['scaleX', 'scaleY', 'scaleZ', 'visibility']
-            for attr in attrList:
-                pm.setAttr(str(ctrl[1][0]) + '.' + attr,  k = False, cb = False)
-            
-            #parents the IK handle under the ctrl 
-            self.parentObject(ctrl[1][0], handle[0])
-            
-            #makes a control for the pole vector 
-            poleCtrl = self.getSetPostion((5.0 * self.scaleFactor), 'IK' + str(self.middleJoint) + '_Pole_Vector', self.middleJoint, ctrlType)
-            
-            #hides attributes the pole vector control doesn't need 
-            for attr in attrList:
-                pm.setAttr(str(poleCtrl[1][0]) + '.' + attr,  k = False, cb = False)
-            
-            #finds offset group for the pole vector control
-            children = pm.listRelatives(poleCtrl[0], ad = True)
-            offset = children[len(children)-1]
-            
-            #gets the world space postion of the joint to use for placing the pole vector 
-            jointTrans = pm.xform(self.middleJoint, query = True, ws = True, t = True)
-            #determines the x, y and z values to move the pole vector control based off user selection 
-            #if the user selected front 
-            if self.poleVectorPostion == -2:
-                x = jointTrans[0]
-                y = jointTrans[1]
-                z = (100 * self.scaleFactor)
-            #if the user selected back
-            elif self.poleVectorPostion == -3:
-                x = jointTrans[0]
-                y = jointTrans[1]
-                z = (-100 * self.scaleFactor)
-            #if the user selcted right 
-            elif self.poleVectorPostion == -4:
-                x = (-100 * self.scaleFactor)
-                y = jointTrans[1]
-                z = jointTrans[2]
-            #if the user selcted left 
-            elif self.poleVectorPostion == -5:
-               x = (100 * self.scaleFactor)
-               y = jointTrans[1]
-               z = jointTrans[2]
-           #if the user didn't make a selection gives a warning 
-            else:
-               poleVectorPostionWarning = QtWidgets.QMessageBox()
-               poleVectorPostionWarning.setWindowTitle('Warning')
-               poleVectorPostionWarning.setText('No pole vector postion selected. Please select a pole vector postion to continue.')
-               poleVectorPostionWarning.exec_()
-              
-               #removes non functioning partial rig
-               pm.delete(ikJoints)
-               pm.delete(poleCtrl)
-               pm.delete(ctrl)
-               ctrlJoint = self.findCtrlJoint(self.startJoint)
-               pm.delete(ctrlJoint)
-               return
-            
-            #moves the pole vector
-            pm.xform(offset, ws = True, t = (x,y,z))
-            #constrains the ik handle to the pole vector 
-            pm.poleVectorConstraint(poleCtrl[1][0], handle[0])
-                  
-            #makes a control for the top of the ik chain and constrains the ik chain to it 
-            topCtrl = self.getSetPostion((10.0 * self.scaleFactor), 'Ik_' + str(self.startJoint), self.startJoint, ctrlType)
-            self.parentConstrainObject(topCtrl[1][0], ikJoints[len(ikJoints) - 1])
-            
-            #locks and hides unnecessary attributes from the control
-            for attr in attrList:
-                pm.setAttr(str(topCtrl[1][0]) + '.' + attr, k = False, cb = False)
-               
-            #tries to find a child joint to make a secondary ik handle to enable rotation of the end of the ik chain
-            try:
-                #finds the children of the end joint 
-                childJoint = pm.listRelatives(self.endJoint, c = True, type = 'joint')[0]
-                childJointList = [childJoint]
-                
-                #makes an ik joint and parents it to the rest of the ik chain 
-                ikChildJoint = self.duplicateJoints(childJointList, 'IK_')
-                self.parentObject(ikJoints[0][0], ikChildJoint[0])
-        
-                #makes an ik handle and parents it the other handle to enable rotation at the end of the ik chain 
-                ikChildHandle = pm.ikHandle(sj = ikJoints[0][0], ee = ikChildJoint[0][0])
-                self.parentObject(handle[0], ikChildHandle[0])
-                
-                #hides the ik handles 
-                pm.hide(ikChildHandle[0])
-            
-            #if there are no child joints lets the user know that rotation won't work but leaves the control    
-            except:
-                noChildWarning = QtWidgets.QMessageBox()
-                noChildWarning.setWindowTitle('Warning')
-                noChildWarning.setText('No child joints after the end of the IK chain. The control on the end of the chain will not be able to rotate.')
-                noChildWarning.exec_()
-
-            #returns the list of ik joints and all the controls for use in ik/fk switching function
-            return ikJoints, ctrl, poleCtrl, topCtrl
-        
-    #parents objects given a parent and a child object        
-    def parentObject(self, parentObject, childObject):
-        pm.parent(childObject, parentObject)
-        
-    #parent constrains 2 objects
-    def parentConstrainObject(self, parent, child):
-        pm.parentConstraint(parent, child)
-    
-    #this function makes controls using nurbs circles     
-    def makeCtrl(self, radius = 50, name = 'circle', ctrlType = ''):
-        #makes a nurbs circle
-        ctrl = pm.circle(r = radius,n = name + '_ctrl', nr = (1.0, 0.0, 0.0))
-        
-        #gets the shape associated with the control 
-        shape = pm.listRelatives(ctrl, ad = True, s = True)
-        #allows color to be changed 
-        pm.setAttr(shape[0] + '.overrideEnabled', True)
-        #if it's a middle control make it yellow
-        if ctrlType == -2:
-            pm.setAttr(shape[0] + '.overrideColor', 17)
-        #if it's a right control make it red
-        elif ctrlType == -3:
-            pm.setAttr(shape[0]+'.overrideColor', 13)
-        #if it's a left control make it blue
-        elif ctrlType == -4:
-            pm.setAttr(shape[0] + '.overrideColor', 6)
-        #if it's an extra control or the user didn't specify make it green 
-        else:
-            pm.setAttr(shape[0] + '.overrideColor', 14)
-            
-        #make offset and parent groups 
-        offset = pm.group(ctrl, n = 'offset_' + name)
-        prnt = pm.group(offset, n = 'prnt_' + name)
-        
-        #returns parent group and the circle object
-        return prnt, ctrl
-        
-    #places controls around joint   
-    def getSetPostion(self, radius, name, joint, ctrlType):
-        ctrl = self.makeCtrl(radius, name, ctrlType)
+        self.parentControlLabel.setText('Parent Control:')
+        self.parentControlHorizontalLayout.addWidget(self.parentControlLabel)
         
-        #gets joint translation 
-        t = pm.xform(joint, translation = True, query = True, ws = True)
-        #gets joint rotation
-        r = pm.xform(joint, rotation = True, query = True, ws = True)
-       
-        #places the control 
-        pm.move(ctrl[0], t)
-        pm.rotate(ctrl[0], (r[0], r[1], r[2]))
-        return ctrl
-
-    #this function sets up an fk control given a skinning joint 
-    def makeFKCtrl(self, skJoint, fkJoint, name, ctrlType):
-        joint = self.findCtrlJoint(skJoint)
-        print 'control joint fk', joint
+        #makes a text box to hold the name of the parent control 
+        self.parentControlTextBox = QtWidgets.QLineEdit()
+        self.parentControlTextBox.setReadOnly(True)
+        self.parentControlTextBox.setMaximumSize(180, 20)
+        self.parentControlTextBox.setMinimumSize(180, 20)
+        self.parentControlHorizontalLayout.addWidget(self.parentControlTextBox)
         
-        #if this chain is not for an IK/FK switch parent constrain control joint to the fk joint 
-        if self.switch == False:
-            #constrains the control joint to the fk joint 
-            self.parentConstrainObject(fkJoint, joint)
+        #makes a button to identify the selected control as the parent control 
+        self.parentControlButton = QtWidgets.QPushButton()
+        self.parentControlButton.setText('Add Selected Control')
+        self.parentControlHorizontalLayout.addWidget(self.parentControlButton)
+        self.spacerParent = QtWidgets.QSpacerItem(240, 10)
+        self.parentControlHorizontalLayout.addItem(self.spacerParent)
         
-        #makes a control and places it on the fk joint
-        ctrl = self.getSetPostion((10.0 * self.scaleFactor), name, fkJoint, ctrlType)
-        #constrains the fk joint to the fk control 
-        self.parentConstrainObject(ctrl[1], fkJoint)
+        #makes a label for the child control
+        self.childControlHorizontalLayout = QtWidgets.QHBoxLayout()
+        self.verticalMidLayout.addLayout(self.childControlHorizontalLayout)
+        self.childControlLabel = QtWidgets.QLabel()
+        self.childControlLabel.setText('Child Control:')
+        self.childControlHorizontalLayout.addWidget(self.childControlLabel)
         
-        #hides unnecessary attributes on the control 
-        attrList = ['translateX', 'translateY', 'translateZ', 'scaleX', 'scaleY', 'scaleZ', 'visibility']
-        for attr in attrList:
-            pm.setAttr(str(ctrl[1][0]) + '.' + attr, k = False, cb = False)
+        #makes a text box to hold the name of the child control
+        self.childControlTextBox = QtWidgets.QLineEdit()
+        self.childControlTextBox.setReadOnly(True)
+        self.childControlTextBox.setMaximumSize(180, 20)
+        self.childControlTextBox.setMinimumSize(180, 20)
+        self.childControlHorizontalLayout.addWidget(self.childControlTextBox)
         
-        return ctrl
-    
-    #makes a chain of fk controls for all the specified joint and it's children     
-    def makeFKChain(self, ctrlType):
-        #makes joints to be driven by fk controls directly 
-        fkJoints = self.duplicateJoints(self.jointList, 'FK_')
-
-        #ctrlList will contain ctrl and prnt groups 
-        #starting with bottom of the chain 
-        self.ctrlList = []
-        #makes controls and adds there prnt groups and ctrls to a list
-        for joint in range(len(fkJoints)):
-            childName = str(fkJoints[joint][0])
-            childCtrl = self.makeFKCtrl(self.jointList[joint], fkJoints[joint], childName, ctrlType)
-            self.ctrlList.append(childCtrl)
+        #makes a button to identify the selected control as the child control 
+        self.childControlButton = QtWidgets.QPushButton()
+        self.childControlButton.setText('Add Selected Control')
+        self.childControlHorizontalLayout.addWidget(self.childControlButton)
+        self.spacerChild = QtWidgets.QSpacerItem(240, 10)
+        self.childControlHorizontalLayout.addItem(self.spacerChild)
         
-        #parents the fk controls together 
-        for i in range(len(self.ctrlList)-1):
-            prnt = self.ctrlList[i +1]
-            child = self.ctrlList[i]
-            self.parentObject(prnt[1][0], child[0])
-            
-        return fkJoints
+        #makes a button to parent the parent and child controls together 
+        self.parentControlsButton = QtWidgets.QPushButton()
+        self.parentControlsButton.setText('Parent Controls')
+        self.parentControlsButton.setMinimumSize(560, 40)
+        self.parentControlsButton.setMaximumSize(560, 40)
+        self.verticalMidLayout.addWidget(self.parentControlsButton)
 
-    #makes a control to hold an IK, FK switch 
-    def makeIkFkSwitchCtrl(self, name, ctrlType):
-        ctrl = self.makeCtrl((5.0 * self.scaleFactor), name, ctrlType)
-        #gets all the keyable attributes(ones found in channel box)
-        channelAttr =  pm.listAttr(ctrl[1][0], k = True)
-        #this locks and hides the attributes 
-        for attr in channelAttr:
-            pm.setAttr(ctrl[1][0] + '.' + attr, l = True, k = False, cb = False)
-        #adds attribute for IK/FK switch      
-        pm.addAttr(ctrl[1][0], ln = 'IK_FK_Switch', at = 'float', max = 1.0, min = 0.0, k = True)
-        return ctrl
-        
-    #makes an Ik/Fk switch     
-    def ikFkSwitch(self, fkJoint, IkJoint, skJoint):
-        #makes a control for the ik/fk switch attribute
-        ctrl = self.makeIkFkSwitchCtrl('Switch', 'Extra')
+        #makes a button to build the rig on the export daemon so maya can be used while it builds
+        self.daemonButton = QtWidgets.QPushButton()
+        self.daemonButton.setText('Build Rig with Export Daemon')
+        self.daemonButton.setMinimumSize(560, 40)
+        self.daemonButton.setMaximumSize(560, 40)
+        self.verticalMidLayout.addWidget(self.daemonButton)
 
-        #gets the Ik/Fk switch attribute off the Ik/Fk control
-        switchAttr =  pm.listAttr(ctrl[1][0], c = True, k = True)[0]
+        self.setCentralWidget(self.window)
 
-        #constrains the rest of the joints and keeps track of them in a list
-        constraintList = []
-        for j in range(len(fkJoint)):
-            ctrlJoint = self.findCtrlJoint(self.jointList[j])
-            childC = pm.parentConstraint(fkJoint[j], IkJoint[0][j], ctrlJoint)
-            constraintList.append(childC)
+    #function for connecting UI signals to functions 
+    def connectSignals(self):
+        QtCore.QObject.connect(self.ctrlButton, QtCore.SIGNAL('clicked()'), self.makeCtrls)
+        QtCore.QObject.connect(self.worldCtrlButton, QtCore.SIGNAL('clicked()'), self.makeWorldCtrl)
+        QtCore.QObject.connect(self.worldParentButton, QtCore.SIGNAL('clicked()'), self.parentWorld)
+        QtCore.QObject.connect(self.cogButton, QtCore.SIGNAL('clicked()'), self.makeCog)
+        QtCore.QObject.connect(self.parentControlButton, QtCore.SIGNAL('clicked()'), self.getSelectedParentControl)
+        QtCore.QObject.connect(self.childControlButton, QtCore.SIGNAL('clicked()'), self.getSelectedChildControl)
+        QtCore.QObject.connect(self.parentControlsButton, QtCore.SIGNAL('clicked()'), self.parentCtrls)
+        QtCore.QObject.connect(self.daemonButton, QtCore.SIGNAL('clicked()'), self.sendToDaemon)
+        QtCore.QObject.connect(self.ctrlTypeButtonGroup, QtCore.SIGNAL('buttonClicked(int)'), self.enable)
 
-        #make a reverse node
-        reverseNode = pm.shadingNode('reverse', asUtility = True)
-        #connect the switch attribute to the input of the reverse node 
-        pm.connectAttr(ctrl[1][0] + '.' + switchAttr, reverseNode + '.input.inputX')
-       
-        #connect the constraint weights to the fk/ik switch 
-        #also connects control visibility to the switch 
-        for constraint in range(len(constraintList)):
-            attributes = pm.listAttr(constraintList[constraint], c = True, k = True)
-            pm.connectAttr(ctrl[1][0] + '.' + switchAttr, constraintList[constraint] + '.' + attributes[len(attributes) -1])
-            pm.connectAttr(reverseNode + '.output.outputX', constraintList[constraint] + '.' + attributes[len(attributes) -2]) 
-            pm.connectAttr(reverseNode + '.output.outputX', self.ctrlList[constraint][1][0] + '.visibility') 
-            pm.connectAttr(ctrl[1][0] + '.' + switchAttr, IkJoint[constraint + 1][0] + '.visibility')
-    
-        #positions the Ik/Fk switch opposite to the position of the pole vector
-        ctrlJoint = self.findCtrlJoint(skJoint)
-        self.parentConstrainObject(ctrlJoint, ctrl[0])
-        child = pm.listRelatives(ctrl[0], c = True, type = 'transform')
-        offset = child[0]
-        ctrlJointTrans = pm.xform(ctrlJoint, query = True, ws = True, t = True)
-        #if the user picked front
-        if self.poleVectorPostion == -2:
-            x = ctrlJointTrans[0]
-            y = ctrlJointTrans[1]
-            z = (-20 * self.scaleFactor)
-        #if the user picked back 
-        elif self.poleVectorPostion == -3:
-            x = ctrlJointTrans[0]
-            y = ctrlJointTrans[1]
-            z = (20 * self.scaleFactor)
-        #if the user picked right
-        elif self.poleVectorPostion == -4:
-            x = (20 * self.scaleFactor)
-            y = ctrlJointTrans[1]
-            z = ctrlJointTrans[2]
-        #if the user picked left
-        else:
-            x = (-20 * self.scaleFactor)
-            y = ctrlJointTrans[1]
-            z = ctrlJointTrans[2]
-        #places the switch in the world
-        pm.xform(offset, ws = True, t = (x, y, z))
+    #makes a bold label for the UI   
+    def makeTitleLabel(self, label, layout):
+        self.Label = QtWidgets.QLabel()
+        self.Label.setText('<b>' + label + '<\b>')
+        layout.addWidget(self.Label)
 
-    #duplicates joints to make a ctrl skeleton     
-    def makeCtrlSkeleton(self):
-        #makes joints to be driven by fk controls directly 
-        self.ctrlJoints = self.duplicateJoints(self.jointList, 'ctrl_')
-        
-        for joint in range(len(self.jointList)):
-            self.parentConstrainObject(self.ctrlJoints[joint], self.jointList[joint])
-             
-        return self.ctrlJoints
+    #makes a line for the UI    
+    def makeLine(self, layout):
+        self.line = QtWidgets.QFrame()
+        self.line.setFrameShape(QtWidgets.QFrame.HLine)
+        self.line.setFrameShadow(QtWidgets.QFrame.Sunken)
+        layout.addWidget(self.line)
 
-    #finds ctrl joint to match the given skinning joint      
-    def findCtrlJoint(self, skJoint):
-        skName = str(skJoint)
-        #iterates through the list looking for the corresponding control joint 
-        for j in range(len(self.ctrlJoints)):
-            #if it finds a match it returns the joint
-            if str(self.ctrlJoints[j][0]).endswith(skName) == True:
-                return self.ctrlJoints[j]
+    #this function is for adding items to the dropdown menus     
+    def populateJointDropdowns(self):
+        #finds all the joints in the scene
+        self.intialJointList = self.findJoints()
+        #adds found joints to the dropdown menus 
+        for dropdown in range(len(self.dropdownList)):
+            for joint in range(len(self.intialJointList)):
+                self.dropdownList[dropdown].addItem(str(self.intialJointList[joint]))
 
     #function for making controls once the button is pressed            
     def makeCtrls(self):
@@ -842,179 +998,51 @@ class ctrlRigUI(QtWidgets.QMainWindow):
         ControlType = self.ctrlTypeButtonGroup.checkedId()
         #if no type was specified gives the user a warning
         if ControlType == -1: 
-            controlTypeWarning = QtWidgets.QMessageBox()
-            controlTypeWarning.setWindowTitle('Warning')
-            controlTypeWarning.setText('No control type selected. Please select control type to continue')
-            controlTypeWarning.exec_()
+            self.warn('No control type selected. Please select control type to continue')
         else:    
-            #get relevant joints 
-            self.startJoint = self.getJoint(self.Dropdown1)
-            self.endJoint = self.getJoint(self.Dropdown2)
-            self.middleJoint = self.getJoint(self.midJointDropdown)
-            ctrlColor = self.ctrlLocationButtonGroup.checkedId()
             #checks that the scale factor is valid
             scaleFactorTest = self.scaleFactorTextBox.text()
             #if it isn't gives the user a warning
             if scaleFactorTest.count('.') > 1 or scaleFactorTest == '' or  float(scaleFactorTest) == 0:
-                scaleFactorWarning = QtWidgets.QMessageBox()
-                scaleFactorWarning.setWindowTitle('Warning')
-                scaleFactorWarning.setText('Scale entered is invalid. Please enter vaild scale to continue.')
-                scaleFactorWarning.exec_()
-            #if it is makes the controls     
+                self.warn('Scale entered is invalid. Please enter vaild scale to continue.')
+            #if it is makes the controls for the relevant joints
             else:
-                self.scaleFactor = float(scaleFactorTest)
-                #make a list to hold joints that will have controls 
-                self.jointList = []
-                joint = self.endJoint
-        
-                #this gives a list of joints from start to end joint 
-                #gives a complete list of skJoints 
-                while str(self.startJoint) != str(joint):
-                    self.jointList.append(joint)
-                    jointParent = pm.listRelatives(joint, p = True)[0]
-                    joint = jointParent 
-                    
-                self.jointList.append(self.startJoint)
-                #finds all the joints currently in the scene
-                jointsInScene = self.findJoints()
-                
-                #Checks to make sure that the joints don't already have controls before rigging them 
-                for joint in self.jointList:
-                    ctrlJointName = 'ctrl_' + str(joint)
-                    for j in jointsInScene:
-                        #if they do have controls gives the user a warning 
-                        if str(j) == ctrlJointName:
-                            controlsExistWarning = QtWidgets.QMessageBox()
-                            controlsExistWarning.setWindowTitle('Warning')
-                            controlsExistWarning.setText('Joints in range of start and end joint already have controls. Pick joints without controls to continue.')
-                            controlsExistWarning.exec_()
-                            return
-                            
-                self.poleVectorPostion = self.postionButtonGroup.checkedId()
-        
-                #duplicate joints
-                #assume not making an FK/IK switch 
-                self.switch = False
-        
-                self.ctrlRoot = self.makeCtrlSkeleton() 
-                
-                #if control type = -3  
-                #make ik controls
-                if ControlType == -3:
-                    ikJoint = self.makeIk(ctrlColor)    
-        
-                #if control type is -4
-                #make an Ik/Fk switch
-                elif ControlType == -4:
-                    self.switch = True
-                    fkJoint = self.makeFKChain(ctrlColor)
-                    ikJoint = self.makeIk(ctrlColor) 
-                    ctrlJoint = self.findCtrlJoint(self.startJoint)
-                    self.ikFkSwitch(fkJoint, ikJoint, self.endJoint)
-                    
-                #make fk chain 
-                else: 
-                    fkJoint = self.makeFKChain(ctrlColor)
-                
-    #makes the world control for the rig             
+                self.buildCtrls(ControlType, self.getJoint(self.Dropdown1), self.getJoint(self.Dropdown2),
+                                self.getJoint(self.midJointDropdown), self.ctrlLocationButtonGroup.checkedId(),
+                                float(scaleFactorTest), self.postionButtonGroup.checkedId())
+
+    #makes the world control for the rig once the button is pressed
     def makeWorldCtrl(self):
-        #looks to see if there is a world control already in the scene
-        transforms = pm.ls(type = 'transform')
-        worldList = []
-        for trans in range(len(transforms)):
-            if transforms[trans].endswith('World') == True:
-                worldList.append(transforms[trans])
-        #if there is already a world control in the scene give the user a warning
-        if worldList:
-            worldControlWarning = QtWidgets.QMessageBox()
-            worldControlWarning.setWindowTitle('Warning')
-            worldControlWarning.setText('There is already a world control made. There can only be one world control per rig.')
-            worldControlWarning.exec_()
-        #if not continues to the scale factor warning test
+        #checks to see that the user input scale is valid 
+        scaleFactorTest = self.worldScaleTextBox.text() 
+        #if it isn't gives the user a warning        
+        if scaleFactorTest.count('.') > 1 or scaleFactorTest == '' or  float(scaleFactorTest) == 0:
+            self.warn('Scale entered is invalid. Please enter vaild scale to continue.')
+        #if the scale factor is valid makes a world control 
         else:
-            name = 'World'
-            #checks to see that the user input scale is valid 
-            scaleFactorTest = self.worldScaleTextBox.text() 
-            #if it isn't gives the user a warning        
-            if scaleFactorTest.count('.') > 1 or scaleFactorTest == '' or  float(scaleFactorTest) == 0:
-                scaleFactorWarning = QtWidgets.QMessageBox()
-                scaleFactorWarning.setWindowTitle('Warning')
-                scaleFactorWarning.setText('Scale entered is invalid. Please enter vaild scale to continue.')
-                scaleFactorWarning.exec_()
-            #if the scale factor is valid makes a world control 
-            else:
-                scaleFactor = float(scaleFactorTest)        
-                self.worldCtrl = pm.circle(r = (100 * scaleFactor), name = name, nr = (0.0, 1.0, 0.0))
-                
-                #hides attributes on the control that are unnecessary 
-                attrList = ['scaleX', 'scaleY', 'scaleZ', 'visibility']
-                for attr in attrList:
-                    pm.setAttr(str(self.worldCtrl[0]) + '.' + attr, l = True, k = False, cb = False)
-                    
-                #gets the shape associated with the control 
-                shape = pm.listRelatives(self.worldCtrl, ad = True, s = True)
-                #allows color to be changed 
-                pm.setAttr(shape[0] + '.overrideEnabled', True)
-                pm.setAttr(shape[0] + '.overrideColor', 17)
-                    
-                #make offset and parent groups 
-                offset = pm.group(self.worldCtrl, n = 'offset_' + name)
-                prnt = pm.group(offset, n = 'prnt_' + name)
-
-    #function for making the world control     
-    def parentWorld(self):
-        #tries to parent all controls and control joints to the world control 
-        try:
-            #gets list of top level items in the scene
-            topLevelList =  pm.ls(assemblies = True)  
-            list = []
-            #filters through list for all controls and control joints made except for the world control
-            for i in range(len(topLevelList)):
-                if (str(topLevelList[i])[:2] == ('IK')) or (str(topLevelList[i])[:2] == ('FK')) or ((str(topLevelList[i])[:4] == 'prnt') and str(topLevelList[i]).endswith('World') == False)  or (str(topLevelList[i])[:4] == 'ctrl'):
-                    list.append(topLevelList[i])
-    
-            #parents items in the list to the world control 
-            for j in range(len(list)):
-                self.parentObject(self.worldCtrl[0], list[j])
-        #if it fails tells the user that there isn't a world control         
-        except:
-            parentWorldWarning = QtWidgets.QMessageBox()
-            parentWorldWarning.setWindowTitle('Warning')
-            parentWorldWarning.setText('No world control in the scene. Please make a world control to continue.')
-            parentWorldWarning.exec_()
+            self.buildWorldCtrl(float(scaleFactorTest))
 
-    #makes a cog control for the rig         
+    #makes a cog control for the rig once the button is pressed
     def makeCog(self):
-        #gets the user identified cog joint
-        cogJoint = self.getJoint(self.cogDropdown)
         #gets scale factor for cog control
         scaleFactorTest = self.cogScaleTextBox.text()
         #checks the scale factor is valid
         if scaleFactorTest.count('.') > 1 or scaleFactorTest == '' or  float(scaleFactorTest) == 0:
-            scaleFactorWarning = QtWidgets.QMessageBox()
-            scaleFactorWarning.setWindowTitle('Warning')
-            scaleFactorWarning.setText('Scale entered is invalid. Please enter vaild scale to continue.')
-            scaleFactorWarning.exec_()
-        #if it is makes a cog control 
+            self.warn('Scale entered is invalid. Please enter vaild scale to continue.')
+        #if it is makes a cog control on the user identified cog joint
         else:    
-            scaleFactor = float(scaleFactorTest)     
-            #makes the cog control
-            ctrl = self.getSetPostion((25.0 * scaleFactor), 'COG', cogJoint, -2)
-            #locks and hides unnecessary attributes on the control 
-            attrList = ['scaleX', 'scaleY', 'scaleZ', 'visibility']
-            for attr in attrList:
-                pm.setAttr(str(ctrl[1][0]) + '.' + attr, l = True, k = False, cb = False)
+            self.buildCog(self.getJoint(self.cogDropdown), float(scaleFactorTest))
 
     #gets the selected control and stores it as the parent control   
     def getSelectedParentControl(self):
         self.parentSelected = pm.ls(selection = True)
         self.parentControlTextBox.setText(str(self.parentSelected[0]))
-    
+
     #gets the selected control and stores it as the child control
     def getSelectedChildControl(self):
         self.childSelected = pm.ls(selection = True)
         self.childControlTextBox.setText(str(self.childSelected[0]))
- 
+
     #parents the parent group of the child control to the parent control    
     def parentCtrls(self):
         #tries to parent the controls
@@ -1027,10 +1055,38 @@ class ctrlRigUI(QtWidgets.QMainWindow):
             self.parentObject(self.parentSelected[0], childPrntGroup[0])
         #if it fails gives the user a warning that the selected controls aren't valid
         except:
-            parentControlsWarning = QtWidgets.QMessageBox()
-            parentControlsWarning.setWindowTitle('Warning')
-            parentControlsWarning.setText('Invalid control selection.')
-            parentControlsWarning.exec_()
+            self.warn('Invalid control selection.')
+
+    #sends the saved scene to the export daemon to build the chain, the cog control and the world control set in the UI
+    #the rig is saved next to the scene
+    def sendToDaemon(self):
+        import exportDaemon
+        scenePath = pm.sceneName()
+        if not scenePath:
+            self.warn('The scene has to be saved before it can be sent to the export daemon.')
+            return
+        ControlType = self.ctrlTypeButtonGroup.checkedId()
+        if ControlType == -1: 
+            self.warn('No control type selected. Please select control type to continue')
+            return
+        scaleFactors = [self.scaleFactorTextBox.text(), self.worldScaleTextBox.text(), self.cogScaleTextBox.text()]
+        for scaleFactorTest in scaleFactors:
+            if scaleFactorTest.count('.') > 1 or scaleFactorTest == '' or  float(scaleFactorTest) == 0:
+                self.warn('Scale entered is invalid. Please enter vaild scale to continue.')
+                return
+        middleJoint = self.getJoint(self.midJointDropdown)
+        cogJoint = self.getJoint(self.cogDropdown)
+        chain = {'start': str(self.getJoint(self.Dropdown1)), 'end': str(self.getJoint(self.Dropdown2)),
+                 'middle': None if middleJoint == 'None' else str(middleJoint),
+                 'type': buttonName(CONTROL_TYPES, ControlType),
+                 'location': buttonName(CONTROL_LOCATIONS, self.ctrlLocationButtonGroup.checkedId()),
+                 'poleVector': buttonName(POLE_VECTOR_POSTIONS, self.postionButtonGroup.checkedId()),
+                 'scale': float(scaleFactors[0])}
+        job = {'type': 'rigBuild', 'scene': str(scenePath), 'output': os.path.splitext(str(scenePath))[0] + '_rig.ma',
+               'kwargs': {'chains': [chain], 'worldScale': float(scaleFactors[1]),
+                          'cogJoint': None if cogJoint == 'None' else str(cogJoint), 'cogScale': float(scaleFactors[2])}}
+        status = exportDaemon.submitJob(job, wait = False)
+        print('sent %s to the export daemon as job %s' % (scenePath, status['id']))
 
     #disables the parts of the UI used for making pole vectors if not making an ik chain 
     def enable(self):
@@ -1062,7 +1118,7 @@ class ctrlRigUI(QtWidgets.QMainWindow):
             self.rightLabel2.setDisabled(True)
             self.leftButton2.setDisabled(True)
             self.leftLabel2.setDisabled(True)
-        
+
     #gets joint associated with name in a dropdown menu     
     def getJoint(self, dropDown):
         jointName = dropDown.currentText()
@@ -1072,9 +1128,31 @@ class ctrlRigUI(QtWidgets.QMainWindow):
             if str(self.intialJointList[joint]).endswith(jointName) == True:
                 #if it matches stores the joint in the varible sk joint 
                 skJoint = self.intialJointList[joint]
-        return skJoint 
-        
+        return skJoint
+
+#------------------
+#Build
+#------------------
+
+#makes a control rig without the UI, it is what the export daemon's rigBuild jobs run
+#chains is a list of dictionaries with the start, end and middle joint names, a type from CONTROL_TYPES, a location
+#from CONTROL_LOCATIONS, a pole vector postion from POLE_VECTOR_POSTIONS and a scale, returns the warnings given
+def buildRig(chains, worldScale = 1.0, cogJoint = None, cogScale = 1.0):
+    builder = ctrlRigBuilder()
+    for chain in chains:
+        middleJoint = pm.PyNode(chain['middle']) if chain.get('middle') else 'None'
+        builder.buildCtrls(CONTROL_TYPES[chain.get('type', 'fk')], pm.PyNode(chain['start']), pm.PyNode(chain['end']),
+                           middleJoint, CONTROL_LOCATIONS.get(chain.get('location'), -1), float(chain.get('scale', 1.0)),
+                           POLE_VECTOR_POSTIONS.get(chain.get('poleVector'), -1))
+    if cogJoint:
+        builder.buildCog(pm.PyNode(cogJoint), float(cogScale))
+    builder.buildWorldCtrl(float(worldScale))
+    builder.parentWorld()
+    return builder.warnings
+
 #---------------
 #call
 #---------------
-ctrlRigUI() 
\ No newline at end of file
+#only builds the UI when run from the script editor so buildRig can be imported headless
+if __name__ == '__main__':
+    ctrlRigUI() 
\ No newline at end of file
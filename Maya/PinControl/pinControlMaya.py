@@ -1,24 +1,54 @@
 '''
-This script contains a class that pins a control and makes a simple UI to tell the user what control 
-was pinned. 
+This script contains a class that pins controls and makes a simple UI to tell the user what controls 
+were pinned. Each selected control gets its own pin layer and every control is pinned in one pass. 
+The keys the tool writes are breakdowns, so the two keys the user set stay normal keys wherever they are 
+moved. Pinning a control again reuses the base layer samples from the last pin if the base curves have 
+not changed, and only rewrites the keys that changed. 
+The pinning is done by controlPinner, pinControls pins without the UI.
 It contains these functions:
     -getMayaWindow()
+    -curveToUiUnits(curveFn)
+    -sampleCurves(animCurves, times)
+    -layerCurve(layer, plug, time, value)
+    -curveKeys(curve)
+    -removeBreakdowns(curve, keep)
+    -writeKeys(layer, node, attributes, times, values, breakdowns)
+    -baseChannels(layer, control)
+    -curveState(curves)
+    -warn(text)
+    -useControls(controls)
     -makeUI()
     -connectSignals
-    -getControl()
-    -getKeyValue(time, animCurve)
-    -isValid()
+    -getControls()
+    -getPinLayer(control)
+    -cachedPin(pin)
+    -pinKeyTimes(pin)
+    -sampleRange(startTime, endTime, animCurve)
+    -isValid(pin)
     -setKeys()
-    -zeroKey()
+    -pinKeys(pin, cached)
+    -zeroKey(pin, times, values)
     -buttonPressed()
     -bakeButtonPressed()
-    -frameNumberCheck()
+    -sendToDaemon()
+    -frameNumberCheck(pin)
+    -bake()
+    -pinControls(controls, bake)
 '''
 #------------
 #imports
 #------------
+import collections
+import os
 import maya.OpenMayaUI as omui
 import pymel.core as pm 
+#the api 2.0 anim curve function set is not in 2014, curves are sampled with keyframe queries there
+try:
+    import maya.api.OpenMaya as om
+    import maya.api.OpenMayaAnim as oma
+except ImportError:
+    om = None
+    oma = None
 #this makes the tool compatible in both 2014 and 2018
 try:
     from PySide2 import QtGui, QtCore, QtWidgets
@@ -29,29 +59,371 @@ except:
     from PySide import QtCore
     from PySide import QtGui as QtWidgets
 
+#key values closer than this are the same value
+KEY_TOLERANCE = 1e-6
+
 #gets the maya main window
 def getMayaWindow():
     mayaWindowptr = omui.MQtUtil.mainWindow()
     window = wrapInstance(long(mayaWindowptr), QtWidgets.QWidget)
     return window 
 
-#this class makes the UI and pins the control     
-class pinControlUI(QtWidgets.QMainWindow):
-    def __init__(self, parent = getMayaWindow()):
-        super(pinControlUI, self).__init__(parent)
+#returns what a value from the curve is multiplied by to be in the units the curve is keyed in
+#curves evaluate rotations in radians and translations in centimeters whatever the scene is set to
+def curveToUiUnits(curveFn):
+    curveType = curveFn.animCurveType
+    if curveType == oma.MFnAnimCurve.kAnimCurveTA:
+        return om.MAngle(1.0).asUnits(om.MAngle.uiUnit())
+    if curveType == oma.MFnAnimCurve.kAnimCurveTL:
+        return om.MDistance(1.0).asUnits(om.MDistance.uiUnit())
+    return 1.0
+
+#evaluates animation curves at each of the times without moving the timeline or evaluating the scene
+#returns a list of values for each curve in the order of times, in the same units pm.keyframe returns
+def sampleCurves(animCurves, times):
+    if oma is None:
+        return [[pm.keyframe(curve, query = True, eval = True, time = (time, time))[0] for time in times]
+                for curve in animCurves]
+    mayaTimes = [om.MTime(time, om.MTime.uiUnit()) for time in times]
+    selection = om.MSelectionList()
+    for curve in animCurves:
+        selection.add(str(curve))
+    samples = []
+    for i in range(selection.length()):
+        curveFn = oma.MFnAnimCurve(selection.getDependNode(i))
+        toUiUnits = curveToUiUnits(curveFn)
+        samples.append([curveFn.evaluate(time) * toUiUnits for time in mayaTimes])
+    return samples
+
+#returns the curve that animates the plug on the layer, keying the plug on the layer first if it has none
+def layerCurve(layer, plug, time, value):
+    curves = pm.animLayer(layer, query = True, findCurveForPlug = plug)
+    if not curves:
+        pm.setKeyframe(plug, animLayer = layer, time = time, value = value)
+        curves = pm.animLayer(layer, query = True, findCurveForPlug = plug)
+    return curves[0]
+
+#returns the keys of the curve as values by time, and the times of the keys that are breakdowns
+def curveKeys(curve):
+    keys = dict(pm.keyframe(curve, query = True, timeChange = True, valueChange = True) or [])
+    if oma is None:
+        #asked one key at a time, whatever the query returns for a key is empty when it is not a breakdown
+        times = pm.keyframe(curve, query = True, timeChange = True) or []
+        breakdowns = set(time for i, time in enumerate(times)
+                         if pm.keyframe(curve, query = True, index = (i, i), breakdown = True))
+        return keys, breakdowns
+    selection = om.MSelectionList()
+    selection.add(str(curve))
+    curveFn = oma.MFnAnimCurve(selection.getDependNode(0))
+    unit = om.MTime.uiUnit()
+    breakdowns = set(curveFn.input(i).asUnits(unit) for i in range(curveFn.numKeys) if curveFn.isBreakdown(i))
+    return keys, breakdowns
+
+#takes the breakdowns off the curve except at the times in keep, these are the keys an earlier pin wrote
+#a breakdown the user dragged along with a pin key is at a time no pin writes and is taken off too
+def removeBreakdowns(curve, keep):
+    keep = set(keep)
+    staleTimes = [time for time in curveKeys(curve)[1] if time not in keep]
+    if staleTimes:
+        pm.cutKey(curve, time = [(time, time) for time in staleTimes], clear = True)
+
+#keys the attributes of the node on the layer at every time, values has a list in the order of times for each attribute
+#the times in breakdowns are keyed as breakdowns so the tool can tell its keys from the user's
+#each curve is keyed directly with one call for all the frames that share a value, which for a hold is the whole hold
+#keys already on the curve with the same value are left as they are, breakdowns from an earlier pin at other times are taken off
+#it is called inside an undo chunk so a whole pin is one undo
+def writeKeys(layer, node, attributes, times, values, breakdowns = ()):
+    breakdowns = set(breakdowns)
+    for attribute, attributeValues in zip(attributes, values):
+        plug = '%s.%s' % (node, attribute)
+        curve = layerCurve(layer, plug, times[0], attributeValues[0])
+        currentKeys, currentBreakdowns = curveKeys(curve)
+        timesByValue = {}
+        for time, value in zip(times, attributeValues):
+            isBreakdown = time in breakdowns
+            if (time in currentKeys and abs(currentKeys[time] - value) < KEY_TOLERANCE
+                    and (time in currentBreakdowns) == isBreakdown):
+                continue
+            timesByValue.setdefault((value, isBreakdown), []).append(time)
+        for (value, isBreakdown), valueTimes in timesByValue.items():
+            pm.setKeyframe(curve, time = valueTimes, value = value, breakdown = isBreakdown)
+            #a key that was already there keeps its breakdown state from setKeyframe, so it is set as well
+            existing = [time for time in valueTimes if time in currentKeys]
+            if existing:
+                pm.keyframe(curve, edit = True, time = [(time, time) for time in existing], breakdown = isBreakdown)
+        removeBreakdowns(curve, times)
+
+#finds the control's keyable channels on the pin layer that are animated on the base layer
+#returns each channel's attribute name with the base layer curve that animates it, in the layer's order
+def baseChannels(layer, control):
+    baseLayer = pm.animLayer(query = True, root = True)
+    keyable = set(pm.listAttr(control, keyable = True, unlocked = True) or [])
+    channels = collections.OrderedDict()
+    for plug in pm.animLayer(layer, query = True, attribute = True) or []:
+        plug = pm.Attribute(plug)
+        attribute = plug.attrName(longName = True)
+        if plug.node() != control or attribute not in keyable:
+            continue
+        #channels that are not animated have no curve on the base layer and are left alone
+        curves = pm.animLayer(baseLayer, query = True, findCurveForPlug = plug)
+        if curves:
+            channels[attribute] = curves[0]
+    return channels
+
+#returns the keys, tangents and infinities of the curves, which is different whenever their animation is
+def curveState(curves):
+    state = []
+    for curve in curves:
+        keys = pm.keyframe(curve, query = True, timeChange = True, valueChange = True) or []
+        tangents = pm.keyTangent(curve, query = True, inAngle = True, outAngle = True, inWeight = True, outWeight = True) or []
+        infinity = pm.setInfinity(curve, query = True, preInfinite = True, postInfinite = True) or []
+        state.append((str(curve), tuple(keys), tuple(tangents), tuple(infinity)))
+    return tuple(state)
+
+#this class pins the controls, pinControlUI gives it the selected controls and pinControls gives them without it
+class controlPinner(object):
+    def __init__(self):
+        #the controls with the pin layer for each, and what was pinned for baking
+        self.controls = []
+        self.pinLayers = []
+        self.pins = []
+        #the base layer samples of the last pin of each control, by control name
+        self.pinCache = {}
+        #the warnings given while pinning, a pin without the UI returns them
+        self.warnings = []
+
+    #tells the user what is wrong, without the UI it is a maya warning
+    def warn(self, text):
+        self.warnings.append(text)
+        pm.warning(text)
+
+    #gets the control's pin layer, making it if the control does not have one yet
+    def getPinLayer(self, control):
+        layerName = str(control).replace('|', '_').replace(':', '_') + '_1'
+        pm.select(control)
+        #a layer left from pinning this control before is used again
+        if pm.objExists(layerName) and pm.nodeType(layerName) == 'animLayer':
+            pm.animLayer(layerName, edit = True, addSelectedObjects = True)
+            return pm.PyNode(layerName)
+        return pm.PyNode(pm.animLayer(layerName, selected = True, addSelectedObjects = True))
+
+    #gets a pin layer for each control and selects them so the keys the user sets go on them
+    def useControls(self, controls):
+        self.controls = controls
+        self.pinLayers = [self.getPinLayer(control) for control in self.controls]
+        pm.select(self.controls)
+        #gets a list off all layer affecting the current controls 
+        affectingLayers = pm.animLayer(query = True, afl = True) or []
+        #deselects all the affecting layers 
+        for layer in affectingLayers:
+            pm.animLayer(layer, edit = True, selected = False)
+        #selects the pin layers so the keys the user sets go on them
+        for layer in self.pinLayers:
+            layer.setSelected(True)
+
+    #gets what the last pin of the control saved, if it was pinned on the same layer
+    def cachedPin(self, pin):
+        cached = self.pinCache.get(str(pin['control']))
+        if cached and cached['layer'] == str(pin['layer']):
+            return cached
+        return None
+
+    #gets the times of the keys the user set on the pin layer, every key that is not a breakdown the tool wrote
+    def pinKeyTimes(self, pin):
+        keyTimes = set()
+        for curve in pin['layer'].getAnimCurves():
+            keys, breakdowns = curveKeys(curve)
+            keyTimes.update(time for time in keys if time not in breakdowns)
+        return sorted(keyTimes)
+
+    #gets the values of the curves on every whole frame from startTime to endTime in one go
+    #returns the frames and a list of values for each curve in the order of the frames
+    def sampleRange(self, startTime, endTime, animCurve):
+        frames = [float(frame) for frame in range(int(startTime), int(endTime) + 1)]
+        return frames, sampleCurves(animCurve, frames)
+
+    #checks that user frame range is within the range of frames on the control 
+    def isValid(self, pin):
+        valid = True 
+        #gets the animated channels and their curves on the base layer
+        pin['channels'] = baseChannels(pin['layer'], pin['control'])
+        if not pin['channels']:
+            self.warn('%s has no animated channels to pin.' % pin['control'])
+            return False
+        baseKeyTimes = pm.keyframe(list(pin['channels'].values()), query = True, tc = True)
+        #finds first frame
+        pin['baseFirstFrame'] = min(baseKeyTimes)
+        #finds last frame
+        pin['baseLastFrame'] = max(baseKeyTimes) 
+        
+        #checks that frames on pin layer are in range of the first and last frame on base layer
+        if pin['firstFrame'] < pin['baseFirstFrame'] or pin['lastFrame'] > pin['baseLastFrame']:
+            self.warn('Frame range on %s is not valid.' % pin['control'])
+            valid = False
+        
+        return valid
+
+    #pins every selected control that has two valid keys on its pin layer
+    def setKeys(self):
+        pins = []
+        toSample = []
+        for control, layer in zip(self.controls, self.pinLayers):
+            pin = {'control': control, 'layer': layer}
+            #checks the number of keys and that the frame range is valid 
+            if not (self.frameNumberCheck(pin) and self.isValid(pin)):
+                continue
+            pins.append(pin)
+            #the samples from the last pin are used again if the base curves are the same and cover the hold and blend
+            pin['state'] = curveState(pin['channels'].values())
+            cached = self.cachedPin(pin)
+            if (cached and cached['state'] == pin['state'] and cached['attributes'] == list(pin['channels'].keys())
+                    and cached['frames'][0] <= pin['firstFrame'] and cached['frames'][-1] >= pin['lastFrame'] + 5.0):
+                pin['frames'] = cached['frames']
+                pin['samples'] = cached['samples']
+            else:
+                toSample.append(pin)
+        if not pins:
+            return
+        
+        #samples the base layers of the controls that changed over all their holds and blends in one sweep
+        if toSample:
+            baseCurves = []
+            for pin in toSample:
+                baseCurves.extend(pin['channels'].values())
+            firstFrame = min(pin['firstFrame'] for pin in toSample)
+            lastFrame = max(pin['lastFrame'] for pin in toSample)
+            frames, samples = self.sampleRange(firstFrame, lastFrame + 5.0, baseCurves)
+            curveIndex = 0
+            for pin in toSample:
+                pin['frames'] = frames
+                pin['samples'] = samples[curveIndex:curveIndex + len(pin['channels'])]
+                curveIndex += len(pin['channels'])
+        
+        #every control's keys are one undo
+        with pm.UndoChunk():
+            for pin in pins:
+                self.pinKeys(pin, self.cachedPin(pin))
+        self.pins = pins
+
+    #works out the keys of the hold for one control from its samples and writes the ones that changed to its pin layer
+    def pinKeys(self, pin, cached):
+        frames = pin['frames']
+        samples = pin['samples']
+        #gets the value from the first hold frame 
+        startIndex = int(pin['firstFrame'] - frames[0])
+        pin['startValues'] = [values[startIndex] for values in samples]
+        pin['zeroValues'] = [values[int(pin['lastFrame'] + 5.0 - frames[0])] for values in samples]
+        #the control's animated attributes, in the same order as the samples
+        attributes = list(pin['channels'].keys())
+        times = []
+        keyValues = [[] for v in range(len(attributes))]
+        incTime = pin['firstFrame']
+        for key in range(int(pin['firstFrame']), int(pin['lastFrame'])):
+            incTime += 1.0
+            frameIndex = int(incTime - frames[0])
+            currentValues = [values[frameIndex] for values in samples]
+            times.append(int(incTime))
+            for v in range(len(attributes)):
+                value = (pin['startValues'][v] - currentValues[v]) + currentValues[v]
+                
+                if value == 0:
+                    value = pin['startValues'][v]
+                keyValues[v].append(value)
+           
+        #adds a transtion key between end of hold and the rest of the animation     
+        self.zeroKey(pin, times, keyValues)
+        #writes every key of the hold and the blend at once, all but the user's end key as breakdowns
+        breakdowns = [time for time in times if time != pin['lastFrame']]
+        writeKeys(pin['layer'], pin['control'], attributes, times, keyValues, breakdowns)
+        #channels the last pin wrote that are no longer animated lose its keys
+        if cached:
+            for attribute in cached['attributes']:
+                if attribute not in attributes:
+                    for curve in pm.animLayer(pin['layer'], query = True, findCurveForPlug = '%s.%s' % (pin['control'], attribute)) or []:
+                        removeBreakdowns(curve, [])
+        #saves the samples so pinning again does not sample the base layer if it has not changed
+        self.pinCache[str(pin['control'])] = {
+            'layer': str(pin['layer']),
+            'state': pin['state'],
+            'attributes': attributes,
+            'frames': frames,
+            'samples': samples,
+        }
+
+    #adds a zero key five frames after the hold to the keys being set to create a blend     
+    def zeroKey(self, pin, times, values):
+        times.append(pin['lastFrame'] + 5.0)
+        for v in range(len(values)):
+            values[v].append(pin['zeroValues'][v])
+
+    #bakse the animation layers down to the base animation layer
+    def bake(self):
+        if not self.pins:
+            return
+        #gets layers to bake down 
+        layerList = [pin['layer'] for pin in self.pins] + [pm.animLayer(query = True, root = True)]
+        firstFrame = min(pin['baseFirstFrame'] for pin in self.pins)
+        lastFrame = max(pin['baseLastFrame'] for pin in self.pins)
+        #bakes down the layers
+        pm.bakeResults([pin['control'] for pin in self.pins], t = (firstFrame, lastFrame), rwl = layerList, ral = True)
+        #deletes the pin layers
+        pm.delete([pin['layer'] for pin in self.pins])
+        for pin in self.pins:
+            self.pinCache.pop(str(pin['control']), None)
+        self.pins = []
+        self.pinLayers = []
+
+    #checks to make sure the right number of frames are set    
+    def frameNumberCheck(self, pin):
+        frameNumValid = True 
+        #gets the times of the user's keys
+        keyTimes = self.pinKeyTimes(pin)
+        #if there are keys
+        if keyTimes:
+            #gets the number of keys 
+            numKeys = len(keyTimes)
+            if numKeys < 2:
+                self.warn('Only one key set on %s. Please set two keys to continue.' % pin['control'])
+                frameNumValid = False
+                
+            elif numKeys > 2:
+                self.warn('Too many keys set on %s. Please set two keys to continue' % pin['control'])
+                frameNumValid = False 
+            else:
+                #finds the first and last frames the control is keyed on 
+                pin['firstFrame'] = keyTimes[0]
+                pin['lastFrame'] = keyTimes[1]
+        #if there are no keys tells user to set keys 
+        else:
+            self.warn('No keys set on %s. Please set two keys to continue.' % pin['control'])
+            frameNumValid = False 
+        return frameNumValid
+
+#this class makes the UI
+class pinControlUI(QtWidgets.QMainWindow, controlPinner):
+    def __init__(self, parent = None):
+        super(pinControlUI, self).__init__(parent or getMayaWindow())
+        controlPinner.__init__(self)
         self.makeUI()
         self.show()
         self.connectSignals()
 
-        
+    #tells the user what is wrong in a message box
+    def warn(self, text):
+        self.warnings.append(text)
+        warning = QtWidgets.QMessageBox()
+        warning.setWindowTitle('Warning')
+        warning.setText(text)
+        warning.exec_()
+
     #this function makes a simple UI    
     def makeUI(self):
         #makes the main window 
         self.window = QtWidgets.QWidget()
         self.setWindowTitle('Pin Control')
-        self.window.resize(350, 175)
-        self.window.setMinimumSize(350, 175)
-        self.window.setMaximumSize(350, 175)
+        self.window.resize(350, 220)
+        self.window.setMinimumSize(350, 220)
+        self.window.setMaximumSize(350, 220)
         self.verticalWindowLayout = QtWidgets.QVBoxLayout(self.window) 
         
         #makes a frame
@@ -61,7 +433,7 @@ class pinControlUI(QtWidgets.QMainWindow):
         
         #makes a label and text box for holding the selected control 
         self.label = QtWidgets.QLabel()
-        self.label.setText('Selected Control:')
+        self.label.setText('Selected Controls:')
         self.horizontalCtrlLayout = QtWidgets.QHBoxLayout()
         self.horizontalCtrlLayout.addWidget(self.label)
         self.verticalFrameLayout.addLayout(self.horizontalCtrlLayout)
@@ -99,160 +471,71 @@ class pinControlUI(QtWidgets.QMainWindow):
         self.bakeButton.setMinimumSize(310, 35)
         self.bakeButton.setMaximumSize(310, 35)
         self.verticalFrameLayout.addWidget(self.bakeButton)
+        #makes a button for pinning and baking on the export daemon so maya can be used while it bakes
+        self.daemonButton = QtWidgets.QPushButton()
+        self.daemonButton.setText('Pin and Bake with Export Daemon')
+        self.daemonButton.setMinimumSize(310, 35)
+        self.daemonButton.setMaximumSize(310, 35)
+        self.verticalFrameLayout.addWidget(self.daemonButton)
         
         self.verticalWindowLayout.addWidget(self.frame)
         self.setCentralWidget(self.window)
-		
+
     #connects signals for the UI
     def connectSignals(self):
     	QtCore.QObject.connect(self.button, QtCore.SIGNAL('clicked()'), self.buttonPressed)
     	QtCore.QObject.connect(self.pinButton, QtCore.SIGNAL('clicked()'), self.setKeys)
     	QtCore.QObject.connect(self.bakeButton, QtCore.SIGNAL('clicked()'), self.bakeButtonPressed)
- 
-    #this function gets the selected control and throws warnings if the selection is invalid 
-    def getControl(self):
+    	QtCore.QObject.connect(self.daemonButton, QtCore.SIGNAL('clicked()'), self.sendToDaemon)
+
+    #this function gets the selected controls and throws a warning if nothing is selected 
+    def getControls(self):
         #gets a list of selected objects in the scene
         selected = pm.ls(selection = True)
         #checks if the list is empty
         if len(selected) < 1:
-            nothingSelectedWarning = QtWidgets.QMessageBox()
-            nothingSelectedWarning.setWindowTitle('Warning')
-            nothingSelectedWarning.setText('No control selected. Please select one control to continue.')
-            nothingSelectedWarning.exec_()
-        #checks if there is more than one control selected     
-        elif len(selected) > 1:
-            tooManyWarning = QtWidgets.QMessageBox()
-            tooManyWarning.setWindowTitle('Warning')
-            tooManyWarning.setText('More than one object selected. Please select one control to continue.')
-            tooManyWarning.exec_() 
-        #if only one thing is selected return it     
-        else: 
-            return selected[0] 
-   
-    #This function gets the value of keys at a given time on a specified animation curve
-    def getKeyValue(self, time, animCurve): 
-        pm.currentTime(time, edit = True)
-        #this grabs the value of the key at the current frame 
-        valueList = pm.keyframe(animCurve, query = True, eval = True)
-        return valueList 
-    
-    #checks that user frame range is within the range of frames on the control 
-    def isValid(self):
-        valid = True 
-        #gets nodes for pin layer
-        self.layerNodes =  self.affectingLayers[0].getAnimCurves()
-        layerKeyTimesList = pm.keyframe(self.layerNodes[0], query = True, tc = True)
-        #finds the first frame that the control is keyed on 
-        self.firstFrame = layerKeyTimesList[0]
-        #finds the last frame the control is keyed on 
-        self.lastFrame = layerKeyTimesList[len(layerKeyTimesList)-1]
-        
-        #gets nodes for base layer
-        self.baseAnimNode = self.affectingLayers[0].getBaseAnimCurves()
-        baseKeyTimes = pm.keyframe(self.baseAnimNode[0], query = True, tc = True)
-        #finds first frame
-        self.baseFirstFrame = baseKeyTimes[0]
-        #finds last frame
-        self.baseLastFrame = baseKeyTimes[len(baseKeyTimes) -1] 
-        
-        #checks that frames on pin layer are in range of the first and last frame on base layer
-        if self.firstFrame < self.baseFirstFrame or self.lastFrame > self.baseLastFrame:
-            timeInvalidWarning = QtWidgets.QMessageBox()
-            timeInvalidWarning.setWindowTitle('Warning')
-            timeInvalidWarning.setText('Frame range is not valid.')
-            timeInvalidWarning.exec_()
-            valid = False
-        
-        return valid  
+            self.warn('No control selected. Please select at least one control to continue.')
+        return selected
 
-    def setKeys(self):
-        numKeysValid = self.frameNumberCheck()
-        #checks to see if frame range is valid 
-        valid = self.isValid()
-        
-        #if the frame range is valid 
-        if valid == True and numKeysValid == True:
-            #gets the value from the first hold frame 
-            self.startValues = self.getKeyValue(self.firstFrame, self.baseAnimNode)
-            print self.startValues
-            incTime = self.firstFrame
-            for key in range(int(self.firstFrame), int(self.lastFrame)):
-                incTime += 1.0
-                self.currentValues = self.getKeyValue(incTime, self.baseAnimNode)
-                print self.currentValues 
-                list = []
-                #list of possible control attributes
-                self.attList = ['visablitiy','translateX', 'translateY', 'translateZ', 'rotateX', 'rotateY', 'rotateZ', 'scaleX', 'scaleY', 'scaleZ']
-                for v in range(10):
-                    print self.startValues[v], self.currentValues[v]
-                    value = (self.startValues[v] - self.currentValues[v]) + self.currentValues[v]
-                    
-                    if value == 0:
-                        value = self.startValues[v]
-                    list.append(value)
-                    pm.setKeyframe(t = int(incTime), al = self.affectingLayers[0], at = self.attList[v], v = value)
-               
-            #adds a transtion key between end of hold and the rest of the animation     
-            self.zeroKey()
-         
- 
-    #sets a zero key five frames after the hold to create a blend     
-    def zeroKey(self):
-        self.zeroValues = self.getKeyValue(self.lastFrame + 5.0, self.baseAnimNode)
-        for v in range(10):
-           pm.setKeyframe(t = self.lastFrame + 5.0, al = self.affectingLayers[0], at = self.attList[v], value = self.zeroValues[v])
-            
     #this function executes when the selected button is pressed         
     def buttonPressed(self):
-        self.selected = self.getControl()
-        ctrlName = str(self.selected)
-        pm.animLayer(ctrlName + '_1', selected = True, addSelectedObjects = True)
-        #gets a list off all layer affecting the current control 
-        self.affectingLayers = pm.animLayer(query = True, afl = True)
-        #deselects all the affecting layers 
-        for layer in self.affectingLayers:
-            pm.animLayer(layer, edit = True, selected = False)
-        self.affectingLayers[0].setSelected(True)
-        
-        self.textBox.setText(ctrlName)
-    #bakse the animation layers down to the base animation layer
+        controls = self.getControls()
+        if not controls:
+            return
+        self.useControls(controls)
+        self.textBox.setText(', '.join(str(control) for control in self.controls))
+
+    #this function executes when the bake button is pressed
     def bakeButtonPressed(self):
-        #gets layers to bake down 
-        layerList = [self.affectingLayers[0], self.affectingLayers[len(self.affectingLayers)-1]]
-        #bakes down the layer
-        pm.bakeResults(t = (self.baseFirstFrame, self.baseLastFrame), rwl = layerList, ral = True)
-        #deletes the pin layer
-        pm.delete(self.affectingLayers[0])
-     
-    #checks to make sure the right number of frames are set    
-    def frameNumberCheck(self):
-        frameNumValid = True 
-        #grabs animation nodes
-        nodes =  self.affectingLayers[0].getAnimCurves()
-        #if there are animation nodes
-        if nodes:
-            #gets the number of keys 
-            numKeys = pm.keyframe(nodes[0], query = True, keyframeCount = True)
-            if numKeys < 2:
-                oneKeyWarning = QtWidgets.QMessageBox()
-                oneKeyWarning.setWindowTitle('Warning')
-                oneKeyWarning.setText('Only one key set. Please set two keys to continue.')
-                oneKeyWarning.exec_()
-                frameNumValid = False
-                
-            elif numKeys > 2:
-                manyKeysWarning = QtWidgets.QMessageBox()
-                manyKeysWarning.setWindowTitle('Warning')
-                manyKeysWarning.setText('Too many keys set. Please set two keys to continue')
-                manyKeysWarning.exec_()
-                frameNumValid = False 
-        #if there are no animation nodes tells user to set keys 
-        else:
-            noKeysWarning = QtWidgets.QMessageBox()
-            noKeysWarning.setWindowTitle('Warning')
-            noKeysWarning.setText('No keys set. Please set two keys to continue.')
-            noKeysWarning.exec_()
-            frameNumValid = False 
-        return frameNumValid
-        
-test = pinControlUI()
\ No newline at end of file
+        self.bake()
+
+    #sends the saved scene to the export daemon to pin the selected controls and bake them, saved next to the scene
+    #the daemon opens the scene from disk, so the keys on the pin layers have to be saved first
+    def sendToDaemon(self):
+        import exportDaemon
+        if not self.controls:
+            self.warn('No control selected. Please select at least one control to continue.')
+            return
+        scenePath = pm.sceneName()
+        if not scenePath or pm.isModified():
+            self.warn('The scene has to be saved before it can be sent to the export daemon.')
+            return
+        job = {'type': 'pin', 'scene': str(scenePath), 'output': os.path.splitext(str(scenePath))[0] + '_pinned.ma',
+               'kwargs': {'controls': [str(control) for control in self.controls], 'bake': True}}
+        status = exportDaemon.submitJob(job, wait = False)
+        print('sent %s to the export daemon as job %s' % (scenePath, status['id']))
+
+#pins controls without the UI, it is what the export daemon's pin jobs run
+#each control's pin layer already has the two keys of its hold, with bake the pin layers are baked down after
+def pinControls(controls, bake = False):
+    pinner = controlPinner()
+    pinner.useControls([pm.PyNode(control) for control in controls])
+    pinner.setKeys()
+    pinned = [str(pin['control']) for pin in pinner.pins]
+    if bake:
+        pinner.bake()
+    return {'pinned': pinned, 'warnings': pinner.warnings}
+
+#only builds the UI when run from the script editor so pinControls can be imported headless
+if __name__ == '__main__':
+    test = pinControlUI()
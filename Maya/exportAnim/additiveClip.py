@@ -0,0 +1,79 @@
+"""
+#############################################################################
+filename    additiveClip.py
+author      Iris Rahmel
+email    irisra@live.com
+
+date modified    October 18, 2026
+Brief Description:
+    This makes an additive version of a baked AnimClip by taking a
+    reference pose off every joint's local transform on every frame. The
+    reference is one frame of the clip or the first frame of a pose saved
+    as a clip file.
+#############################################################################
+"""
+import os
+
+import numpy as np
+
+import animClip
+from rootMotion import ROTATE_ORDERS, eulerToMatrix, matrixToEuler
+
+#where additive clips are saved, next to the clip they were made from
+SUFFIX = '_additive'
+
+#returns the path an additive clip is saved to for a clip saved to path
+def additivePath(path):
+    base, extension = os.path.splitext(path)
+    return base + SUFFIX + extension
+
+#returns the values of one frame of the clip, shaped (joints, channels), to use as the reference
+def frameReference(clip, frame):
+    if frame < clip.startFrame or frame > clip.endFrame:
+        raise ValueError('reference frame %s is outside the clip (%s to %s)' % (frame, clip.startFrame, clip.endFrame))
+    return np.array(clip.values[:, :, int(frame - clip.startFrame)], dtype = np.float64)
+
+#returns the first frame of a pose clip lined up with the clip's joints and channels, to use as the reference
+#joints are matched by name without namespaces, the clip's joints missing from the pose are an error
+def poseReference(clip, pose):
+    poseJoints = dict((animClip.stripNamespaces(joint), j) for j, joint in enumerate(pose.joints))
+    missing = [joint for joint in clip.joints if animClip.stripNamespaces(joint) not in poseJoints]
+    if missing:
+        raise ValueError('the reference pose has no %s' % ', '.join(missing))
+    jointIndices = [poseJoints[animClip.stripNamespaces(joint)] for joint in clip.joints]
+    channelIndices = [pose.channels.index(channel) for channel in clip.channels]
+    #only the first frame of the pose is filled out
+    firstFrame = pose.sliceFrames(pose.startFrame, pose.startFrame).values
+    return np.array(firstFrame[jointIndices][:, channelIndices, 0], dtype = np.float64)
+
+#returns the additive clip, reference is shaped (joints, channels) and rotateOrders has maya's enum for each joint
+def makeAdditive(clip, reference, rotateOrders):
+    groups = [animClip.channelGroup(channel) for channel in clip.channels]
+    values = np.array(clip.values, dtype = np.float64)
+    for c, group in enumerate(groups):
+        if group == 'translate':
+            values[:, c] -= reference[:, c, np.newaxis]
+        elif group == 'scale':
+            #a reference scale of zero has nothing to divide by, the clip's scale is kept as it is
+            divisor = np.where(reference[:, c] == 0.0, 1.0, reference[:, c])
+            values[:, c] /= divisor[:, np.newaxis]
+
+    rotateIndices = [clip.channels.index(channel) for channel in animClip.CHANNELS[3:6]]
+    rotateOrders = np.asarray(rotateOrders)
+    frameCount = clip.frameCount
+    #the joints that share a rotate order are done together
+    for rotateOrder in np.unique(rotateOrders):
+        order = ROTATE_ORDERS[rotateOrder]
+        joints = np.flatnonzero(rotateOrders == rotateOrder)
+        rotate = clip.values[joints][:, rotateIndices].transpose(0, 2, 1).reshape(-1, 3)
+        rotation = eulerToMatrix(rotate, order).reshape(len(joints), frameCount, 3, 3)
+        referenceRotation = eulerToMatrix(reference[joints][:, rotateIndices], order)
+        #row vectors, so the delta applied before the reference is the rotation times the reference's inverse
+        delta = np.matmul(rotation, np.linalg.inv(referenceRotation)[:, np.newaxis])
+        #continuous over time, on the turn that puts the frame closest to the reference within half a turn of zero
+        angles = np.unwrap(matrixToEuler(delta, order), axis = 1)
+        closest = np.argmax(np.trace(delta, axis1 = 2, axis2 = 3), axis = 1)
+        anchor = angles[np.arange(len(joints)), closest][:, np.newaxis]
+        angles -= 2.0 * np.pi * np.round(anchor / (2.0 * np.pi))
+        values[np.ix_(joints, rotateIndices)] = angles.transpose(0, 2, 1)
+    return animClip.AnimClip(clip.joints, clip.startFrame, values, clip.channels, clip.keyed)
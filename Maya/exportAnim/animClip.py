@@ -0,0 +1,171 @@
+"""
+#############################################################################
+filename    animClip.py
+author      Iris Rahmel
+email    irisra@live.com
+
+date modified    October 18, 2026
+Brief Description:
+    This holds baked skeleton animation outside of maya. The values are one
+    float array shaped (joints, channels, frames) so every curve is one
+    contiguous row, the same layout the curves are written back to maya in.
+    Nothing in here imports maya so it can be used by batch tools and the
+    game side tools as well.
+#############################################################################
+"""
+import numpy as np
+
+#channels baked for every joint, in the order they are stored
+CHANNELS = ['translateX', 'translateY', 'translateZ',
+            'rotateX', 'rotateY', 'rotateZ',
+            'scaleX', 'scaleY', 'scaleZ']
+
+#how far a curve can move, in centimeters, radians or scale, and still be written as one static value
+STATIC_TOLERANCE = 1e-6
+
+#returns which kind of channel this is, translate, rotate or scale
+def channelGroup(channel):
+    for group in ['translate', 'rotate', 'scale']:
+        if channel.startswith(group):
+            return group
+    raise ValueError('%s is not a translate, rotate or scale channel' % channel)
+
+#takes the namespaces off every part of a dag path, so joints match whatever their skeleton was referenced as
+def stripNamespaces(path):
+    return '|'.join(part.split(':')[-1] for part in path.split('|'))
+
+#the values of a clip kept as the animated curves shaped (curves, frames) in joint then channel order,
+#with one value for every other curve, filled out to (joints, channels, frames) only for the part used
+class PackedValues(object):
+    #constants is shaped (joints, channels), the values of the curves that are not in data
+    def __init__(self, data, animated, constants):
+        self.data = data
+        self.animated = animated
+        self.constants = constants
+        self.shape = animated.shape + (data.shape[1],)
+        #which row of data each animated curve is
+        self.rows = np.zeros(animated.shape, dtype = np.int64)
+        self.rows[animated] = np.arange(data.shape[0])
+
+    #returns the values of every curve over frames begin to end as one array
+    def expand(self, begin = 0, end = None):
+        data = self.data[:, begin:end]
+        values = np.empty(self.shape[:2] + (data.shape[1],), dtype = data.dtype)
+        values[...] = self.constants[:, :, np.newaxis]
+        values[self.animated] = data
+        return values
+
+    #returns the packed values of frames begin to end, sharing this one's data
+    def sliceFrames(self, begin, end):
+        return PackedValues(self.data[:, begin:end], self.animated, self.constants)
+
+    #returns one curve's values, an animated curve's are not copied
+    def curve(self, j, c):
+        if self.animated[j, c]:
+            return self.data[self.rows[j, c]]
+        return np.full(self.shape[2], self.constants[j, c], dtype = self.data.dtype)
+
+class AnimClip(object):
+    #values is an array shaped (joints, channels, frames) or PackedValues
+    def __init__(self, joints, startFrame, values, channels = CHANNELS, keyed = None, static = None):
+        self.joints = list(joints)
+        self.channels = list(channels)
+        self.startFrame = startFrame
+        #packed values are filled out the first time values is used
+        if isinstance(values, PackedValues):
+            self.packed = values
+            self._values = None
+        else:
+            self.packed = None
+            #float arrays are kept as they are so memory mapped clips are not copied
+            self._values = np.asarray(values)
+            if self._values.dtype.kind != 'f':
+                self._values = self._values.astype(np.float64)
+        shape = self.packed.shape if self.packed is not None else self._values.shape
+        if shape[:2] != (len(self.joints), len(self.channels)):
+            raise ValueError('values are shaped %s, expected (%d, %d, frames)'
+                             % (shape, len(self.joints), len(self.channels)))
+        #marks the curves that were actually baked, locked channels are left out
+        if keyed is None:
+            keyed = np.ones(shape[:2], dtype = bool)
+        self.keyed = np.asarray(keyed, dtype = bool)
+        #marks the baked curves that do not change, set by staticChannels when the clip is saved
+        if static is None:
+            static = np.zeros(shape[:2], dtype = bool)
+        self.static = np.asarray(static, dtype = bool)
+
+    @property
+    def values(self):
+        if self._values is None:
+            self._values = self.packed.expand()
+        return self._values
+
+    @property
+    def frameCount(self):
+        if self._values is None:
+            return self.packed.shape[2]
+        return self._values.shape[2]
+
+    @property
+    def endFrame(self):
+        return self.startFrame + self.frameCount - 1
+
+    #returns the frame numbers as an array
+    def frames(self):
+        return np.arange(self.frameCount, dtype = np.float64) + self.startFrame
+
+    #returns a clip of the frames from first to last that shares this clip's values
+    def sliceFrames(self, first, last):
+        begin = int(first - self.startFrame)
+        end = int(last - self.startFrame) + 1
+        if begin < 0 or end > self.frameCount or begin >= end:
+            raise ValueError('frames %s to %s are outside the clip (%s to %s)'
+                             % (first, last, self.startFrame, self.endFrame))
+        if self._values is None:
+            values = self.packed.sliceFrames(begin, end)
+        else:
+            values = self._values[:, :, begin:end]
+        #a curve that does not change over the clip does not change over any part of it
+        return AnimClip(self.joints, first, values, self.channels, self.keyed, self.static)
+
+    #returns the values of one joint's channel over the clip
+    def curve(self, joint, channel):
+        j = self.joints.index(joint)
+        c = self.channels.index(channel)
+        if self._values is None:
+            return self.packed.curve(j, c)
+        return self._values[j, c]
+
+#joins clips of neighbouring frame ranges into one, each clip starts on the last frame of the one before it
+#the shared frames are compared so shards that were baked apart can be checked to agree before they are used
+#returns the merged clip and the largest difference found at each boundary
+def mergeClips(clips, tolerance = 1e-4):
+    clips = sorted(clips, key = lambda clip: clip.startFrame)
+    first = clips[0]
+    parts = [first.values]
+    boundaryErrors = []
+    for before, after in zip(clips, clips[1:]):
+        if after.joints != first.joints or after.channels != first.channels:
+            raise ValueError('the clip starting on frame %s has different joints or channels' % after.startFrame)
+        if after.startFrame != before.endFrame:
+            raise ValueError('the clip starting on frame %s does not start on the last frame of the one before it (%s)'
+                             % (after.startFrame, before.endFrame))
+        difference = np.abs(after.values[:, :, 0] - before.values[:, :, -1])
+        difference[~(first.keyed & after.keyed)] = 0.0
+        worst = np.unravel_index(np.argmax(difference), difference.shape)
+        boundaryErrors.append(float(difference[worst]))
+        if difference[worst] > tolerance:
+            raise ValueError('clips do not agree on frame %s, %s.%s is off by %g'
+                             % (after.startFrame, first.joints[worst[0]], first.channels[worst[1]], difference[worst]))
+        parts.append(after.values[:, :, 1:])
+    keyed = np.logical_and.reduce([clip.keyed for clip in clips])
+    static = np.logical_and.reduce([clip.static for clip in clips])
+    merged = AnimClip(first.joints, first.startFrame, np.concatenate(parts, axis = 2), first.channels, keyed, static)
+    return merged, boundaryErrors
+
+#returns a mask of the baked curves whose values stay within the tolerance over the whole clip
+def staticChannels(clip, tolerance = STATIC_TOLERANCE):
+    if clip.frameCount == 0:
+        return np.zeros(clip.keyed.shape, dtype = bool)
+    spread = clip.values.max(axis = 2) - clip.values.min(axis = 2)
+    return clip.keyed & (spread <= tolerance)
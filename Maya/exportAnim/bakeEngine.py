@@ -0,0 +1,172 @@
+"""
+#############################################################################
+filename    bakeEngine.py
+author      Iris Rahmel
+email    irisra@live.com
+
+date modified    October 18, 2026
+Brief Description:
+    This is the "fast" bake mode for exportAnim. Instead of bakeResults it
+    steps the scene through the frame range once, reads the translate,
+    rotate and scale of every joint under the root into one array, and
+    writes each curve with a single addKeys call. Visibility and custom
+    attributes are not baked, bakeResults bakes every keyable attribute.
+#############################################################################
+"""
+import maya.api.OpenMaya as om
+import maya.api.OpenMayaAnim as oma
+import maya.cmds as cmds
+import numpy as np
+
+import animClip
+
+#node types that derive from transform and are parented under joints but are not part of the skeleton
+NOT_JOINTS = ['constraint', 'ikEffector', 'ikHandle']
+
+#returns the root and every transform below it that is part of the skeleton, parents before their children
+def listJoints(root):
+    below = cmds.listRelatives(root, allDescendents = True, type = 'transform', fullPath = True) or []
+    notJoints = set(cmds.ls(below, long = True, type = NOT_JOINTS) or []) if below else set()
+    #listRelatives returns the deepest nodes first
+    return cmds.ls(root, long = True) + [node for node in reversed(below) if node not in notJoints]
+
+#gets the plug for every baked channel of every joint, None for channels that can not be keyed
+def getPlugs(joints, channels = animClip.CHANNELS):
+    selection = om.MSelectionList()
+    for joint in joints:
+        selection.add(joint)
+    plugs = []
+    for i in range(len(joints)):
+        node = om.MFnDependencyNode(selection.getDependNode(i))
+        row = []
+        for channel in channels:
+            plug = node.findPlug(channel, False)
+            row.append(plug if plug.isKeyable and not plug.isLocked else None)
+        plugs.append(row)
+    return plugs
+
+#returns a joint's rotate order and its joint orient and rotate axis in radians
+def readOrientation(joint):
+    toRadians = om.MAngle(1.0, om.MAngle.uiUnit()).asRadians()
+    rotateOrder = cmds.getAttr(joint + '.rotateOrder')
+    rotateAxis = [v * toRadians for v in cmds.getAttr(joint + '.rotateAxis')[0]]
+    jointOrient = [0.0, 0.0, 0.0]
+    if cmds.nodeType(joint) == 'joint':
+        jointOrient = [v * toRadians for v in cmds.getAttr(joint + '.jointOrient')[0]]
+    return rotateOrder, jointOrient, rotateAxis
+
+#returns each joint's rotate order, a node that is not in the scene, like a root motion track, has the default
+def readRotateOrders(joints):
+    return [cmds.getAttr(joint + '.rotateOrder') if cmds.objExists(joint) else 0 for joint in joints]
+
+#steps through the frame range once and reads every channel on every frame
+def sampleJoints(joints, start, end, channels = animClip.CHANNELS):
+    plugs = getPlugs(joints, channels)
+    keyed = np.array([[plug is not None for plug in row] for row in plugs], dtype = bool)
+    flatPlugs = [plug for row in plugs for plug in row if plug is not None]
+    frameCount = int(end) - int(start) + 1
+
+    #a plug with nothing connected to it has the same value on every frame, so it is read once
+    driven = np.array([plug.isDestination for plug in flatPlugs], dtype = bool)
+    drivenPlugs = [plug for plug, isDriven in zip(flatPlugs, driven) if isDriven]
+    samples = np.zeros((len(flatPlugs), frameCount), dtype = np.float64)
+    undriven = [plug.asDouble() for plug, isDriven in zip(flatPlugs, driven) if not isDriven]
+    samples[~driven] = np.array(undriven, dtype = np.float64).reshape(-1, 1)
+
+    #filled a frame at a time, each row is one driven channel's curve
+    drivenSamples = np.zeros((len(drivenPlugs), frameCount), dtype = np.float64)
+    unit = om.MTime.uiUnit()
+    previousTime = oma.MAnimControl.currentTime()
+    try:
+        for f in range(frameCount):
+            oma.MAnimControl.setCurrentTime(om.MTime(start + f, unit))
+            drivenSamples[:, f] = [plug.asDouble() for plug in drivenPlugs]
+    finally:
+        oma.MAnimControl.setCurrentTime(previousTime)
+    samples[driven] = drivenSamples
+
+    values = np.zeros((len(joints), len(channels), frameCount), dtype = np.float64)
+    values[keyed] = samples
+    clip = animClip.AnimClip(joints, start, values, channels, keyed)
+    return clip, plugs
+
+#reads the keys bakeResults left on every joint under the root into a clip
+def readClip(root, start, end, channels = animClip.CHANNELS):
+    joints = listJoints(root)
+    plugs = getPlugs(joints, channels)
+    frameCount = int(end) - int(start) + 1
+    #cmds.keyframe gives values in the scene's units, the clip holds maya's internal units
+    toInternal = {'translate': om.MDistance(1.0, om.MDistance.uiUnit()).asCentimeters(),
+                  'rotate': om.MAngle(1.0, om.MAngle.uiUnit()).asRadians(),
+                  'scale': 1.0}
+
+    values = np.zeros((len(joints), len(channels), frameCount), dtype = np.float64)
+    keyed = np.zeros((len(joints), len(channels)), dtype = bool)
+    for j, joint in enumerate(joints):
+        for c, channel in enumerate(channels):
+            if plugs[j][c] is None:
+                continue
+            attr = '%s.%s' % (joint, channel)
+            curve = cmds.keyframe(attr, query = True, valueChange = True, time = (start, end)) or []
+            #falls back to evaluating every frame when the curve is not keyed on every frame
+            if len(curve) != frameCount:
+                curve = [cmds.getAttr(attr, time = start + f) for f in range(frameCount)]
+            values[j, c] = curve
+            values[j, c] *= toInternal[animClip.channelGroup(channel)]
+            keyed[j, c] = True
+    return animClip.AnimClip(joints, start, values, channels, keyed), plugs
+
+#replaces whatever drives each plug with a new curve holding the sampled values
+#static curves in the clip are set as the plug's value with nothing driving it
+#when keep is given only the kept keys are written, with linear tangents so the curve matches what was reduced
+def writeCurves(clip, plugs, keep = None):
+    unit = om.MTime.uiUnit()
+    allTimes = [om.MTime(frame, unit) for frame in clip.frames()]
+    times = om.MTimeArray(allTimes)
+
+    #breaks the constraint and old curve connections in one modifier before making the new curves
+    modifier = om.MDGModifier()
+    oldCurves = {}
+    for row in plugs:
+        for plug in row:
+            if plug is not None and plug.isDestination:
+                source = plug.source()
+                modifier.disconnect(source, plug)
+                if source.node().hasFn(om.MFn.kAnimCurve):
+                    #keyed by name so a curve driving more than one plug is only deleted once
+                    oldCurves[om.MFnDependencyNode(source.node()).name()] = source.node()
+    modifier.doIt()
+    if oldCurves:
+        deleteModifier = om.MDGModifier()
+        for curve in oldCurves.values():
+            deleteModifier.deleteNode(curve)
+        deleteModifier.doIt()
+
+    curveFn = oma.MFnAnimCurve()
+    keyCount = 0
+    for j, row in enumerate(plugs):
+        for c, plug in enumerate(row):
+            if plug is None:
+                continue
+            if clip.static[j, c]:
+                plug.setDouble(float(clip.values[j, c, 0]))
+                continue
+            curveFn.create(plug)
+            if keep is None:
+                curveFn.addKeys(times, clip.values[j, c].tolist())
+                keyCount += len(times)
+            else:
+                indices = np.flatnonzero(keep[j, c])
+                curveFn.addKeys(om.MTimeArray([allTimes[i] for i in indices]),
+                                clip.values[j, c, indices].tolist(),
+                                oma.MFnAnimCurve.kTangentLinear, oma.MFnAnimCurve.kTangentLinear)
+                keyCount += len(indices)
+    return keyCount
+
+#bakes every joint under the root over the frame range and returns the sampled clip
+def fastBake(root, start, end):
+    joints = listJoints(root)
+    clip, plugs = sampleJoints(joints, start, end)
+    clip.static = animClip.staticChannels(clip)
+    writeCurves(clip, plugs)
+    return clip
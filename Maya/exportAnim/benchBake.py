@@ -0,0 +1,100 @@
+"""
+#############################################################################
+filename    benchBake.py
+author      Iris Rahmel
+email    irisra@live.com
+
+date modified    October 18, 2026
+Brief Description:
+    This compares the two bake modes of exportAnim. It builds a skeleton
+    that is parent constrained to a keyed control rig, bakes it with each
+    mode in a fresh scene, and prints how long each took and the largest
+    difference between the baked values. Only translate, rotate and scale
+    are compared, those are the only channels the fast mode bakes.
+
+    usage:
+        mayapy benchBake.py --joints 180 --frames 2000
+#############################################################################
+"""
+import argparse
+import random
+import sys
+import time
+
+import maya.standalone
+maya.standalone.initialize(name = 'python')
+
+import maya.cmds as cmds
+
+import animClip
+import exportAnim
+
+#builds a skeleton under j_root that follows a keyed control for every joint under prnt_world
+def buildScene(jointCount, frameCount, seed):
+    cmds.file(new = True, force = True)
+    rng = random.Random(seed)
+    world = cmds.group(empty = True, name = 'prnt_world')
+    joints = []
+    cmds.select(clear = True)
+    for i in range(jointCount):
+        #every fourth joint starts a new branch off a random earlier joint
+        if joints and i % 4 == 0:
+            cmds.select(rng.choice(joints))
+        joint = cmds.joint(name = 'j_root' if i == 0 else 'j_%03d' % i, position = (0, 0, 5))
+        joints.append(joint)
+
+        ctrl = cmds.spaceLocator(name = 'ctrl_%03d' % i)[0]
+        cmds.parent(ctrl, world)
+        cmds.delete(cmds.parentConstraint(joint, ctrl))
+        for frame in range(0, frameCount + 1, 10):
+            for attr in ['tx', 'ty', 'tz', 'rx', 'ry', 'rz']:
+                offset = rng.uniform(-2, 2) if attr.startswith('t') else rng.uniform(-30, 30)
+                cmds.setKeyframe(ctrl, attribute = attr, time = frame,
+                                 value = cmds.getAttr('%s.%s' % (ctrl, attr)) + offset)
+        cmds.parentConstraint(ctrl, joint, maintainOffset = True)
+    return joints
+
+#reads back every baked curve so the two modes can be compared
+def readCurves(joints, frameCount):
+    values = []
+    for joint in joints:
+        for channel in animClip.CHANNELS:
+            values.append(cmds.keyframe('%s.%s' % (joint, channel), query = True, valueChange = True,
+                                        time = (0, frameCount)) or [])
+    return values
+
+#times one bake mode on a freshly built scene
+def timeMode(mode, args):
+    joints = buildScene(args.joints, args.frames, args.seed)
+    clock = time.time()
+    exportAnim.bakeAnim('j_root', 0, args.frames, mode)
+    seconds = time.time() - clock
+    return seconds, readCurves(joints, args.frames)
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = 'Compare the bake modes of exportAnim.')
+    parser.add_argument('--joints', type = int, default = 180)
+    parser.add_argument('--frames', type = int, default = 2000)
+    parser.add_argument('--seed', type = int, default = 1)
+    args = parser.parse_args(argv)
+
+    results = {}
+    for mode in exportAnim.BAKE_MODES:
+        results[mode] = timeMode(mode, args)
+
+    keys = args.joints * len(animClip.CHANNELS) * (args.frames + 1)
+    sys.stdout.write('%d joints, %d frames, %d keys\n' % (args.joints, args.frames + 1, keys))
+    for mode in exportAnim.BAKE_MODES:
+        seconds = results[mode][0]
+        sys.stdout.write('%-12s %8.2fs %12.0f keys/s\n' % (mode, seconds, keys / seconds))
+    sys.stdout.write('speed up     %8.2fx\n' % (results['bakeResults'][0] / results['fast'][0]))
+
+    #rotations come back from cmds.keyframe in degrees for both modes so they can be compared directly
+    difference = 0.0
+    for slow, fast in zip(results['bakeResults'][1], results['fast'][1]):
+        for a, b in zip(slow, fast):
+            difference = max(difference, abs(a - b))
+    sys.stdout.write('largest difference between modes %g\n' % difference)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+"""
+#############################################################################
+filename    benchExport.py
+author      Iris Rahmel
+email    irisra@live.com
+
+date modified    October 18, 2026
+Brief Description:
+    This benchmarks the export pipeline on synthetic skeletons without maya,
+    using the stand-in scene in fakeMaya.py. Every combination of joint
+    count and frame count is exported with each pipeline setup, and the
+    keys per second, the slowest stage and the peak python memory are
+    printed. Results can be saved and compared against an earlier run to
+    catch slow downs in the bake and write paths.
+
+    usage:
+        python benchExport.py --joints 60 180 --frames 500 2000 --depth 8 --references 3
+        python benchExport.py --save baseline.json
+        python benchExport.py --compare baseline.json --tolerance 0.2
+#############################################################################
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import fakeMaya
+fakeMaya.install()
+
+import animClip
+import exportAnim
+
+#the export settings each skeleton is run through
+PIPELINES = [
+    ('bakeResults', {'bakeMode': 'bakeResults'}),
+    ('fast', {'bakeMode': 'fast'}),
+    ('fast reduce', {'bakeMode': 'fast', 'reduceKeys': True}),
+    ('fast clip', {'bakeMode': 'fast', 'outputFormat': 'clip'}),
+    ('inPlace', {'inPlace': True}),
+    ('inPlace reduce', {'inPlace': True, 'reduceKeys': True}),
+    ('inPlace clip', {'inPlace': True, 'outputFormat': 'clip'}),
+]
+
+#exports one synthetic scene and returns its timings
+def runCase(name, settings, joints, frames, depth, references, folder):
+    fakeMaya.newScene(joints, depth, references)
+    extension = '.clip' if settings.get('outputFormat') == 'clip' else '.ma'
+    savePath = os.path.join(folder, 'bench' + extension)
+
+    tracemalloc.start()
+    clock = time.time()
+    result = exportAnim.exportScene(None, savePath, 'j_root', 'prnt_world', 0, frames - 1, **settings)
+    seconds = time.time() - clock
+    #the export's stages reset the peak as each one starts, so the most is the largest of theirs
+    peak = max([tracemalloc.get_traced_memory()[1] / (1024.0 * 1024.0)] +
+               [stage.get('pythonPeakMB', 0.0) for stage in result['stages']])
+    tracemalloc.stop()
+
+    keys = joints * len(animClip.CHANNELS) * frames
+    slowest = max(result['stages'], key = lambda stage: stage['wall'])
+    return {
+        'pipeline': name,
+        'joints': joints,
+        'frames': frames,
+        'keys': keys,
+        'seconds': seconds,
+        'keysPerSecond': keys / seconds,
+        'peakMB': peak,
+        'slowestStage': slowest['name'],
+        'stages': result['stages'],
+    }
+
+def caseKey(case):
+    return '%s|%d|%d' % (case['pipeline'], case['joints'], case['frames'])
+
+def formatCases(cases):
+    lines = ['%-22s %6s %6s %10s %14s %9s  %s' % ('pipeline', 'joints', 'frames', 'seconds', 'keys/s', 'peak MB', 'slowest stage')]
+    for case in cases:
+        lines.append('%-22s %6d %6d %10.3f %14.0f %9.1f  %s' % (case['pipeline'], case['joints'], case['frames'],
+                                                               case['seconds'], case['keysPerSecond'],
+                                                               case['peakMB'], case['slowestStage']))
+    return '\n'.join(lines)
+
+#returns a line for every case that is slower than the baseline by more than the tolerance
+def findRegressions(cases, baseline, tolerance):
+    before = dict((caseKey(case), case) for case in baseline)
+    regressions = []
+    for case in cases:
+        old = before.get(caseKey(case))
+        if old and case['keysPerSecond'] < old['keysPerSecond'] * (1.0 - tolerance):
+            regressions.append('%s: %.0f keys/s, was %.0f' % (caseKey(case), case['keysPerSecond'], old['keysPerSecond']))
+    return regressions
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = 'Benchmark the exportAnim pipeline on synthetic skeletons.')
+    parser.add_argument('--joints', type = int, nargs = '+', default = [60, 180])
+    parser.add_argument('--frames', type = int, nargs = '+', default = [500, 2000])
+    parser.add_argument('--depth', type = int, default = 8, help = 'deepest level of the skeleton')
+    parser.add_argument('--references', type = int, default = 3, help = 'prop references next to the rig')
+    parser.add_argument('--save', default = None, help = 'json file to save the results to')
+    parser.add_argument('--compare', default = None, help = 'json file of an earlier run to compare against')
+    parser.add_argument('--tolerance', type = float, default = 0.2,
+                        help = 'how much slower than the earlier run a case can be before it is reported')
+    args = parser.parse_args(argv)
+
+    folder = tempfile.mkdtemp(prefix = 'benchExport')
+    cases = []
+    try:
+        for joints in args.joints:
+            for frames in args.frames:
+                for name, settings in PIPELINES:
+                    cases.append(runCase(name, settings, joints, frames, args.depth, args.references, folder))
+                    sys.stdout.write(formatCases(cases[-1:]).splitlines()[1] + '\n')
+                    sys.stdout.flush()
+    finally:
+        shutil.rmtree(folder)
+    sys.stdout.write('\n' + formatCases(cases) + '\n')
+
+    if args.save:
+        with open(args.save, 'w') as saveFile:
+            json.dump(cases, saveFile, indent = 2)
+    if args.compare:
+        with open(args.compare, 'r') as compareFile:
+            regressions = findRegressions(cases, json.load(compareFile), args.tolerance)
+        for line in regressions:
+            sys.stdout.write('SLOWER ' + line + '\n')
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""
+#############################################################################
+filename    clipBinary.py
+author      Iris Rahmel
+email    irisra@live.com
+
+date modified    October 18, 2026
+Brief Description:
+    This writes an AnimClip to a compact binary file and memory maps it back.
+    Nothing in here imports maya so the game side tools can read clips with
+    just numpy.
+
+    File layout, little endian:
+        header          see HEADER below
+        joint table     per joint, a uint16 byte length then the utf-8 name
+        channel table   per channel, a uint16 byte length then the utf-8 name
+        keyed mask      uint8 per joint per channel, 1 if the curve was baked
+        static mask     uint8 per joint per channel, 1 if the curve holds one
+                        value over the whole clip
+        constants       float per static curve, in joint then channel order
+        data            float array shaped (curves, frames) holding every
+                        curve that is baked and not static, in joint then
+                        channel order, so each curve is one contiguous run
+                        of frames. Starts on a DATA_ALIGN byte boundary.
+    Values are in maya's internal units, centimeters and radians.
+#############################################################################
+"""
+import struct
+
+import numpy as np
+
+import animClip
+
+MAGIC = b'ACLP'
+VERSION = 1
+#magic, version, float size, joint count, channel count, frame count, start frame,
+#then the byte offsets of the joint table, channel table, keyed mask, static mask, constants and data
+HEADER = struct.Struct('<4sHHIIIdQQQQQQ')
+#the data block is aligned so it can be mapped straight into arrays
+DATA_ALIGN = 64
+FLOAT_TYPES = {4: np.dtype('<f4'), 8: np.dtype('<f8')}
+
+#packs a list of names as length prefixed utf-8 strings
+def packNames(names):
+    parts = []
+    for name in names:
+        encoded = name.encode('utf-8')
+        parts.append(struct.pack('<H', len(encoded)) + encoded)
+    return b''.join(parts)
+
+#reads count length prefixed names starting at offset
+def unpackNames(buffer, offset, count):
+    names = []
+    for i in range(count):
+        length = struct.unpack_from('<H', buffer, offset)[0]
+        offset += 2
+        names.append(buffer[offset:offset + length].tobytes().decode('utf-8'))
+        offset += length
+    return names
+
+#writes a clip to path, float size is 4 for float32 values or 8 for float64
+def writeClip(clip, path, floatSize = 4):
+    floatType = FLOAT_TYPES[floatSize]
+    jointTable = packNames(clip.joints)
+    channelTable = packNames(clip.channels)
+    static = clip.static & clip.keyed
+    animated = clip.keyed & ~static
+    keyedMask = clip.keyed.astype(np.uint8).tobytes()
+    staticMask = static.astype(np.uint8).tobytes()
+    constants = np.ascontiguousarray(clip.values[static][:, 0], dtype = floatType).tobytes()
+
+    jointOffset = HEADER.size
+    channelOffset = jointOffset + len(jointTable)
+    keyedOffset = channelOffset + len(channelTable)
+    staticOffset = keyedOffset + len(keyedMask)
+    constantOffset = staticOffset + len(staticMask)
+    dataOffset = constantOffset + len(constants)
+    padding = -dataOffset % DATA_ALIGN
+    dataOffset += padding
+
+    header = HEADER.pack(MAGIC, VERSION, floatSize, len(clip.joints), len(clip.channels), clip.frameCount,
+                         clip.startFrame, jointOffset, channelOffset, keyedOffset, staticOffset, constantOffset,
+                         dataOffset)
+    with open(path, 'wb') as f:
+        f.write(header)
+        f.write(jointTable)
+        f.write(channelTable)
+        f.write(keyedMask)
+        f.write(staticMask)
+        f.write(constants)
+        f.write(b'\0' * padding)
+        f.write(np.ascontiguousarray(clip.values[animated], dtype = floatType).tobytes())
+    return path
+
+#maps a clip file into an AnimClip without reading the data, slicing its values only touches the frames used
+#a file with static or unbaked curves keeps them packed, see animClip.PackedValues
+def readClip(path):
+    mapped = np.memmap(path, dtype = np.uint8, mode = 'r')
+    if mapped.size < HEADER.size or mapped[:len(MAGIC)].tobytes() != MAGIC:
+        raise ValueError('%s is not an animation clip file' % path)
+    (magic, version, floatSize, jointCount, channelCount, frameCount, startFrame, jointOffset, channelOffset,
+     keyedOffset, staticOffset, constantOffset, dataOffset) = HEADER.unpack_from(mapped, 0)
+    if version != VERSION:
+        raise ValueError('%s is clip version %d, this reader only knows version %d' % (path, version, VERSION))
+
+    joints = unpackNames(mapped, jointOffset, jointCount)
+    channels = unpackNames(mapped, channelOffset, channelCount)
+    shape = (jointCount, channelCount)
+    keyed = mapped[keyedOffset:keyedOffset + jointCount * channelCount].view(bool).reshape(shape)
+    floatType = FLOAT_TYPES[floatSize]
+    static = mapped[staticOffset:staticOffset + jointCount * channelCount].view(bool).reshape(shape)
+    animated = keyed & ~static
+    data = np.ndarray((int(animated.sum()), frameCount), dtype = floatType, buffer = mapped, offset = dataOffset)
+    if animated.all():
+        values = data.reshape(shape + (frameCount,))
+    else:
+        constants = np.zeros(shape, dtype = floatType)
+        constants[static] = np.ndarray((int(static.sum()),), dtype = floatType, buffer = mapped, offset = constantOffset)
+        values = animClip.PackedValues(data, animated, constants)
+    return animClip.AnimClip(joints, startFrame, values, channels, keyed, static)
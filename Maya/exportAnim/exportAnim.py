@@ -1,60 +1,660 @@
 """
 #############################################################################
 filename    exportAnim.py
-author      Iris Rahmel 
+author      Iris Rahmel
 email    irisra@live.com
 
 date modified    April 2, 2018
 Brief Description:
-    This is a script that does the preprocess for animations for game and 
-    then exports it. 
+    This is a script that does the preprocess for animations for game and
+    then exports it.
+    The export steps are module level functions so exportBatch.py and
+    exportDaemon.py can run them without the UI.
 #############################################################################
 """
-import pymel.core as pm 
+import os
+
+import pymel.core as pm
+
+import exportPreflight
+import exportTrace
+
+#the fast bake, key reduction, clip output, in place export, shards, root motion and additive clips need numpy, which older versions of mayapy do not come with
+try:
+    import additiveClip
+    import animClip
+    import bakeEngine
+    import clipBinary
+    import keyReduce
+    import rootMotion as rootMotionTrack
+    import skeletonFile
+except ImportError:
+    additiveClip = None
+    animClip = None
+    bakeEngine = None
+    clipBinary = None
+    keyReduce = None
+    rootMotionTrack = None
+    skeletonFile = None
+
+#the ways keys can be baked, the first one is the default
+#bakeResults bakes every keyable attribute, fast only bakes translate, rotate and scale (animClip.CHANNELS)
+#so visibility and custom attributes are left as they are in fast mode
+BAKE_MODES = ['bakeResults', 'fast']
+#the kinds of file an export can be saved as, the first one is the default
+OUTPUT_FORMATS = ['mayaAscii', 'clip']
+#the extension each format is saved with, a save path without one gets it the way saveAs adds it
+OUTPUT_EXTENSIONS = {'mayaAscii': '.ma', 'clip': '.clip'}
+
+#------------------
+#Export Functions
+#------------------
+
+#opens a scene, bakes the keys onto the skeleton, deletes the control rig and saves a new file
+#reduceKeys can be True for the default tolerances or a dictionary of tolerances per channel type
+#inPlace exports from the loaded references without changing the scene, see exportInPlace
+#clipRanges is a list of named frame ranges that are each saved to their own file, see makeClipRanges
+#trace is an ExportTrace the stage timings are added to, the summary is also put in the result
+#bakedClip is an AnimClip baked beforehand, like merged shards, it is used instead of baking the scene
+#rootMotion moves the root's ground movement and heading onto a track of its own, see extractRootMotion
+#additive is a frame number or the path of a pose clip file, each clip is also saved as an additive clip off that pose
+def exportScene(scenePath, savePath, root, world, start, end, cache = None, bakeMode = BAKE_MODES[0],
+                reduceKeys = None, outputFormat = OUTPUT_FORMATS[0], inPlace = False, clipRanges = None,
+                trace = None, bakedClip = None, rootMotion = False, additive = None):
+    trace = trace or exportTrace.ExportTrace()
+    clipRanges = makeClipRanges(savePath, start, end, clipRanges, outputFormat)
+    result = {'output': clipRanges[0]['output'], 'cached': False, 'clips': clipRanges}
+    if cache:
+        settings = cache.exportSettings(root, world, bakeMode, reduceKeys, outputFormat, inPlace, rootMotion, additive)
+    #a scene whose files can all be read without maya is looked up before it is opened, so an unchanged scene is not opened
+    fetched = False
+    if cache and scenePath:
+        with trace.stage('cacheFetch'):
+            files = exportPreflight.Preflight().readableFiles(scenePath)
+            if files is not None:
+                fetchClips(cache, scenePath, files[1:], clipRanges, settings, additive, trace)
+                fetched = True
+        if all(clipRange['cached'] for clipRange in clipRanges):
+            result['cached'] = True
+            result['stages'] = trace.summary()
+            return result
+    #opens the scene if one is given, otherwise the current scene is exported
+    if scenePath:
+        with trace.stage('openFile'):
+            openScene(scenePath)
+    #only the references the skeleton needs are loaded, props and sets stay unloaded
+    with trace.stage('loadReferences'):
+        trace.count('loaded', loadNeededReferences(root))
+    #everything that would stop the export is reported together before any references are imported
+    with trace.stage('validate'):
+        problems = validateScene(root, world, clipRanges, needWorld = not inPlace and outputFormat != 'clip',
+                                 additive = additive, reduceKeys = reduceKeys, outputFormat = outputFormat)
+        if problems:
+            raise ValueError('the scene can not be exported:\n' + '\n'.join(problems))
+    #skips the clips whose scene, references and settings were exported before
+    if cache and not fetched:
+        with trace.stage('cacheFetch'):
+            fetchClips(cache, pm.sceneName(), listReferencePaths(), clipRanges, settings, additive, trace)
+    pending = [clipRange for clipRange in clipRanges if not clipRange['cached']]
+    if not pending:
+        result['cached'] = True
+        result['stages'] = trace.summary()
+        return result
+    #the scene is baked once over every clip still to export
+    first = min(clipRange['start'] for clipRange in pending)
+    last = max(clipRange['end'] for clipRange in pending)
+    #the reference frame is baked with them, it can be in a clip that was cached
+    if isinstance(additive, (int, float)) and bakedClip is None:
+        first = min(first, int(additive))
+        last = max(last, int(additive))
+
+    if inPlace:
+        exportInPlace(pending, root, first, last, reduceKeys, outputFormat, trace, bakedClip, rootMotion, additive)
+    else:
+        #import the references that hold the skeleton and the rig driving it
+        with trace.stage('importReferences'):
+            result['references'] = importReferences(root)
+            trace.count('imported', result['references']['imported'])
+            trace.count('removed', result['references']['removed'])
+        #the bake replaces the constraints' connections with curves, so they are found while they still drive the skeleton
+        with trace.stage('indexConstraints'):
+            constraints = findSkeletonConstraints(root)
+            trace.count('nodes', len(constraints))
+
+        clip = bakedClip
+        if clip is None:
+            with trace.stage('bake', mode = bakeMode):
+                clip = bakeAnim(root, first, last, bakeMode)
+                if clip is None:
+                    trace.count('joints', countJoints(root))
+                    trace.count('keys', pm.keyframe(root, hierarchy = 'below', query = True, keyframeCount = True))
+                else:
+                    trace.count('joints', len(clip.joints))
+                    trace.count('keys', int(clip.keyed.sum()) * clip.frameCount)
+        #the values are needed unless a single clip is saved straight from the baked curves
+        #a clip baked beforehand or with root motion taken off is not on the skeleton's curves yet so it has to be written
+        wholeRange = (bakedClip is None and not rootMotion and len(pending) == 1
+                      and (pending[0]['start'], pending[0]['end']) == (first, last))
+        if clip is None and (reduceKeys or outputFormat == 'clip' or not wholeRange or additive is not None):
+            with trace.stage('readBakedCurves'):
+                clip = readBakedClip(root, first, last)
+        if rootMotion:
+            with trace.stage('rootMotion'):
+                clip = extractRootMotion(clip)
+                trace.count('frames', clip.frameCount)
+
+        if clip is None:
+            #the curves are saved as bakeResults left them, so maya takes the flat ones off
+            with trace.stage('removeStaticCurves'):
+                pm.delete(root, staticChannels = True, hierarchy = 'below')
+        if outputFormat != 'clip':
+            #deletes the constraints driving the skeleton, the rest go with the world group or stay
+            with trace.stage('deleteConstraints'):
+                result['constraintsDeleted'] = deleteConstraints(constraints)
+                trace.count('nodes', result['constraintsDeleted'])
+            #deletes the control rig
+            with trace.stage('deleteWorld'):
+                trace.count('nodes', len(pm.listRelatives(world, allDescendents = True)) + 1)
+                pm.delete(world)
+            if rootMotion:
+                makeRootMotionNode(clip)
+        reference = None
+        if additive is not None:
+            with trace.stage('additiveReference'):
+                reference = additiveReference(clip, additive)
+        for clipRange in pending:
+            saveClipRange(clipRange, clip, reduceKeys, outputFormat, wholeRange, trace, reference)
+
+    if cache:
+        with trace.stage('cacheStore'):
+            for clipRange in pending:
+                cache.store(clipRange['cacheKey'], clipRange['output'])
+                if 'additive' in clipRange:
+                    cache.store(clipRange['cacheKey'] + additiveClip.SUFFIX, clipRange['additive']['output'])
+    result['stages'] = trace.summary()
+    return result
+
+#copies the clips found in the cache to their outputs, a clip with an additive clip is only cached when both are
+def fetchClips(cache, scenePath, referencePaths, clipRanges, settings, additive, trace):
+    for clipRange in clipRanges:
+        clipRange['cacheKey'] = cache.clipKey(scenePath, referencePaths, settings, clipRange['start'], clipRange['end'])
+        clipRange['cached'] = cache.fetch(clipRange['cacheKey'], clipRange['output'])
+        #the additive clip is cached under its own key
+        if clipRange['cached'] and additive is not None:
+            clipRange['additive'] = makeAdditiveRange(clipRange)
+            clipRange['cached'] = clipRange['additive']['cached'] = cache.fetch(
+                clipRange['cacheKey'] + additiveClip.SUFFIX, clipRange['additive']['output'])
+        trace.count('hits', int(clipRange['cached']))
+
+#adds the output format's extension to a path without one, so the result and the cache name the file that is saved
+def withExtension(path, outputFormat):
+    if not os.path.splitext(path)[1]:
+        path += OUTPUT_EXTENSIONS[outputFormat]
+    return path
+
+#makes the list of clips to export, with no clip ranges the whole start to end range is one clip saved to savePath
+#each range is a dictionary with a name, start and end, and optionally its own output path
+def makeClipRanges(savePath, start, end, clipRanges = None, outputFormat = OUTPUT_FORMATS[0]):
+    savePath = withExtension(savePath, outputFormat)
+    if not clipRanges:
+        return [{'name': None, 'start': start, 'end': end, 'output': savePath, 'cached': False}]
+    base, extension = os.path.splitext(savePath)
+    made = []
+    for clipRange in clipRanges:
+        if clipRange['start'] > clipRange['end']:
+            raise ValueError('clip %s starts after it ends' % clipRange['name'])
+        made.append({
+            'name': clipRange['name'],
+            'start': clipRange['start'],
+            'end': clipRange['end'],
+            'output': (withExtension(clipRange['output'], outputFormat) if clipRange.get('output')
+                       else '%s_%s%s' % (base, clipRange['name'], extension)),
+            'cached': False,
+        })
+    return made
+
+#returns a list of everything in the open scene that would stop the export, empty when it can be exported
+#a missing reference that holds the skeleton shows up as a missing root, other missing references do not stop the export
+def validateScene(root, world, clipRanges, needWorld = True, additive = None, reduceKeys = None,
+                  outputFormat = OUTPUT_FORMATS[0]):
+    problems = []
+    #a clip file holds every frame of each curve, so the keys a reduction removes would still be written
+    if reduceKeys and outputFormat == 'clip':
+        problems.append('keys can not be reduced for clip output, clip files keep every frame')
+    for clipRange in clipRanges:
+        if clipRange['start'] > clipRange['end']:
+            problems.append('start frame %s is after end frame %s' % (clipRange['start'], clipRange['end']))
+    if not pm.objExists(root):
+        problems.append('root joint %s is not in the scene' % root)
+    elif len(pm.ls(root)) > 1:
+        problems.append('more than one node is named %s' % root)
+    if needWorld and not pm.objExists(world):
+        problems.append('world group %s is not in the scene' % world)
+    if additive is not None:
+        if additiveClip is None:
+            problems.append('additive clips need numpy to be installed for mayapy')
+        elif isinstance(additive, (int, float)):
+            first = min(clipRange['start'] for clipRange in clipRanges)
+            last = max(clipRange['end'] for clipRange in clipRanges)
+            if not first <= additive <= last:
+                problems.append('additive reference frame %s is outside the exported frames %s to %s' % (additive, first, last))
+        elif not os.path.isfile(additive):
+            problems.append('additive reference pose %s does not exist' % additive)
+    return problems
+
+#reads clip ranges typed into the UI as "name start end" separated by semicolons
+def parseClipRanges(text):
+    clipRanges = []
+    for entry in text.split(';'):
+        if not entry.strip():
+            continue
+        name, start, end = entry.split()
+        clipRanges.append({'name': name, 'start': int(start), 'end': int(end)})
+    return clipRanges
+
+#reads the additive reference typed into the UI, a frame number or the path of a pose clip file
+def parseAdditive(text):
+    text = text.strip()
+    if not text:
+        return None
+    if text.lstrip('-').isdigit():
+        return int(text)
+    return text
+
+#writes one clip range out of the baked scene, wholeRange means the baked curves already are this clip
+def saveClipRange(clipRange, clip, reduceKeys, outputFormat, wholeRange = False, trace = None, reference = None):
+    trace = trace or exportTrace.ExportTrace()
+    if clip is not None:
+        clip = clip.sliceFrames(clipRange['start'], clipRange['end'])
+        #curves that do not change over this clip are written as one value
+        with trace.stage('findStaticCurves'):
+            clip.static = animClip.staticChannels(clip)
+            trace.count('curves', int(clip.static.sum()))
+    keep = None
+    if reduceKeys:
+        with trace.stage('reduceKeys'):
+            keep, clipRange['reduction'] = keyReduce.reduceClip(clip, reduceKeys if isinstance(reduceKeys, dict) else None)
+            trace.count('keysRemoved', sum(joint['keysRemoved'] for joint in clipRange['reduction']))
+
+    if outputFormat == 'clip':
+        #the clip only holds the skeleton's curves so the rest of the scene does not need cleaning up
+        with trace.stage('writeClip'):
+            clipRange['output'] = clipBinary.writeClip(clip, clipRange['output'])
+            trace.count('keys', int((clip.keyed & ~clip.static).sum()) * clip.frameCount)
+    else:
+        #puts just this clip's keys on the curves before saving
+        if keep is not None or not wholeRange:
+            with trace.stage('writeCurves'):
+                trace.count('keys', bakeEngine.writeCurves(clip, bakeEngine.getPlugs(clip.joints, clip.channels), keep))
+        #save a new file
+        with trace.stage('saveAs'):
+            clipRange['output'] = str(pm.saveAs(clipRange['output'], save = True, force = True, type = outputFormat))
+    if reference is not None:
+        #the additive clip goes through the same steps, written over the curves the clip was just saved from
+        clipRange['additive'] = saveClipRange(makeAdditiveRange(clipRange), makeAdditiveClip(clip, reference, trace),
+                                              reduceKeys, outputFormat, trace = trace)
+    return clipRange
+
+#returns the resolved path of every reference in the scene, including nested ones
+def listReferencePaths():
+    return [str(ref.path) for ref in pm.listReferences(recursive = True)]
+
+#function imports referenced files, with a root only the references the skeleton needs are imported
+#the others are removed, the ones left unloaded by loadNeededReferences have no nodes so they come out quickly
+def importReferences(root = None):
+    needed = None
+    if root:
+        needed = findNeededReferences(root)
+    #imports the top references until there are none left, which gets nested references to any depth
+    importedCount = 0
+    removedCount = 0
+    refs = pm.listReferences()
+    while refs:
+        for ref in refs:
+            if needed is not None and ref.refNode.name() not in needed:
+                #the rest are taken out of the scene with anything nested in them, so the saved file has no references
+                ref.remove()
+                removedCount += 1
+                continue
+            ref.importContents()
+            importedCount += 1
+        refs = pm.listReferences()
+    return {'imported': importedCount, 'removed': removedCount}
+
+#returns the reference nodes that hold the skeleton under the root or anything driving it through constraints
+def findNeededReferences(root):
+    needed = set()
+    for node in walkSkeleton(root):
+        if node.isReferenced():
+            refNode = pm.referenceQuery(node, referenceNode = True)
+            #nested references need every reference above them imported too
+            while refNode and refNode not in needed:
+                needed.add(refNode)
+                refNode = pm.referenceQuery(refNode, referenceNode = True, parent = True)
+    return needed
+
+#returns the skeleton under the root and every loaded node driving it, out through constraints to their targets and the targets' parents
+def walkSkeleton(root):
+    toVisit = [root] + (pm.listRelatives(root, allDescendents = True) or [])
+    visited = {}
+    while toVisit:
+        node = pm.PyNode(toVisit.pop())
+        if str(node) in visited:
+            continue
+        visited[str(node)] = node
+
+        constraints = pm.listConnections(node, source = True, destination = False, type = 'constraint') or []
+        for constraint in set(constraints):
+            toVisit.append(constraint)
+            targets = pm.listConnections(constraint.name() + '.target', source = True, destination = False) or []
+            for target in set(targets):
+                if target != constraint:
+                    toVisit.append(target)
+                    toVisit.extend(pm.listRelatives(target, allParents = True) or [])
+    return list(visited.values())
+
+#loads the references the skeleton under the root needs into a scene opened without them, see openScene
+#the reference holding the root is loaded first, then any reference connected to the skeleton or the rig driving it,
+#walking out again after each load until nothing else is connected, returns how many references were loaded
+def loadNeededReferences(root):
+    loaded = loadRootReference(root)
+    while pm.objExists(root):
+        names = set(node.name() for node in walkSkeleton(root))
+        toLoad = [ref for ref in pm.listReferences(recursive = True) if not ref.isLoaded() and drivesNodes(ref, names)]
+        if not toLoad:
+            break
+        for ref in toLoad:
+            ref.load(loadReferenceDepth = 'none')
+        loaded += len(toLoad)
+    return loaded
+
+#loads unloaded references until the root is in the scene, returns how many were loaded
+#maya ascii files are read for the root without loading them, references that can not be read are loaded to look
+def loadRootReference(root):
+    checker = exportPreflight.Preflight()
+    wanted = set([exportPreflight.shortName(root)])
+    failed = set()
+    loaded = 0
+    while not pm.objExists(root):
+        holding = []
+        unknown = []
+        for ref in pm.listReferences(recursive = True):
+            if ref.isLoaded() or ref.refNode.name() in failed:
+                continue
+            path = str(ref.path)
+            files = checker.readableFiles(path) if os.path.isfile(path) else None
+            if files is None:
+                unknown.append(ref)
+            elif any(checker.findNodes(filePath, wanted) for filePath in files):
+                holding.append(ref)
+        if not holding and not unknown:
+            break
+        #one reference at a time, it holds the root or has nested references that do
+        ref = (holding + unknown)[0]
+        ref.load(loadReferenceDepth = 'none')
+        if ref.isLoaded():
+            loaded += 1
+        else:
+            #a missing file does not load, validateScene reports the root as missing if it was in there
+            failed.add(ref.refNode.name())
+    return loaded
+
+#returns whether an unloaded reference has connections into any of the named nodes, its nodes drive them
+#the connections are kept as reference edits while it is unloaded
+def drivesNodes(ref, names):
+    for edit in pm.referenceQuery(ref.refNode, editStrings = True, editCommand = 'connectAttr') or []:
+        destination = edit.split()[-1].strip('"')
+        if destination.split('.')[0].split('|')[-1] in names:
+            return True
+    return False
+
+#returns the constraints driving the root and the joints under it, and any constraint nodes parented under them
+def findSkeletonConstraints(root):
+    joints = [root] + (pm.listRelatives(root, allDescendents = True, type = 'transform') or [])
+    #one query for the whole skeleton instead of one per joint
+    constraints = pm.listConnections(joints, source = True, destination = False, type = 'constraint') or []
+    constraints += pm.listRelatives(root, allDescendents = True, type = 'constraint') or []
+    return sorted(set(str(constraint) for constraint in constraints))
+
+#deletes the constraints from findSkeletonConstraints in one delete and returns how many there were
+#constraints on props and other characters in the scene are left alone
+def deleteConstraints(constraints):
+    if constraints:
+        pm.delete(constraints)
+    return len(constraints)
+
+#opens a scene in its project, so relative reference paths are found the same way exportPreflight finds them
+#the references are left unloaded, loadNeededReferences loads the ones the export needs
+def openScene(scenePath):
+    workspace = exportPreflight.findWorkspace(scenePath)
+    if workspace:
+        pm.workspace(workspace, openWorkspace = True)
+    pm.openFile(scenePath, force = True, loadReferenceDepth = 'none')
+
+#counts the root and the transforms below it that are part of the skeleton, with pymel so it works without numpy
+#leaves out the same node types as bakeEngine.listJoints
+def countJoints(root):
+    below = pm.listRelatives(root, allDescendents = True, type = 'transform')
+    notJoints = pm.listRelatives(root, allDescendents = True, type = ['constraint', 'ikEffector', 'ikHandle'])
+    return len(below) - len(notJoints) + 1
+
+#bakes down keys onto skinning skeleton, the fast mode also returns the baked values as an AnimClip
+def bakeAnim(root, start, end, mode = BAKE_MODES[0]):
+    if mode == 'bakeResults':
+        pm.bakeResults(root, sm = True, hi = 'below', t = (start, end))
+    elif mode == 'fast':
+        if bakeEngine is None:
+            raise RuntimeError('the fast bake mode needs numpy to be installed for mayapy')
+        return bakeEngine.fastBake(root, start, end)
+    else:
+        raise ValueError('unknown bake mode %s, expected one of %s' % (mode, ', '.join(BAKE_MODES)))
+
+#bakeResults does not hand back the values so they are read from the new curves
+def readBakedClip(root, start, end):
+    if bakeEngine is None:
+        raise RuntimeError('reading baked curves needs numpy to be installed for mayapy')
+    return bakeEngine.readClip(root, start, end)[0]
+
+#samples the skeleton under the root where it is and writes just that skeleton for each clip range
+#the scene is not changed, the reduction only picks the keys to write
+#baked is a clip sampled beforehand, like merged shards, which skips sampling the scene
+def exportInPlace(clipRanges, root, start, end, reduceKeys = None, outputFormat = OUTPUT_FORMATS[0], trace = None,
+                  baked = None, rootMotion = False, additive = None):
+    if bakeEngine is None:
+        raise RuntimeError('the in place export needs numpy to be installed for mayapy')
+    if outputFormat not in ['mayaAscii', 'clip']:
+        raise ValueError('the in place export can not write %s files' % outputFormat)
+    trace = trace or exportTrace.ExportTrace()
+    if baked is None:
+        with trace.stage('sample'):
+            joints = bakeEngine.listJoints(root)
+            baked = bakeEngine.sampleJoints(joints, start, end)[0]
+            trace.count('joints', len(joints))
+    else:
+        joints = baked.joints
+    if rootMotion:
+        #the track is written in front of the skeleton, joints stays as the skeleton's own joints
+        with trace.stage('rootMotion'):
+            baked = extractRootMotion(baked)
+            trace.count('frames', baked.frameCount)
+    reference = None
+    if additive is not None:
+        with trace.stage('additiveReference'):
+            reference = additiveReference(baked, additive)
+
+    for clipRange in clipRanges:
+        clip = baked.sliceFrames(clipRange['start'], clipRange['end'])
+        writeInPlace(clipRange, clip, joints, reduceKeys, outputFormat, trace)
+        if reference is not None:
+            clipRange['additive'] = writeInPlace(makeAdditiveRange(clipRange), makeAdditiveClip(clip, reference, trace),
+                                                 joints, reduceKeys, outputFormat, trace)
+    return clipRanges
+
+#writes one clip sliced out of the in place bake to its own file
+def writeInPlace(clipRange, clip, joints, reduceKeys, outputFormat, trace):
+    with trace.stage('findStaticCurves'):
+        clip.static = animClip.staticChannels(clip)
+        trace.count('curves', int(clip.static.sum()))
+    keep = None
+    if reduceKeys:
+        with trace.stage('reduceKeys'):
+            keep, clipRange['reduction'] = keyReduce.reduceClip(clip, reduceKeys if isinstance(reduceKeys, dict) else None)
+            trace.count('keysRemoved', sum(joint['keysRemoved'] for joint in clipRange['reduction']))
+    with trace.stage('writeFile'):
+        if outputFormat == 'clip':
+            clipRange['output'] = clipBinary.writeClip(clip, clipRange['output'])
+        else:
+            clipRange['output'] = skeletonFile.exportSkeleton(clipRange['output'], joints, clip, keep)
+        animated = clip.keyed & ~clip.static
+        trace.count('keys', int(animated.sum()) * clip.frameCount if keep is None else int(keep[animated].sum()))
+    return clipRange
+
+#moves the ground movement and heading of the clip's root, its first joint, onto a root motion track in front of it
+#the root's rotate order, joint orient and rotate axis are read from the scene
+def extractRootMotion(clip):
+    if rootMotionTrack is None:
+        raise RuntimeError('extracting root motion needs numpy to be installed for mayapy')
+    rotateOrder, jointOrient, rotateAxis = bakeEngine.readOrientation(clip.joints[0])
+    return rootMotionTrack.extractRootMotion(clip, rotateOrder, jointOrient, rotateAxis)
+
+#returns the reference pose for additive clips, shaped (joints, channels), and the rotate order of each joint
+#additive is a frame of the baked clip or the path of a pose clip file
+def additiveReference(clip, additive):
+    if isinstance(additive, (int, float)):
+        reference = additiveClip.frameReference(clip, additive)
+    else:
+        reference = additiveClip.poseReference(clip, clipBinary.readClip(additive))
+    return reference, bakeEngine.readRotateOrders(clip.joints)
+
+#returns the clip with the reference pose taken off every frame
+def makeAdditiveClip(clip, reference, trace):
+    with trace.stage('additive'):
+        added = additiveClip.makeAdditive(clip, reference[0], reference[1])
+        trace.count('frames', added.frameCount)
+    return added
+
+#returns the clip range an additive clip is saved to, next to the clip it is made from
+def makeAdditiveRange(clipRange):
+    return {'name': clipRange['name'], 'start': clipRange['start'], 'end': clipRange['end'],
+            'output': additiveClip.additivePath(clipRange['output']), 'cached': False}
+
+#makes a transform in the scene for the clip's root motion track so its curves can be written and saved
+def makeRootMotionNode(clip):
+    node = pm.createNode('transform', name = rootMotionTrack.TRACK_NAME)
+    clip.joints[0] = node.longName()
+    return node
+
+#opens the scene and samples the skeleton under the root over one shard of a long take, saving it to shardPath
+#shards are sampled from the loaded references like the in place export, so any bake mode merges to the same clip
+def bakeShard(scenePath, root, start, end, shardPath, trace = None):
+    if bakeEngine is None:
+        raise RuntimeError('baking shards needs numpy to be installed for mayapy')
+    trace = trace or exportTrace.ExportTrace()
+    if scenePath:
+        with trace.stage('openFile'):
+            openScene(scenePath)
+    with trace.stage('loadReferences'):
+        trace.count('loaded', loadNeededReferences(root))
+    with trace.stage('sampleShard', frames = '%s-%s' % (start, end)):
+        clip = bakeEngine.sampleJoints(bakeEngine.listJoints(root), start, end)[0]
+        trace.count('joints', len(clip.joints))
+        trace.count('frames', clip.frameCount)
+    #saved at full precision so the merged clip matches one baked in a single pass
+    with trace.stage('writeShard'):
+        clipBinary.writeClip(clip, shardPath, floatSize = 8)
+    return shardPath
+
+#reads the shard files of one take and joins them into one clip, checking they agree where they meet
+def mergeShards(shardPaths, tolerance = 1e-4, trace = None):
+    trace = trace or exportTrace.ExportTrace()
+    with trace.stage('mergeShards'):
+        clip, boundaryErrors = animClip.mergeClips([clipBinary.readClip(path) for path in shardPaths], tolerance)
+        trace.count('shards', len(shardPaths))
+        trace.count('frames', clip.frameCount)
+    return clip, boundaryErrors
+
+#------------------
+#Class
+#------------------
 
 class ExportUI(object):
     def __init__(self):
-        #makes the UI for the script in the intializer 
+        #makes the UI for the script in the intializer
         myWindow = pm.window(title = 'Bake Keys')
         col = pm.columnLayout(adjustableColumn = True)
         self.save = pm.textFieldGrp(label = 'Save File As:', text = 'keys_baked')
-      
+
         self.root = pm.textFieldGrp(label = 'Root Joint Name:', text = 'j_root')
-        
-       
+
+
         self.world = pm.textFieldGrp(label = 'World Group Name:', text = 'prnt_world')
 
         self.start =  pm.intFieldGrp(label = 'Start Frame:')
         self.end =  pm.intFieldGrp(label = 'End Frame:')
-      
+
+        self.bakeMode = pm.optionMenuGrp(label = 'Bake Mode:', annotation = 'fast only bakes translate, rotate and scale, '
+                                         'use bakeResults to bake visibility and custom attributes')
+        for mode in BAKE_MODES:
+            pm.menuItem(label = mode)
+
+        self.reduceKeys = pm.checkBoxGrp(label = 'Reduce Keys:')
+
+        self.outputFormat = pm.optionMenuGrp(label = 'Save As Type:')
+        for outputFormat in OUTPUT_FORMATS:
+            pm.menuItem(label = outputFormat)
+
+        self.inPlace = pm.checkBoxGrp(label = 'Export In Place:')
+
+        self.rootMotion = pm.checkBoxGrp(label = 'Extract Root Motion:')
+
+        #a frame number or a pose clip file, left empty no additive clips are saved
+        self.additive = pm.textFieldGrp(label = 'Additive Reference (frame or pose):')
+
+        #more than one clip can be exported from the scene, typed as "name start end; name start end"
+        self.clipRanges = pm.textFieldGrp(label = 'Clips (name start end;):')
+
         button = pm.button(label = 'bake keys', command = self.bakeKeys)
+        #exports the saved scene on a running exportDaemon.py so maya can be used while it bakes
+        daemonButton = pm.button(label = 'send to export daemon', command = self.sendToDaemon)
 
         pm.showWindow(myWindow)
-     
-    #this function bakes keys onto the main skeleton and deletes the control rig 
+
+    #this function bakes keys onto the main skeleton and deletes the control rig
     def bakeKeys(self, *args):
-        #import the referenced rig and model 
-        self.importReferences()
-        
-        self.bakeAnim()
-        
-        #deletes all constraints in the scene
-        pm.delete(all = True, cn = True)
-        #deletes the control rig
-        pm.delete(self.world.getText())
-        #save a new file 
-        pm.saveAs(self.save.getText(), save = True, force = True, type = 'mayaAscii')
-    
-    #function imports referenced files 
+        result = exportScene(None, self.save.getText(), self.root.getText(), self.world.getText(),
+                    self.start.getValue()[0], self.end.getValue()[0], bakeMode = self.bakeMode.getValue(),
+                    reduceKeys = self.reduceKeys.getValue1(), outputFormat = self.outputFormat.getValue(),
+                    inPlace = self.inPlace.getValue1(), clipRanges = parseClipRanges(self.clipRanges.getText()),
+                    rootMotion = self.rootMotion.getValue1(), additive = parseAdditive(self.additive.getText()))
+        #shows where the time went in the script editor
+        print(exportTrace.formatSummary(result['stages']))
+
+    #sends the saved scene to the export daemon with the settings from the UI
+    def sendToDaemon(self, *args):
+        import exportDaemon
+        scenePath = pm.sceneName()
+        if not scenePath:
+            pm.warning('the scene has to be saved before it can be sent to the export daemon')
+            return
+        #the daemon opens the scene from disk, so the output is put next to it
+        output = os.path.join(os.path.dirname(scenePath), self.save.getText())
+        job = {'type': 'export', 'scene': str(scenePath), 'output': output, 'root': self.root.getText(),
+               'world': self.world.getText(), 'start': self.start.getValue()[0], 'end': self.end.getValue()[0],
+               'bakeMode': self.bakeMode.getValue(), 'reduceKeys': self.reduceKeys.getValue1(),
+               'outputFormat': self.outputFormat.getValue(), 'inPlace': self.inPlace.getValue1(),
+               'clips': parseClipRanges(self.clipRanges.getText()) or None, 'rootMotion': self.rootMotion.getValue1(),
+               'additive': parseAdditive(self.additive.getText())}
+        status = exportDaemon.submitJob(job, wait = False)
+        print('sent %s to the export daemon as job %s' % (scenePath, status['id']))
+
+    #function imports referenced files
     def importReferences(self):
-       #loops twice because there were two refernce layers in our scenes
-       for i in range(2):
-            for ref in pm.listReferences():
-                 ref.importContents()
-                 
-    #bakes down keys onto skinning skeleton         
-    def bakeAnim(self,*args): 
-        pm.bakeResults(self.root.getText(),sm = True, hi= 'below', t=(self.start.getValue()[0],self.end.getValue()[0]))
-    
-       
-UI = ExportUI()
\ No newline at end of file
+        importReferences(self.root.getText())
+
+    #bakes down keys onto skinning skeleton
+    def bakeAnim(self,*args):
+        bakeAnim(self.root.getText(), self.start.getValue()[0], self.end.getValue()[0], self.bakeMode.getValue())
+
+#only builds the UI when run from the script editor so the export functions can be imported headless
+if __name__ == '__main__':
+    UI = ExportUI()
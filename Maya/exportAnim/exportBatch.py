@@ -0,0 +1,522 @@
+"""
+#############################################################################
+filename    exportBatch.py
+author      Iris Rahmel
+email    irisra@live.com
+
+date modified    October 18, 2026
+Brief Description:
+    This is a command line version of exportAnim that exports a whole list
+    of scenes without the UI. It is run with mayapy and spreads the scenes
+    over a pool of worker processes that each have their own maya session.
+
+    usage:
+        mayapy exportBatch.py manifest.json --workers 4 --results results.json
+                              --cacheDir D:/exportCache --trace export_trace.json
+                              --scratchDir D:/exportScratch
+        mayapy exportBatch.py manifest.json --check
+        mayapy exportBatch.py manifest.json --memorySoft 6000 --memoryHard 12000
+
+    The manifest is a json file with a list of jobs. Values in "defaults"
+    are used for any job that does not set them:
+        {
+            "defaults": {"root": "j_root", "world": "prnt_world"},
+            "jobs": [
+                {"scene": "D:/anim/run.ma", "output": "D:/export/run_baked.ma",
+                 "start": 0, "end": 24}
+            ]
+        }
+    A job can also set the settings exportAnim.exportScene takes, like
+    bakeMode, outputFormat or clips, and shards to split a long take over
+    several workers. One result record per scene is written to the results
+    file, --check only runs the preflight checks (exportPreflight.py).
+#############################################################################
+"""
+import argparse
+import collections
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+import traceback
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+import exportCache
+import exportMemory
+import exportPrefetch
+import exportPreflight
+import exportPublish
+import exportTrace
+import exportWorkers
+
+#values a job gets if neither the job or the manifest defaults set them
+JOB_DEFAULTS = {'root': 'j_root', 'world': 'prnt_world', 'bakeMode': 'bakeResults', 'reduceKeys': False,
+                'outputFormat': 'mayaAscii', 'inPlace': False, 'clips': None, 'shards': 1,
+                'rootMotion': False, 'additive': None}
+#file extension for each output format
+OUTPUT_EXTENSIONS = {'mayaAscii': '.ma', 'clip': '.clip'}
+#the suffix exportAnim keys a clip's additive clip under, additiveClip.SUFFIX
+ADDITIVE_SUFFIX = '_additive'
+#values every job needs before it can be exported, start and end can be left out when the job has clips
+REQUIRED_KEYS = ['scene', 'start', 'end']
+#a take is not split into shards shorter than this, opening the scene would take longer than sampling them
+MIN_SHARD_FRAMES = 50
+#how far apart two shards can be on the frame they share, in centimeters, radians or scale
+SHARD_TOLERANCE = 1e-4
+#how many jobs past the ones the workers are on have their files read ahead
+PREFETCH_AHEAD = 2
+
+#------------------
+#Manifest
+#------------------
+
+#reads the manifest and returns a list of complete job dictionaries
+def loadManifest(manifestPath, outputDir = None):
+    with open(manifestPath, 'r') as manifestFile:
+        manifest = json.load(manifestFile)
+    #the manifest can be just a list of jobs
+    if isinstance(manifest, list):
+        manifest = {'jobs': manifest}
+
+    defaults = dict(JOB_DEFAULTS)
+    defaults.update(manifest.get('defaults', {}))
+
+    jobs = []
+    for index, entry in enumerate(manifest.get('jobs', [])):
+        try:
+            #relative scene paths are relative to the manifest
+            jobs.append(makeJob(entry, index, defaults, os.path.dirname(os.path.abspath(manifestPath)), outputDir))
+        except ValueError as error:
+            raise ValueError('%s in %s' % (error, manifestPath))
+    return jobs
+
+#fills in one job from the defaults and checks it has what it needs, a relative scene path is relative to folder
+def makeJob(entry, index, defaults = JOB_DEFAULTS, folder = '', outputDir = None):
+    job = dict(defaults)
+    job.update(entry)
+    #a job with clips takes its frame range from them
+    if job['clips']:
+        job.setdefault('start', min(clip['start'] for clip in job['clips']))
+        job.setdefault('end', max(clip['end'] for clip in job['clips']))
+    missing = [key for key in REQUIRED_KEYS if key not in job]
+    if missing:
+        raise ValueError('job %d is missing %s' % (index, ', '.join(missing)))
+    job['scene'] = os.path.join(folder, job['scene'])
+    if 'output' not in job:
+        job['output'] = defaultOutputPath(job['scene'], outputDir, job['outputFormat'])
+    job['index'] = index
+    return job
+
+#makes an output path next to the scene, or in the output directory, the same way the UI names files
+def defaultOutputPath(scenePath, outputDir = None, outputFormat = 'mayaAscii'):
+    name = os.path.splitext(os.path.basename(scenePath))[0] + '_keys_baked' + OUTPUT_EXTENSIONS[outputFormat]
+    return os.path.join(outputDir or os.path.dirname(scenePath), name)
+
+#points a job's outputs at its own folder in scratch, returns the staged job and the output path of each clip in order
+#clip outputs are named the way exportAnim.makeClipRanges names them
+def stageJob(job, scratchDir):
+    folder = os.path.join(scratchDir, str(job['index']))
+    staged = dict(job, output = os.path.join(folder, os.path.basename(job['output'])))
+    destinations = [job['output']]
+    if job['clips']:
+        base, extension = os.path.splitext(job['output'])
+        staged['clips'] = []
+        destinations = []
+        for i, clip in enumerate(job['clips']):
+            destination = clip.get('output') or '%s_%s%s' % (base, clip['name'], extension)
+            #numbered so clips with outputs in different folders but the same file name do not collide
+            scratchPath = os.path.join(folder, '%d_%s' % (i, os.path.basename(destination)))
+            staged['clips'].append(dict(clip, output = scratchPath))
+            destinations.append(destination)
+    return staged, destinations
+
+#returns where a clip saved to scratchPath is published, the path maya saved to can differ from the one it was given
+#so the extension maya added to a path without one is added to the destination too
+def publishPath(scratchPath, destination):
+    if not os.path.splitext(destination)[1]:
+        destination += os.path.splitext(scratchPath)[1]
+    return destination
+
+#returns whether every clip of a job is in the cache, looked up from the files on disk the way exportAnim.exportScene does
+#a job that is all cached is not split into shards, the worker copies it from the cache without opening the scene
+def jobCached(job, cache, checker):
+    files = checker.readableFiles(job['scene'])
+    if files is None:
+        return False
+    settings = cache.exportSettings(job['root'], job['world'], job['bakeMode'], job['reduceKeys'], job['outputFormat'],
+                                    job['inPlace'], job['rootMotion'], job['additive'])
+    for clip in job['clips'] or [{'start': job['start'], 'end': job['end']}]:
+        extension = os.path.splitext(clip.get('output') or job['output'])[1] or OUTPUT_EXTENSIONS[job['outputFormat']]
+        key = cache.clipKey(job['scene'], files[1:], settings, clip['start'], clip['end'])
+        #the additive clip is kept under the key with the additive suffix
+        keys = [key] if job['additive'] is None else [key, key + ADDITIVE_SUFFIX]
+        if not all(cache.contains(key, extension) for key in keys):
+            return False
+    return True
+
+#splits start to end into count frame ranges, each one starts on the last frame of the one before it
+def planShards(start, end, count = 1):
+    count = max(1, min(count, (end - start) // MIN_SHARD_FRAMES))
+    bounds = [start + (end - start) * i // count for i in range(count + 1)]
+    return list(zip(bounds, bounds[1:]))
+
+#------------------
+#Worker
+#------------------
+
+#the cache and memory limits a worker uses, set up once per process by initWorker
+workerCache = None
+workerLimits = None
+
+#starts a maya session in each worker process
+def initWorker(cacheDir = None, limits = None, tracePython = False):
+    global workerCache, workerLimits
+    if tracePython:
+        exportMemory.tracePython()
+    import maya.standalone
+    maya.standalone.initialize(name = 'python')
+    if cacheDir:
+        workerCache = exportCache.ExportCache(cacheDir)
+    workerLimits = limits
+
+#makes the result record for a job, it is filled in as the job runs
+def newRecord(job):
+    return {
+        'index': job['index'],
+        'scene': job['scene'],
+        'output': job['output'],
+        'success': False,
+        'cached': False,
+        'error': None,
+        'worker': os.getpid(),
+        'started': time.time(),
+    }
+
+#runs one task from runBatch in a worker, a whole job, one shard of a job or the merge of a job's shards
+def runTask(task):
+    if task['kind'] == 'shard':
+        return runShard(task)
+    return runJob(task['job'], task.get('shardPaths'))
+
+#exports one job and returns a result record for it, with shardPaths the shards are merged instead of baking the scene
+def runJob(job, shardPaths = None, trace = None):
+    record = newRecord(job)
+    clock = time.time()
+    #each job is drawn on its own row of the chrome trace
+    trace = trace or exportTrace.ExportTrace(os.path.basename(job['scene']), job['index'], limits = workerLimits)
+    try:
+        #imported here so that pymel is only loaded after maya.standalone is up
+        import exportAnim
+        outputPaths = [job['output']] + [clip['output'] for clip in job['clips'] or [] if clip.get('output')]
+        for outputDir in set(os.path.dirname(path) for path in outputPaths):
+            if outputDir and not os.path.isdir(outputDir):
+                os.makedirs(outputDir)
+        bakedClip = None
+        if shardPaths:
+            bakedClip, record['boundaryErrors'] = exportAnim.mergeShards(shardPaths, SHARD_TOLERANCE, trace)
+        record.update(exportAnim.exportScene(job['scene'], job['output'], job['root'], job['world'],
+                                             job['start'], job['end'],
+                                             cache = workerCache,
+                                             bakeMode = job['bakeMode'], reduceKeys = job['reduceKeys'],
+                                             outputFormat = job['outputFormat'], inPlace = job['inPlace'],
+                                             clipRanges = job['clips'], trace = trace, bakedClip = bakedClip,
+                                             rootMotion = job['rootMotion'], additive = job['additive']))
+        record['success'] = True
+    except exportMemory.MemoryLimitError:
+        record['memoryLimit'] = 'hard'
+        record['error'] = traceback.format_exc()
+    except Exception:
+        record['error'] = traceback.format_exc()
+    record['seconds'] = time.time() - clock
+    record['memory'] = trace.memoryRecord()
+    #the stages are kept even when the job failed, they show how far it got
+    record['stages'] = trace.summary()
+    #taken off the record by runBatch, they go in the trace file instead of the results
+    record['traceStages'] = trace.stages
+    record['traceEvents'] = trace.events()
+    return record
+
+#makes the result record for one shard of a job
+def newShardRecord(task):
+    return {
+        'index': task['job']['index'],
+        'shard': task['shard'],
+        'shardCount': task['shardCount'],
+        'start': task['start'],
+        'end': task['end'],
+        'path': task['path'],
+        'success': False,
+        'error': None,
+        'worker': os.getpid(),
+        'started': time.time(),
+    }
+
+#makes the record for a task whose worker died while running it
+def failedTaskRecord(task, error):
+    record = newShardRecord(task) if task['kind'] == 'shard' else newRecord(task['job'])
+    record.update({'error': error, 'seconds': 0.0, 'worker': None, 'traceStages': [], 'traceEvents': []})
+    return record
+
+#samples one shard of a job's frame range to the task's path
+def runShard(task):
+    job = task['job']
+    record = newShardRecord(task)
+    clock = time.time()
+    trace = exportTrace.ExportTrace('%s shard %d' % (os.path.basename(job['scene']), task['shard']), job['index'],
+                                    limits = workerLimits)
+    try:
+        import exportAnim
+        exportAnim.bakeShard(job['scene'], job['root'], task['start'], task['end'], task['path'], trace)
+        record['success'] = True
+    except exportMemory.MemoryLimitError:
+        record['memoryLimit'] = 'hard'
+        record['error'] = traceback.format_exc()
+    except Exception:
+        record['error'] = traceback.format_exc()
+    record['seconds'] = time.time() - clock
+    record['memory'] = trace.memoryRecord()
+    record['traceStages'] = trace.stages
+    record['traceEvents'] = trace.events()
+    return record
+
+#------------------
+#Batch
+#------------------
+
+#runs all the jobs over a pool of workers and writes the result records as they finish
+#jobs with shards are split into shard tasks first, and a merge task is started once all of a job's shards are done
+#the stage timings of every job are written to tracePath as a chrome trace and printed as a table
+#with a scratch directory jobs are saved there and published to their outputs while the workers go on
+#jobs that fail the preflight checks are given failed records without being started
+#memoryLimits is a MemoryLimits, workers over it are replaced, tracePython also records python's allocation peaks
+#the files of the jobs the workers will get to next are read ahead on prefetchThreads threads
+def runBatch(jobs, workers, resultsPath, cacheDir = None, tracePath = None, scratchDir = None, publishThreads = 2,
+             preflight = True, memoryLimits = None, tracePython = False, prefetchThreads = 2):
+    batchClock = time.time()
+    records = []
+    traceStages = []
+    traceEvents = []
+    jobCount = len(jobs)
+    #the references found by the preflight checks are used again to read the files ahead
+    checker = exportPreflight.Preflight()
+    if preflight:
+        problems = preflightJobs(jobs, checker)
+        for job in jobs:
+            if job['index'] in problems:
+                record = newRecord(job)
+                record['error'] = 'preflight failed:\n' + '\n'.join(problems[job['index']])
+                record['seconds'] = 0.0
+                finishRecord(record, records, jobCount, resultsPath, batchClock)
+        jobs = [job for job in jobs if job['index'] not in problems]
+    #finished tasks are handed back through a queue so new tasks can be started from what came back
+    finished = queue.Queue()
+    shardDir = tempfile.mkdtemp(prefix = 'exportShards')
+    jobsByIndex = dict((job['index'], job) for job in jobs)
+    #the finished shard records and their stages for each sharded job
+    shardRecords = {}
+    shardStages = {}
+    #the output each of a job's clips is published to, and the records waiting on their files for each job
+    destinations = {}
+    publishing = {}
+    if scratchDir:
+        for job in jobs:
+            jobsByIndex[job['index']], destinations[job['index']] = stageJob(job, scratchDir)
+    publisher = exportPublish.Publisher(publishThreads) if scratchDir else None
+    prefetcher = exportPrefetch.Prefetcher(prefetchThreads, checker) if prefetchThreads else None
+    #jobs are read ahead in the order they are handed to the workers, only a few past the ones running
+    toPrefetch = collections.deque(jobs)
+    for i in range(workers + PREFETCH_AHEAD):
+        if prefetcher and toPrefetch:
+            prefetcher.prefetchJob(toPrefetch.popleft())
+    pool = exportWorkers.WorkerPool(workers, initWorker, (cacheDir, memoryLimits, tracePython), runTask, finished.put,
+                                    failedTaskRecord, memoryLimits)
+    submit = pool.submit
+    cache = exportCache.ExportCache(cacheDir) if cacheDir else None
+    try:
+        for job in [jobsByIndex[job['index']] for job in jobs]:
+            shards = planShards(job['start'], job['end'], job['shards'])
+            if len(shards) > 1 and cache and jobCached(job, cache, checker):
+                shards = shards[:1]
+            if len(shards) == 1:
+                submit({'kind': 'job', 'job': job})
+                continue
+            shardRecords[job['index']] = []
+            shardStages[job['index']] = []
+            for shard, (start, end) in enumerate(shards):
+                submit({'kind': 'shard', 'job': job, 'shard': shard, 'shardCount': len(shards), 'start': start,
+                        'end': end, 'path': os.path.join(shardDir, '%d_%d.clip' % (job['index'], shard))})
+
+        while len(records) < jobCount:
+            record = finished.get()
+            if 'publish' in record:
+                waiting = publishing[record['index']]
+                waiting['published'].append(record['publish'])
+                if len(waiting['published']) < waiting['count']:
+                    continue
+                record = publishing.pop(record['index'])['record']
+                record['published'] = waiting['published']
+                failed = [published for published in waiting['published'] if published['error']]
+                if failed:
+                    record['success'] = False
+                    record['error'] = '\n'.join('publishing %s to %s failed: %s'
+                                                % (p['source'], p['destination'], p['error']) for p in failed)
+                finishRecord(record, records, jobCount, resultsPath, batchClock)
+                continue
+            #a worker finished a task, so the next job in line has its files read ahead
+            if prefetcher and toPrefetch:
+                prefetcher.prefetchJob(toPrefetch.popleft())
+            if prefetcher and 'shard' not in record:
+                record['prefetch'] = prefetcher.report(record['index'], record['started'])
+            stages = record.pop('traceStages')
+            traceStages.extend(stages)
+            traceEvents.extend(record.pop('traceEvents'))
+            if 'shard' in record:
+                job = jobsByIndex[record['index']]
+                shards = shardRecords[job['index']]
+                shards.append(record)
+                shardStages[job['index']].extend(stages)
+                if len(shards) < record['shardCount']:
+                    continue
+                shards.sort(key = lambda r: r['shard'])
+                if all(r['success'] for r in shards):
+                    submit({'kind': 'merge', 'job': job, 'shardPaths': [r['path'] for r in shards]})
+                    continue
+                #a failed shard fails the job without merging the rest
+                record = newRecord(job)
+                record['error'] = '\n'.join(r['error'] for r in shards if r['error'])
+                record['seconds'] = 0.0
+                stages = []
+            if record['index'] in shardRecords:
+                shards = shardRecords[record['index']]
+                record['shards'] = [dict((key, r[key]) for key in ['start', 'end', 'worker', 'seconds', 'success'])
+                                    for r in shards]
+                record['stages'] = exportTrace.summarize(shardStages[record['index']] + stages)
+                #a sharded job took from its first shard starting to its merge finishing
+                record['seconds'] = time.time() - min(r['started'] for r in shards)
+            if publisher and record['success']:
+                #the record is finished once all of its files are published, the output paths are switched over now
+                #clips come back in the order they were staged in, matched by position not by the path maya returned
+                toPublish = []
+                for clip, destination in zip(record['clips'], destinations[record['index']]):
+                    destination = publishPath(clip['output'], destination)
+                    toPublish.append((clip['output'], destination))
+                    #an additive clip is published next to the clip it was made from, named the same way
+                    if 'additive' in clip:
+                        scratchPath = clip['additive']['output']
+                        suffix = os.path.basename(scratchPath)[len(os.path.splitext(os.path.basename(clip['output']))[0]):]
+                        clip['additive']['output'] = os.path.splitext(destination)[0] + suffix
+                        toPublish.append((scratchPath, clip['additive']['output']))
+                    clip['output'] = destination
+                record['output'] = record['clips'][0]['output']
+                publishing[record['index']] = {'record': record, 'count': len(toPublish), 'published': []}
+                for scratchPath, destination in toPublish:
+                    publisher.submit(scratchPath, destination,
+                                     lambda published, index = record['index']: finished.put({'index': index, 'publish': published}))
+                continue
+            finishRecord(record, records, jobCount, resultsPath, batchClock)
+    finally:
+        pool.close()
+        if publisher:
+            publisher.close()
+        if prefetcher:
+            prefetcher.close()
+        shutil.rmtree(shardDir, ignore_errors = True)
+    records.sort(key = lambda r: r['index'])
+    writeResults(records, resultsPath, time.time() - batchClock)
+    if tracePath:
+        exportTrace.writeChromeTrace(traceEvents, tracePath)
+    sys.stdout.write(exportTrace.formatSummary(exportTrace.summarize(traceStages)) + '\n')
+    return records
+
+#checks every job before the batch starts and prints the problems found, returns them by job index
+def preflightJobs(jobs, checker = None):
+    clock = time.time()
+    problems = (checker or exportPreflight.Preflight()).checkJobs(jobs)
+    for job in jobs:
+        for problem in problems.get(job['index'], []):
+            sys.stdout.write('preflight job %d %s: %s\n' % (job['index'], job['scene'], problem))
+    sys.stdout.write('preflight: %d of %d jobs can not be exported (%.1fs)\n' % (len(problems), len(jobs), time.time() - clock))
+    sys.stdout.flush()
+    return problems
+
+#adds a finished job's record to the results and prints its status
+def finishRecord(record, records, jobCount, resultsPath, batchClock):
+    records.append(record)
+    status = 'ok' if record['success'] else 'FAILED'
+    if record['cached']:
+        status = 'cached'
+    memory = ''
+    if 'memory' in record:
+        #the resident peak is only known where it can be reset for each stage
+        memory = ', %.0f MB' % record['memory'].get('peakRssMB', record['memory']['rssMB'])
+    if record.get('recycled'):
+        memory += ', over the %s memory limit, worker replaced' % record['memoryLimit']
+    sys.stdout.write('[%d/%d] %s %s (%.1fs%s)\n' % (len(records), jobCount, status, record['scene'], record['seconds'], memory))
+    sys.stdout.flush()
+    writeResults(records, resultsPath, time.time() - batchClock)
+
+#writes the result records so far, so a crashed batch still leaves the finished scenes on disk
+def writeResults(records, resultsPath, seconds):
+    results = {
+        'seconds': seconds,
+        'succeeded': len([r for r in records if r['success']]),
+        'failed': len([r for r in records if not r['success']]),
+        'cached': len([r for r in records if r['cached']]),
+        'recycled': len([r for r in records if r.get('recycled')]),
+        'jobs': records,
+    }
+    with open(resultsPath, 'w') as resultsFile:
+        json.dump(results, resultsFile, indent = 2)
+
+def parseArgs(argv):
+    parser = argparse.ArgumentParser(description = 'Bake and export a list of animation scenes.')
+    parser.add_argument('manifest', help = 'json file listing the scenes to export')
+    parser.add_argument('--workers', type = int, default = max(1, multiprocessing.cpu_count() - 1),
+                        help = 'number of mayapy worker processes')
+    parser.add_argument('--results', default = 'export_results.json',
+                        help = 'json file the per scene results are written to')
+    parser.add_argument('--outputDir', default = None,
+                        help = 'directory for jobs that do not set an output path')
+    parser.add_argument('--cacheDir', default = None,
+                        help = 'local directory of previous exports, unchanged scenes are copied from it')
+    parser.add_argument('--trace', default = None,
+                        help = 'chrome trace json file the stage timings of every scene are written to')
+    parser.add_argument('--scratchDir', default = None,
+                        help = 'local directory scenes are saved to before they are copied to their outputs')
+    parser.add_argument('--check', action = 'store_true',
+                        help = 'only run the preflight checks on the manifest, nothing is exported')
+    parser.add_argument('--publishThreads', type = int, default = 2,
+                        help = 'number of files copied from the scratch directory at the same time')
+    parser.add_argument('--memorySoft', type = float, default = None,
+                        help = 'megabytes a worker can use before it is replaced once its job is done')
+    parser.add_argument('--memoryHard', type = float, default = None,
+                        help = 'megabytes a worker can use before its job is stopped and it is replaced')
+    parser.add_argument('--prefetchThreads', type = int, default = 2,
+                        help = 'number of threads reading the next jobs\' files ahead, 0 turns it off')
+    parser.add_argument('--tracePython', action = 'store_true',
+                        help = 'also record the peak of python allocations, slower')
+    return parser.parse_args(argv)
+
+def main(argv = None):
+    args = parseArgs(argv)
+    jobs = loadManifest(args.manifest, args.outputDir)
+    if args.check:
+        return 1 if preflightJobs(jobs) else 0
+    #a sharded job can keep more than one worker busy
+    taskCount = sum(len(planShards(job['start'], job['end'], job['shards'])) for job in jobs)
+    limits = None
+    if args.memorySoft or args.memoryHard:
+        limits = exportMemory.MemoryLimits(args.memorySoft, args.memoryHard)
+    records = runBatch(jobs, min(args.workers, taskCount) or 1, args.results, args.cacheDir, args.trace,
+                       args.scratchDir, args.publishThreads, memoryLimits = limits, tracePython = args.tracePython,
+                       prefetchThreads = args.prefetchThreads)
+    return 0 if all(r['success'] for r in records) else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,139 @@
+"""
+#############################################################################
+filename    exportCache.py
+author      Iris Rahmel
+email    irisra@live.com
+
+date modified    October 18, 2026
+Brief Description:
+    This is a local cache of exported files for exportAnim, keyed on the
+    scene, its reference files and the export settings. A scene that has
+    not changed is copied from the cache instead of being baked again.
+#############################################################################
+"""
+import hashlib
+import json
+import os
+import threading
+
+#bump this when a change to the exporter changes what it writes, so old cache entries are not used
+CACHE_VERSION = 1
+#size of the blocks files are read in when they are hashed
+READ_BLOCK = 1024 * 1024
+
+#returns the sha1 of a file's contents
+def hashFile(path):
+    sha = hashlib.sha1()
+    with open(path, 'rb') as f:
+        block = f.read(READ_BLOCK)
+        while block:
+            sha.update(block)
+            block = f.read(READ_BLOCK)
+    return sha.hexdigest()
+
+class ExportCache(object):
+    def __init__(self, cacheDir):
+        self.cacheDir = os.path.abspath(os.path.expanduser(cacheDir))
+        #file hashes already worked out in this process, keyed by path, size and modified time
+        self.fileHashes = {}
+
+    #returns the export settings that go into each clip's key, besides its frame range
+    def exportSettings(self, root, world, bakeMode, reduceKeys, outputFormat, inPlace, rootMotion, additive):
+        #a pose file goes in by its contents, so editing the pose does not hand back stale additive clips
+        if additive is not None and not isinstance(additive, (int, float)):
+            additive = {'pose': self.hashInput(additive)}
+        return {'root': root, 'world': world, 'bakeMode': bakeMode, 'reduceKeys': reduceKeys,
+                'outputFormat': outputFormat, 'inPlace': inPlace, 'rootMotion': rootMotion, 'additive': additive}
+
+    #makes the key of one clip of an export
+    def clipKey(self, scenePath, referencePaths, settings, start, end):
+        return self.fingerprint(scenePath, referencePaths, dict(settings, start = start, end = end))
+
+    #makes a key from the scene, its references and the export settings
+    def fingerprint(self, scenePath, referencePaths, settings):
+        inputs = {
+            'version': CACHE_VERSION,
+            'scene': self.hashInput(scenePath),
+            #references are sorted so the order maya lists them in does not matter
+            'references': sorted(self.hashInput(path) for path in set(referencePaths)),
+            'settings': settings,
+        }
+        text = json.dumps(inputs, sort_keys = True)
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+    #hashes one input file, a missing file gets its own value so it still changes the key
+    def hashInput(self, path):
+        path = os.path.abspath(str(path))
+        if not os.path.isfile(path):
+            return 'missing:' + path
+        stat = os.stat(path)
+        statKey = (path, stat.st_size, stat.st_mtime)
+        if statKey not in self.fileHashes:
+            self.fileHashes[statKey] = hashFile(path)
+        return self.fileHashes[statKey]
+
+    #where the output for a key is kept
+    def entryPath(self, key, extension):
+        return os.path.join(self.cacheDir, key[:2], key + extension)
+
+    #returns whether there is a cached output for a key
+    def contains(self, key, extension):
+        return os.path.isfile(self.entryPath(key, extension))
+
+    #copies the cached output for a key to the save path, returns false if there is none
+    def fetch(self, key, savePath):
+        entry = self.entryPath(key, os.path.splitext(savePath)[1])
+        if not os.path.isfile(entry):
+            return False
+        copyFile(entry, savePath)
+        return True
+
+    #adds an exported file to the cache
+    def store(self, key, savePath):
+        entry = self.entryPath(key, os.path.splitext(savePath)[1])
+        if not os.path.isfile(entry):
+            copyFile(savePath, entry)
+        return entry
+
+#copies through a temp file and renames it, so a half written file is never picked up
+#check(source, tempPath, checksum) is called before the rename and can raise to stop the copy
+#returns the sha1 of what was read from source
+def copyFile(source, destination, check = None):
+    folder = os.path.dirname(destination)
+    if folder and not os.path.isdir(folder):
+        try:
+            os.makedirs(folder)
+        except OSError:
+            #another thread or machine may have made it first
+            if not os.path.isdir(folder):
+                raise
+    #the publisher copies on several threads at once
+    tempPath = '%s.%d.%d.tmp' % (destination, os.getpid(), threading.current_thread().ident)
+    sha = hashlib.sha1()
+    try:
+        with open(source, 'rb') as sourceFile:
+            with open(tempPath, 'wb') as tempFile:
+                block = sourceFile.read(READ_BLOCK)
+                while block:
+                    sha.update(block)
+                    tempFile.write(block)
+                    block = sourceFile.read(READ_BLOCK)
+        if check:
+            check(source, tempPath, sha.hexdigest())
+        replaceFile(tempPath, destination)
+    finally:
+        if os.path.exists(tempPath):
+            os.remove(tempPath)
+    return sha.hexdigest()
+
+#renames source over destination in one step, so the destination is never missing
+def replaceFile(source, destination):
+    if hasattr(os, 'replace'):
+        os.replace(source, destination)
+    elif os.name != 'nt':
+        os.rename(source, destination)
+    else:
+        #python 2 on windows can not rename over a file, the old one has to go first
+        if os.path.exists(destination):
+            os.remove(destination)
+        os.rename(source, destination)
@@ -0,0 +1,511 @@
+"""
+#############################################################################
+filename    exportDaemon.py
+author      Iris Rahmel
+email    irisra@live.com
+
+date modified    October 18, 2026
+Brief Description:
+    This keeps a pool of warm mayapy workers running in the background so
+    export, rigBuild and pin jobs do not wait on maya starting up. Jobs are
+    sent on a local socket and their status is sent back as they run.
+    Connections have to send the key in EXPORT_DAEMON_KEY, or the random
+    one the daemon writes to ~/.exportDaemonKey that only this user can
+    read. rigBuild jobs run createCtrlRig.buildRig and pin jobs run
+    pinControlMaya.pinControls, a job can name another module and function.
+    A script job's module is reloaded if the worker already has it, the
+    modules it imports are not.
+
+    usage:
+        mayapy exportDaemon.py serve --workers 2 --cacheDir D:/exportCache
+                                     --memorySoft 6000 --memoryHard 12000
+        python exportDaemon.py submit job.json
+        python exportDaemon.py submit job.json --noWait
+        python exportDaemon.py status
+        python exportDaemon.py stop
+
+    A job file holds one job, relative paths are relative to the job file:
+        {"type": "export", "scene": "run.ma", "start": 0, "end": 24}
+        {"type": "rigBuild", "scene": "hero.ma", "output": "hero_rig.ma",
+         "kwargs": {"chains": [{"start": "j_hip_l", "end": "j_ankle_l",
+                                "middle": "j_knee_l", "type": "ik",
+                                "location": "left", "poleVector": "front"}],
+                    "cogJoint": "j_pelvis"}}
+        {"type": "pin", "scene": "run_anim.ma", "output": "run_pinned.ma",
+         "kwargs": {"controls": ["ctrl_foot_l"], "bake": true}}
+#############################################################################
+"""
+import argparse
+import binascii
+import importlib
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import traceback
+from multiprocessing.connection import Client, Listener
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+try:
+    from importlib import reload
+except ImportError:
+    #python 2 has reload as a builtin
+    pass
+
+import exportBatch
+import exportMemory
+import exportPreflight
+import exportTrace
+import exportWorkers
+
+#the daemon only listens on this machine
+HOST = 'localhost'
+PORT = 7720
+#where the key connections have to send is kept when EXPORT_DAEMON_KEY is not set
+KEY_PATH = os.path.join(os.path.expanduser('~'), '.exportDaemonKey')
+#kinds of job that open a scene, run a function from a module and save the scene, with the tool function each runs
+SCRIPT_JOBS = {'rigBuild': ('createCtrlRig', 'buildRig'), 'pin': ('pinControlMaya', 'pinControls')}
+JOB_TYPES = ['export'] + sorted(SCRIPT_JOBS)
+#the folders of the tools the script jobs run, next to this one
+TOOL_PATHS = [os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), folder)
+              for folder in ['CreateCtrlRig', 'PinControl']]
+#statuses a job ends on
+FINISHED = ['done', 'failed']
+#seconds between checks that the workers are still alive
+WATCH_INTERVAL = 1.0
+#how many finished jobs are kept for the status command
+KEEP_FINISHED = 200
+
+#------------------
+#Key
+#------------------
+
+#returns the key connections have to send, EXPORT_DAEMON_KEY or the one in KEY_PATH
+#the daemon makes a random key the first time it is served, the file can only be read by this user
+def daemonKey(create = False):
+    if os.environ.get('EXPORT_DAEMON_KEY'):
+        return os.environ['EXPORT_DAEMON_KEY'].encode('utf-8')
+    if create and not os.path.isfile(KEY_PATH):
+        handle = os.open(KEY_PATH, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(handle, 'w') as keyFile:
+            keyFile.write(binascii.hexlify(os.urandom(32)).decode('ascii'))
+    if not os.path.isfile(KEY_PATH):
+        raise IOError('there is no daemon key at %s, start the daemon or set EXPORT_DAEMON_KEY' % KEY_PATH)
+    #anyone who can read the key can run code in the workers
+    if os.name != 'nt' and os.stat(KEY_PATH).st_mode & 0o077:
+        raise IOError('%s can be read by other users, remove it and start the daemon again' % KEY_PATH)
+    with open(KEY_PATH, 'r') as keyFile:
+        return keyFile.read().strip().encode('utf-8')
+
+#------------------
+#Messages
+#------------------
+
+#sends a dictionary over a connection as json, so a client on another version of python can talk to the daemon
+def sendMessage(connection, message):
+    connection.send_bytes(json.dumps(message, default = str).encode('utf-8'))
+
+def receiveMessage(connection):
+    return json.loads(connection.recv_bytes().decode('utf-8'))
+
+#returns a line describing a status message
+def formatStatus(message):
+    if 'error' in message and 'status' not in message:
+        return 'error: %s' % message['error']
+    text = 'job %s %s' % (message['id'], message['status'])
+    if message['status'] == 'stage':
+        text += ' ' + message['stage']
+    elif message['status'] == 'running':
+        text += ' on worker %s' % message['worker']
+    elif message['status'] in FINISHED:
+        record = message.get('record') or {}
+        text += ' (%.1fs)' % record.get('seconds', 0.0)
+        if record.get('error'):
+            text += '\n' + record['error']
+    return text
+
+#------------------
+#Client
+#------------------
+
+#sends a job to the daemon, onStatus is called with each status message and the last one is returned
+#with wait false it returns as soon as the job is queued, so a UI is not held up by the job
+def submitJob(job, wait = True, onStatus = None, port = PORT):
+    connection = Client((HOST, port), authkey = daemonKey())
+    try:
+        sendMessage(connection, {'command': 'submit', 'job': job, 'wait': wait})
+        while True:
+            message = receiveMessage(connection)
+            if onStatus:
+                onStatus(message)
+            if message['status'] in FINISHED or not wait:
+                return message
+    finally:
+        connection.close()
+
+#sends a command that has one reply, like status or stop, and returns the reply
+def sendCommand(command, port = PORT, **kwargs):
+    connection = Client((HOST, port), authkey = daemonKey())
+    try:
+        sendMessage(connection, dict(kwargs, command = command))
+        return receiveMessage(connection)
+    finally:
+        connection.close()
+
+#------------------
+#Worker
+#------------------
+
+#the queue a worker sends its status messages on, set by initWorker
+workerUpdates = None
+
+#starts maya in a worker of the pool, the records go back through the pool and the status messages through updates
+def initWorker(updates, cacheDir = None, limits = None, tracePython = False):
+    global workerUpdates
+    clock = time.time()
+    exportBatch.initWorker(cacheDir, limits, tracePython)
+    for path in TOOL_PATHS:
+        if path not in sys.path:
+            sys.path.append(path)
+    #imported now so the first job does not wait on them
+    import pymel.core
+    import exportAnim
+    #a tool that can not be imported fails its own jobs, the worker still runs exports
+    for module in [module for module, function in SCRIPT_JOBS.values()]:
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            traceback.print_exc()
+    workerUpdates = updates
+    updates.put({'status': 'ready', 'worker': os.getpid(), 'seconds': time.time() - clock})
+
+#runs one job in a worker and returns its record, the pool recycles the worker if it is over a memory limit
+def runTask(task):
+    workerUpdates.put({'id': task['id'], 'status': 'running', 'worker': os.getpid()})
+    onStage = lambda name, labels, jobId = task['id']: workerUpdates.put({'id': jobId, 'status': 'stage', 'stage': name})
+    trace = exportTrace.ExportTrace('%s %d' % (task['type'], task['id']), task['id'], onStage, exportBatch.workerLimits)
+    if task['type'] == 'export':
+        record = exportBatch.runJob(task['job'], trace = trace)
+    else:
+        record = runScript(task, trace)
+    record['id'] = task['id']
+    #the trace events are only kept by the batch for its chrome trace
+    record.pop('traceStages', None)
+    record.pop('traceEvents', None)
+    return record
+
+#makes the record for a job whose worker died or could not be started
+def failedRecord(task, error):
+    return {'id': task['id'], 'type': task['type'], 'success': False, 'seconds': 0.0, 'worker': None, 'error': error}
+
+#imports the module a script job names, a module the worker already has is reloaded so edits to it are picked up
+#only that module is reloaded, the modules it imports stay as the worker first loaded them
+def importModule(name):
+    if name in sys.modules:
+        return reload(sys.modules[name])
+    return importlib.import_module(name)
+
+#opens the task's scene, calls the function it names with its kwargs and saves the scene to its output
+#a task that does not name a module and function runs the tool function for its type from SCRIPT_JOBS
+def runScript(task, trace):
+    import pymel.core as pm
+    record = {
+        'id': task['id'],
+        'type': task['type'],
+        'scene': task.get('scene'),
+        'output': task.get('output'),
+        'success': False,
+        'error': None,
+        'worker': os.getpid(),
+        'started': time.time(),
+    }
+    clock = time.time()
+    try:
+        if task.get('scene'):
+            with trace.stage('openFile'):
+                pm.openFile(task['scene'], force = True)
+        #folders the module can be found in that maya does not already know about
+        for path in task.get('paths', []):
+            if path not in sys.path:
+                sys.path.append(path)
+        module, function = SCRIPT_JOBS[task['type']]
+        if task.get('module'):
+            module, function = task['module'], task['function']
+        with trace.stage(function):
+            function = getattr(importModule(module), function)
+            record['result'] = function(**task.get('kwargs', {}))
+        if task.get('output'):
+            with trace.stage('saveAs'):
+                record['output'] = str(pm.saveAs(task['output'], force = True, type = task.get('outputFormat', 'mayaAscii')))
+        record['success'] = True
+    except exportMemory.MemoryLimitError:
+        record['memoryLimit'] = 'hard'
+        record['error'] = traceback.format_exc()
+    except Exception:
+        record['error'] = traceback.format_exc()
+    record['seconds'] = time.time() - clock
+    record['memory'] = trace.memoryRecord()
+    record['stages'] = trace.summary()
+    return record
+
+#------------------
+#Daemon
+#------------------
+
+class ExportDaemon(object):
+    def __init__(self, workers = 2, cacheDir = None, port = PORT, memoryLimits = None, tracePython = False):
+        self.workerCount = workers
+        self.cacheDir = cacheDir
+        self.port = port
+        self.memoryLimits = memoryLimits
+        self.tracePython = tracePython
+        #the workers' status messages, their records come back through the pool
+        self.updates = multiprocessing.Queue()
+        self.lock = threading.Lock()
+        #the status of each job by id, and the connections waiting on its status messages
+        self.jobs = {}
+        self.watchers = {}
+        #workers that have maya up, by pid
+        self.ready = set()
+        self.pool = None
+        self.key = None
+        self.nextId = 1
+        self.running = False
+        self.stopped = threading.Event()
+
+    #returns what is wrong with a task, empty when it can be run
+    def checkTask(self, task):
+        if task['type'] not in JOB_TYPES:
+            return ['unknown job type %s, it can be %s' % (task['type'], ', '.join(JOB_TYPES))]
+        if task['type'] == 'export':
+            try:
+                task['job'] = exportBatch.makeJob(dict((key, value) for key, value in task.items() if key not in ['id', 'type']),
+                                                  task['id'])
+            except ValueError as error:
+                return [str(error)]
+            #the scenes are read fresh for each job, they may have been saved since the last one
+            return exportPreflight.Preflight().checkJob(task['job'])
+        problems = []
+        if bool(task.get('module')) != bool(task.get('function')):
+            problems.append('the job has to name both a module and a function, or neither to run the %s tool' % task['type'])
+        if task.get('scene') and not os.path.isfile(task['scene']):
+            problems.append('scene %s does not exist' % task['scene'])
+        return problems
+
+    #queues a job sent by a client, with a connection its status messages are sent to it until the job finishes
+    def submit(self, entry, connection = None):
+        with self.lock:
+            jobId = self.nextId
+            self.nextId += 1
+        task = dict(entry, id = jobId, type = entry.get('type', 'export'))
+        status = {'id': jobId, 'type': task['type'], 'status': 'queued', 'submitted': time.time(), 'worker': None}
+        problems = self.checkTask(task)
+        with self.lock:
+            self.jobs[jobId] = status
+            if connection:
+                sendMessage(connection, status)
+                self.watchers[jobId] = [connection]
+        if problems:
+            self.publish({'id': jobId, 'status': 'failed', 'record': {'id': jobId, 'success': False, 'seconds': 0.0,
+                                                                      'error': 'preflight failed:\n' + '\n'.join(problems)}})
+        else:
+            self.pool.submit(task)
+        return status
+
+    #updates a job's status and sends the message to the connections waiting on it
+    def publish(self, message):
+        with self.lock:
+            status = self.jobs.get(message['id'])
+            #a job failed because its worker died can still have messages on the way
+            if status is None or status['status'] in FINISHED:
+                return
+            status['status'] = message['status']
+            for key in ['worker', 'stage', 'record']:
+                if key in message:
+                    status[key] = message[key]
+            watchers = self.watchers.get(message['id'], [])
+            for connection in list(watchers):
+                try:
+                    sendMessage(connection, message)
+                except (IOError, OSError, EOFError):
+                    #the client went away, the job still runs
+                    watchers.remove(connection)
+            if message['status'] in FINISHED:
+                for connection in self.watchers.pop(message['id'], []):
+                    connection.close()
+                self.pruneJobs()
+
+    #forgets the oldest finished jobs once there are too many
+    def pruneJobs(self):
+        finished = sorted(jobId for jobId, status in self.jobs.items() if status['status'] in FINISHED)
+        for jobId in finished[:max(0, len(finished) - KEEP_FINISHED)]:
+            del self.jobs[jobId]
+
+    #called by the pool with each job's record, including jobs whose worker died
+    def finishJob(self, record):
+        message = {'id': record['id'], 'status': 'done' if record['success'] else 'failed', 'record': record}
+        if record.get('worker'):
+            message['worker'] = record['worker']
+        self.publish(message)
+        sys.stdout.write(formatStatus(message).splitlines()[0] + '\n')
+        sys.stdout.flush()
+
+    #hands the workers' status messages on to the clients until the daemon stops
+    def dispatch(self):
+        while not self.stopped.is_set():
+            try:
+                update = self.updates.get(timeout = WATCH_INTERVAL)
+            except queue.Empty:
+                continue
+            if update['status'] == 'ready':
+                with self.lock:
+                    self.ready.add(update['worker'])
+                sys.stdout.write('worker %d ready (%.1fs)\n' % (update['worker'], update['seconds']))
+                sys.stdout.flush()
+            else:
+                self.publish(update)
+
+    #returns the daemon's workers and jobs, or one job's status with its record
+    def status(self, jobId = None):
+        if jobId is not None:
+            with self.lock:
+                return self.jobs.get(jobId, {'error': 'there is no job %s' % jobId})
+        workerTasks, pending = self.pool.tasks()
+        with self.lock:
+            #workers that were replaced are forgotten
+            self.ready &= set(workerTasks)
+            return {
+                'workers': [{'pid': pid, 'ready': pid in self.ready, 'job': task['id'] if task else None}
+                            for pid, task in sorted(workerTasks.items())],
+                'pending': [task['id'] for task in pending],
+                'jobs': [dict((key, value) for key, value in status.items() if key != 'record')
+                         for jobId, status in sorted(self.jobs.items())],
+            }
+
+    #reads one request from a client and answers it
+    def handleClient(self, connection):
+        try:
+            message = receiveMessage(connection)
+            command = message.get('command')
+            if command == 'submit':
+                wait = message.get('wait', True)
+                status = self.submit(message['job'], connection if wait else None)
+                if wait:
+                    #the connection is closed by publish once the job finishes
+                    return
+                sendMessage(connection, status)
+            elif command == 'status':
+                sendMessage(connection, self.status(message.get('id')))
+            elif command == 'stop':
+                sendMessage(connection, {'status': 'stopping'})
+                self.stop()
+            else:
+                sendMessage(connection, {'error': 'unknown command %s' % command})
+        except (IOError, OSError, EOFError, ValueError, KeyError) as error:
+            sys.stdout.write('bad request: %s: %s\n' % (type(error).__name__, error))
+            sys.stdout.flush()
+        connection.close()
+
+    #starts the workers and answers clients until stop is called
+    def serve(self):
+        self.key = daemonKey(create = True)
+        self.running = True
+        self.pool = exportWorkers.WorkerPool(self.workerCount, initWorker,
+                                             (self.updates, self.cacheDir, self.memoryLimits, self.tracePython),
+                                             runTask, self.finishJob, failedRecord, self.memoryLimits)
+        dispatcher = threading.Thread(target = self.dispatch, name = 'dispatcher')
+        dispatcher.daemon = True
+        dispatcher.start()
+        listener = Listener((HOST, self.port), authkey = self.key)
+        sys.stdout.write('export daemon listening on %s:%d with %d workers\n' % (HOST, self.port, self.workerCount))
+        sys.stdout.flush()
+        try:
+            while self.running:
+                try:
+                    connection = listener.accept()
+                except (IOError, OSError, EOFError, multiprocessing.AuthenticationError) as error:
+                    sys.stdout.write('refused a connection: %s\n' % error)
+                    sys.stdout.flush()
+                    continue
+                #stop wakes the listener with a connection of its own
+                if not self.running:
+                    connection.close()
+                    break
+                thread = threading.Thread(target = self.handleClient, args = (connection,))
+                thread.daemon = True
+                thread.start()
+        finally:
+            listener.close()
+            self.shutdown(dispatcher)
+
+    #stops taking jobs, wakes the listener so serve can return
+    def stop(self):
+        self.running = False
+        try:
+            Client((HOST, self.port), authkey = self.key).close()
+        except (IOError, OSError, EOFError):
+            pass
+
+    #lets the workers finish the queued jobs, then stops them and the dispatcher
+    def shutdown(self, dispatcher):
+        while self.pool.busy():
+            time.sleep(WATCH_INTERVAL)
+        self.pool.close()
+        self.stopped.set()
+        dispatcher.join()
+
+#------------------
+#Command Line
+#------------------
+
+#makes the paths in a job file absolute, relative ones are relative to the job file
+def loadJobFile(jobPath):
+    with open(jobPath, 'r') as jobFile:
+        job = json.load(jobFile)
+    folder = os.path.dirname(os.path.abspath(jobPath))
+    for key in ['scene', 'output']:
+        if job.get(key):
+            job[key] = os.path.join(folder, job[key])
+    return job
+
+def parseArgs(argv):
+    parser = argparse.ArgumentParser(description = 'Keep warm mayapy workers running and send jobs to them.')
+    parser.add_argument('--port', type = int, default = PORT, help = 'local port the daemon listens on')
+    commands = parser.add_subparsers(dest = 'command')
+    serve = commands.add_parser('serve', help = 'start the daemon, run it with mayapy')
+    serve.add_argument('--workers', type = int, default = 2, help = 'number of mayapy worker processes')
+    serve.add_argument('--cacheDir', default = None,
+                       help = 'local directory of previous exports, unchanged scenes are copied from it')
+    serve.add_argument('--memorySoft', type = float, default = None,
+                       help = 'megabytes a worker can use before it is replaced once its job is done')
+    serve.add_argument('--memoryHard', type = float, default = None,
+                       help = 'megabytes a worker can use before its job is stopped and it is replaced')
+    serve.add_argument('--tracePython', action = 'store_true', help = 'also record the peak of python allocations, slower')
+    submit = commands.add_parser('submit', help = 'send a job file to the daemon and print its status as it runs')
+    submit.add_argument('jobFile', help = 'json file with one job')
+    submit.add_argument('--noWait', action = 'store_true', help = 'return once the job is queued')
+    commands.add_parser('status', help = 'print the workers and jobs')
+    commands.add_parser('stop', help = 'stop the daemon once the queued jobs are done')
+    return parser.parse_args(argv)
+
+def main(argv = None):
+    args = parseArgs(argv)
+    if args.command == 'serve':
+        limits = None
+        if args.memorySoft or args.memoryHard:
+            limits = exportMemory.MemoryLimits(args.memorySoft, args.memoryHard)
+        ExportDaemon(args.workers, args.cacheDir, args.port, limits, args.tracePython).serve()
+        return 0
+    if args.command == 'submit':
+        printStatus = lambda message: sys.stdout.write(formatStatus(message) + '\n')
+        message = submitJob(loadJobFile(args.jobFile), not args.noWait, printStatus, args.port)
+        return 1 if message['status'] == 'failed' else 0
+    sys.stdout.write(json.dumps(sendCommand(args.command, args.port), indent = 2) + '\n')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""
+#############################################################################
+filename    exportMemory.py
+author      Iris Rahmel
+email    irisra@live.com
+
+date modified    October 18, 2026
+Brief Description:
+    This reads how much memory the process is using, resident and python
+    allocations, so the export stages can record it and workers can be
+    kept under a soft and a hard limit (MemoryLimits).
+#############################################################################
+"""
+import os
+import sys
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+MB = 1024.0 * 1024.0
+
+if sys.platform == 'win32':
+    import ctypes
+    from ctypes import wintypes
+
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD),
+                    ('PeakWorkingSetSize', ctypes.c_size_t), ('WorkingSetSize', ctypes.c_size_t),
+                    ('QuotaPeakPagedPoolUsage', ctypes.c_size_t), ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                    ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t), ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                    ('PagefileUsage', ctypes.c_size_t), ('PeakPagefileUsage', ctypes.c_size_t)]
+
+    ctypes.windll.kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+
+    #returns the resident memory of the process now and at its most, in bytes
+    def residentMemory():
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        ctypes.windll.psapi.GetProcessMemoryInfo(ctypes.windll.kernel32.GetCurrentProcess(), ctypes.byref(counters),
+                                                 counters.cb)
+        return counters.WorkingSetSize, counters.PeakWorkingSetSize
+
+    #windows keeps the peak working set for the life of the process
+    def resetResidentPeak():
+        return False
+
+elif os.path.exists('/proc/self/status'):
+    #returns the resident memory of the process now and at its most, in bytes
+    def residentMemory():
+        values = {}
+        with open('/proc/self/status', 'r') as statusFile:
+            for line in statusFile:
+                if line.startswith('VmRSS:') or line.startswith('VmHWM:'):
+                    name, amount = line.split(':')
+                    values[name] = int(amount.split()[0]) * 1024
+        return values.get('VmRSS', 0), values.get('VmHWM', 0)
+
+    #writing 5 to clear_refs sets VmHWM back to the current resident memory, returns false if the kernel refuses it
+    def resetResidentPeak():
+        try:
+            with open('/proc/self/clear_refs', 'w') as clearFile:
+                clearFile.write('5')
+        except (IOError, OSError):
+            return False
+        return True
+
+else:
+    import resource
+
+    #returns the resident memory of the process now and at its most, in bytes
+    #only the most is known here, ru_maxrss is in bytes on mac
+    def residentMemory():
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak, peak
+
+    #ru_maxrss cannot be reset
+    def resetResidentPeak():
+        return False
+
+#starts recording python allocations, it slows python code down so it is only on when asked for
+def tracePython():
+    if tracemalloc is not None and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+#returns the memory python objects take now and at their most, in bytes, None when tracemalloc is not tracing
+def pythonMemory():
+    if tracemalloc is None or not tracemalloc.is_tracing():
+        return None, None
+    return tracemalloc.get_traced_memory()
+
+#starts the peaks memoryRecord reads again from the memory in use now
+#returns the memoryRecord keys whose peaks were reset, the others still count from when the process started
+def resetPeaks():
+    reset = []
+    if resetResidentPeak():
+        reset.append('peakRssMB')
+    if tracemalloc is not None and tracemalloc.is_tracing() and hasattr(tracemalloc, 'reset_peak'):
+        tracemalloc.reset_peak()
+        reset.append('pythonPeakMB')
+    return reset
+
+#returns the process's memory in megabytes, for stage and job records
+def memoryRecord():
+    rss, peakRss = residentMemory()
+    record = {'rssMB': round(rss / MB, 1), 'peakRssMB': round(peakRss / MB, 1)}
+    pythonPeak = pythonMemory()[1]
+    if pythonPeak is not None:
+        record['pythonPeakMB'] = round(pythonPeak / MB, 1)
+    return record
+
+class MemoryLimitError(MemoryError):
+    pass
+
+class MemoryLimits(object):
+    #soft and hard are in megabytes, None for no limit
+    def __init__(self, soft = None, hard = None):
+        self.soft = soft
+        self.hard = hard
+
+    #stops the job when the process is over the hard limit, called as each stage starts
+    def check(self):
+        if self.hard is None:
+            return
+        rss = residentMemory()[0] / MB
+        if rss > self.hard:
+            raise MemoryLimitError('%.0f MB resident is over the hard limit of %.0f MB' % (rss, self.hard))
+
+    #returns which limit the process is over, 'hard', 'soft' or None, checked after each job
+    def exceeded(self):
+        rss = residentMemory()[0] / MB
+        if self.hard is not None and rss > self.hard:
+            return 'hard'
+        if self.soft is not None and rss > self.soft:
+            return 'soft'
+        return None
@@ -0,0 +1,108 @@
+"""
+#############################################################################
+filename    exportPrefetch.py
+author      Iris Rahmel
+email    irisra@live.com
+
+date modified    October 18, 2026
+Brief Description:
+    This reads the scene and reference files of the jobs a batch will get
+    to next on background threads, so when a worker opens a scene its
+    files come from the operating system's file cache instead of the
+    network share.
+#############################################################################
+"""
+import threading
+import time
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+import exportPreflight
+from exportCache import READ_BLOCK
+
+#reads a whole file and throws it away so it is in the file cache, returns the number of bytes read
+def readFile(path):
+    size = 0
+    with open(path, 'rb') as readAhead:
+        block = readAhead.read(READ_BLOCK)
+        while block:
+            size += len(block)
+            block = readAhead.read(READ_BLOCK)
+    return size
+
+class Prefetcher(object):
+    #preflight is an exportPreflight.Preflight whose files were already read, so references are not looked for twice
+    def __init__(self, threads = 2, preflight = None):
+        self.preflight = preflight or exportPreflight.Preflight()
+        self.tasks = queue.Queue()
+        self.lock = threading.Lock()
+        #what was read for each file, and the files of each job by index
+        self.files = {}
+        self.jobFiles = {}
+        self.threads = []
+        for i in range(threads):
+            thread = threading.Thread(target = self.work, name = 'prefetch%d' % i)
+            #a batch that is stopped does not wait on reads that have not started
+            thread.daemon = True
+            thread.start()
+            self.threads.append(thread)
+
+    #queues a job's scene and references to be read
+    def prefetchJob(self, job):
+        self.tasks.put(job)
+
+    #reads the files of queued jobs until close is called
+    def work(self):
+        while True:
+            job = self.tasks.get()
+            if job is None:
+                return
+            try:
+                paths = self.preflight.collectFiles(job['scene'])[0]
+            except (IOError, OSError, UnicodeDecodeError):
+                paths = [job['scene']]
+            with self.lock:
+                self.jobFiles[job['index']] = paths
+            for path in paths:
+                with self.lock:
+                    #another job's read of a shared file counts for this job too
+                    if path in self.files:
+                        continue
+                    info = self.files[path] = {'bytes': 0, 'seconds': 0.0, 'finished': None, 'error': None}
+                clock = time.time()
+                try:
+                    info['bytes'] = readFile(path)
+                except (IOError, OSError) as error:
+                    info['error'] = '%s: %s' % (type(error).__name__, error)
+                info['seconds'] = time.time() - clock
+                info['finished'] = time.time()
+
+    #returns what was read ahead for a job, ready is whether every file was read before the job started
+    def report(self, index, started):
+        with self.lock:
+            paths = self.jobFiles.get(index)
+            if paths is None:
+                return {'files': 0, 'MB': 0.0, 'seconds': 0.0, 'ready': False, 'errors': []}
+            infos = [self.files.get(path) for path in paths]
+        read = [info for info in infos if info and info['finished'] is not None]
+        return {
+            'files': len(paths),
+            'MB': round(sum(info['bytes'] for info in read) / (1024.0 * 1024.0), 1),
+            'seconds': round(sum(info['seconds'] for info in read), 3),
+            'ready': len(read) == len(paths) and all(info['finished'] <= started for info in read),
+            'errors': [info['error'] for info in read if info['error']],
+        }
+
+    #drops the jobs that were not started and stops the threads
+    def close(self):
+        try:
+            while True:
+                self.tasks.get_nowait()
+        except queue.Empty:
+            pass
+        for thread in self.threads:
+            self.tasks.put(None)
+        for thread in self.threads:
+            thread.join()
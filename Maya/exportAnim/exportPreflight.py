@@ -0,0 +1,187 @@
+"""
+#############################################################################
+filename    exportPreflight.py
+author      Iris Rahmel
+email    irisra@live.com
+
+date modified    October 18, 2026
+Brief Description:
+    This checks batch export jobs before any scene is opened, so jobs that
+    would fail part way through a bake fail in seconds instead, all
+    reported together. It reads maya ascii scene files as text without
+    maya, for the frame ranges, the reference paths and the root and
+    world nodes. Relative reference paths are found against the scene's
+    project, the folder above it with a workspace.mel, as maya finds them.
+#############################################################################
+"""
+import os
+import re
+
+#a node made in a maya ascii file, its type and name
+NODE_PATTERN = re.compile(r'^createNode\s+(\w+)\s.*?-n\s+"([^"]+)"')
+#the last quoted string of a file statement is the path it points to
+PATH_PATTERN = re.compile(r'"([^"]*)"\s*;\s*$')
+
+#takes the namespaces off a node name
+def shortName(name):
+    return name.split('|')[-1].split(':')[-1]
+
+#returns the paths of the references in a maya ascii file's header
+def readReferencePaths(path):
+    paths = []
+    statement = ''
+    with open(path, 'r') as sceneFile:
+        for line in sceneFile:
+            if not statement and line.startswith('//'):
+                continue
+            statement += line.strip() + ' '
+            if not statement.rstrip().endswith(';'):
+                continue
+            #the references are listed before the first node, so the rest of the file is not read
+            if statement.startswith('createNode'):
+                break
+            tokens = statement.split()
+            if tokens[0] == 'file' and ('-r' in tokens or '-rdi' in tokens):
+                match = PATH_PATTERN.search(statement)
+                if match and match.group(1) not in paths:
+                    paths.append(match.group(1))
+            statement = ''
+    return paths
+
+#returns which of the wanted short names a maya ascii file makes, it stops reading once they are all found
+def readNodeNames(path, wanted):
+    found = set()
+    with open(path, 'r') as sceneFile:
+        for line in sceneFile:
+            if line.startswith('createNode'):
+                match = NODE_PATTERN.match(line)
+                if match and shortName(match.group(2)) in wanted:
+                    found.add(shortName(match.group(2)))
+                    if found == wanted:
+                        break
+    return found
+
+#returns the project folder a scene is in, the nearest folder above it with a workspace.mel, None when there is none
+def findWorkspace(scenePath):
+    folder = os.path.dirname(os.path.abspath(scenePath))
+    while True:
+        if os.path.isfile(os.path.join(folder, 'workspace.mel')):
+            return folder
+        parent = os.path.dirname(folder)
+        if parent == folder:
+            return None
+        folder = parent
+
+#finds a reference file the way maya does, a relative path against the project then the file that references it,
+#and last the file name next to the file that references it
+def resolveReference(referencePath, parentPath, workspace = None):
+    path = os.path.expandvars(referencePath.split('{')[0])
+    parentFolder = os.path.dirname(parentPath)
+    if os.path.isabs(path):
+        candidates = [path]
+    else:
+        candidates = [os.path.join(folder, path) for folder in [workspace, parentFolder] if folder]
+    candidates.append(os.path.join(parentFolder, os.path.basename(path)))
+    for candidate in candidates:
+        if os.path.isfile(candidate):
+            return os.path.normpath(candidate)
+    return None
+
+class Preflight(object):
+    def __init__(self):
+        #what was read from each file, shared between jobs that use the same scenes and rigs
+        self.sceneFiles = {}
+
+        #the nodes found in each file, by the path and the names looked for
+        self.nodeSearches = {}
+
+    #reads a file's references once, only maya ascii files can be read
+    def readSceneFile(self, path):
+        if path not in self.sceneFiles:
+            info = {'references': [], 'ascii': path.lower().endswith('.ma')}
+            if info['ascii']:
+                info['references'] = readReferencePaths(path)
+            self.sceneFiles[path] = info
+        return self.sceneFiles[path]
+
+    #returns which of the wanted names a file makes, jobs on the same rig usually look for the same names
+    def findNodes(self, path, wanted):
+        key = (path, frozenset(wanted))
+        if key not in self.nodeSearches:
+            self.nodeSearches[key] = readNodeNames(path, set(wanted))
+        return self.nodeSearches[key]
+
+    #returns the scene and every file it references, and a problem for each reference that can not be found
+    def collectFiles(self, scenePath):
+        files = []
+        problems = []
+        workspace = findWorkspace(scenePath)
+        toVisit = [scenePath]
+        while toVisit:
+            path = toVisit.pop()
+            if path in files:
+                continue
+            files.append(path)
+            for referencePath in self.readSceneFile(path)['references']:
+                resolved = resolveReference(referencePath, path, workspace)
+                if resolved is None:
+                    problems.append('reference %s in %s can not be found' % (referencePath, path))
+                else:
+                    toVisit.append(resolved)
+        return files, problems
+
+    #returns the scene and every file it references when they can all be read without maya, None when one can not
+    def readableFiles(self, scenePath):
+        files, missing = self.collectFiles(scenePath)
+        if missing or not all(self.sceneFiles[path]['ascii'] for path in files):
+            return None
+        return files
+
+    #returns a list of everything wrong with a job, empty when it can be exported
+    def checkJob(self, job):
+        problems = []
+        #the same settings exportAnim.validateScene turns down
+        if job['reduceKeys'] and job['outputFormat'] == 'clip':
+            problems.append('keys can not be reduced for clip output, clip files keep every frame')
+        if job['start'] > job['end']:
+            problems.append('start frame %s is after end frame %s' % (job['start'], job['end']))
+        for clip in job['clips'] or []:
+            if clip['start'] > clip['end']:
+                problems.append('clip %s starts on %s after it ends on %s' % (clip['name'], clip['start'], clip['end']))
+        if not os.path.isfile(job['scene']):
+            problems.append('scene %s does not exist' % job['scene'])
+            return problems
+
+        try:
+            files, missing = self.collectFiles(job['scene'])
+        except (IOError, OSError, UnicodeDecodeError) as error:
+            problems.append('scene %s could not be read: %s' % (job['scene'], error))
+            return problems
+        problems.extend(missing)
+        #a binary file or a missing reference could hold the nodes, so they are only looked for when every file can be read
+        if missing or not all(self.sceneFiles[path]['ascii'] for path in files):
+            return problems
+        wanted = set([shortName(job['root'])])
+        #the world group is only deleted when the export imports the references and saves a scene
+        if not job['inPlace'] and job['outputFormat'] != 'clip':
+            wanted.add(shortName(job['world']))
+        #the rig references usually hold the nodes, they are read before the scene and its animation
+        found = set()
+        for path in files[1:] + files[:1]:
+            found |= self.findNodes(path, wanted - found)
+            if found == wanted:
+                break
+        if shortName(job['root']) not in found:
+            problems.append('root joint %s is not in the scene or its references' % job['root'])
+        if shortName(job['world']) in wanted - found:
+            problems.append('world group %s is not in the scene or its references' % job['world'])
+        return problems
+
+    #checks every job and returns the problems for each job index that has any
+    def checkJobs(self, jobs):
+        problems = {}
+        for job in jobs:
+            jobProblems = self.checkJob(job)
+            if jobProblems:
+                problems[job['index']] = jobProblems
+        return problems
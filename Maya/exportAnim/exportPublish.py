@@ -0,0 +1,97 @@
+"""
+#############################################################################
+filename    exportPublish.py
+author      Iris Rahmel
+email    irisra@live.com
+
+date modified    October 18, 2026
+Brief Description:
+    This copies exported files from local scratch to where they are
+    published, usually a network share, on background threads, so the
+    batch exporter can go on to the next scene while the copy runs.
+#############################################################################
+"""
+import os
+import threading
+import time
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+from exportCache import copyFile, hashFile
+
+#how many times a copy is tried before the publish fails
+PUBLISH_ATTEMPTS = 3
+#seconds to wait before the first retry, doubled for each retry after it
+RETRY_DELAY = 2.0
+
+#copies source to destination through a temp file, returning the sha1 of what was read from source
+def copyWithChecksum(source, destination):
+    return copyFile(source, destination, checkCopy)
+
+#reads the copy back so a short or corrupt write on the share is caught before it is renamed into place
+def checkCopy(source, tempPath, checksum):
+    copied = hashFile(tempPath)
+    if copied != checksum:
+        raise IOError('the copy of %s does not match, %s instead of %s' % (source, copied, checksum))
+    return checksum
+
+#copies one file, retrying failed copies, and returns a record of how it went
+#the scratch file is removed once it is published, a failed publish leaves it so nothing is lost
+def publishFile(source, destination, attempts = PUBLISH_ATTEMPTS, retryDelay = RETRY_DELAY, removeSource = True):
+    record = {'source': source, 'destination': destination, 'checksum': None, 'attempts': 0, 'error': None}
+    clock = time.time()
+    for attempt in range(attempts):
+        record['attempts'] = attempt + 1
+        try:
+            record['checksum'] = copyWithChecksum(source, destination)
+            record['error'] = None
+            break
+        except (IOError, OSError) as error:
+            record['error'] = '%s: %s' % (type(error).__name__, error)
+            if attempt + 1 < attempts:
+                time.sleep(retryDelay * 2 ** attempt)
+    if removeSource and record['error'] is None:
+        os.remove(source)
+    record['seconds'] = time.time() - clock
+    return record
+
+class Publisher(object):
+    def __init__(self, threads = 2, attempts = PUBLISH_ATTEMPTS, retryDelay = RETRY_DELAY):
+        self.attempts = attempts
+        self.retryDelay = retryDelay
+        self.tasks = queue.Queue()
+        self.threads = []
+        for i in range(threads):
+            thread = threading.Thread(target = self.work, name = 'publisher%d' % i)
+            #a batch that is stopped does not wait on copies that have not started
+            thread.daemon = True
+            thread.start()
+            self.threads.append(thread)
+
+    #queues a file to be published, callback is called on a publisher thread with the publish record
+    def submit(self, source, destination, callback = None):
+        self.tasks.put((source, destination, callback))
+
+    #publishes queued files until close is called
+    def work(self):
+        while True:
+            task = self.tasks.get()
+            if task is None:
+                return
+            source, destination, callback = task
+            try:
+                record = publishFile(source, destination, self.attempts, self.retryDelay)
+            except Exception as error:
+                record = {'source': source, 'destination': destination, 'checksum': None, 'attempts': 0,
+                          'error': '%s: %s' % (type(error).__name__, error), 'seconds': 0.0}
+            if callback:
+                callback(record)
+
+    #waits for the queued files to finish and stops the threads
+    def close(self):
+        for thread in self.threads:
+            self.tasks.put(None)
+        for thread in self.threads:
+            thread.join()
@@ -0,0 +1,165 @@
+"""
+#############################################################################
+filename    exportTrace.py
+author      Iris Rahmel
+email    irisra@live.com
+
+date modified    October 18, 2026
+Brief Description:
+    This records the wall and cpu time, memory and counts of each stage of
+    an export. The stages can be saved as a chrome trace (open it at
+    chrome://tracing or in perfetto) and summed up into a table.
+#############################################################################
+"""
+import json
+import os
+import time
+from contextlib import contextmanager
+
+import exportMemory
+
+#cpu time used by this process so far, os.times works the same in python 2 and 3 on windows and linux
+def cpuTime():
+    times = os.times()
+    return times[0] + times[1]
+
+class ExportTrace(object):
+    def __init__(self, name = 'export', lane = 0, listener = None, limits = None):
+        self.name = name
+        #which row of the trace the stages are drawn on, the batch uses the job index
+        self.lane = lane
+        #called with the name and labels of each stage as it starts, the daemon streams them to clients
+        self.listener = listener
+        #a MemoryLimits that is checked as each stage starts
+        self.limits = limits
+        self.stages = []
+        self.openStages = []
+        #the most memory any stage held, only for the peaks that could be reset
+        self.peaks = {}
+
+    #times the code inside the with block as one stage, labels are shown on the stage in the trace
+    @contextmanager
+    def stage(self, name, **labels):
+        record = {'name': name, 'start': time.time(), 'labels': labels, 'counts': {}}
+        cpuStart = cpuTime()
+        if self.listener:
+            self.listener(name, labels)
+        #the peaks start again for each stage, the stages around it keep what they had reached first
+        self.keepPeaks(self.openStages, exportMemory.memoryRecord())
+        record['peaks'] = dict((key, 0.0) for key in exportMemory.resetPeaks())
+        self.openStages.append(record)
+        rssStart = exportMemory.residentMemory()[0]
+        try:
+            if self.limits:
+                self.limits.check()
+            yield record
+        finally:
+            self.openStages.pop()
+            record['wall'] = time.time() - record['start']
+            record['cpu'] = cpuTime() - cpuStart
+            memory = exportMemory.memoryRecord()
+            self.keepPeaks([record], memory)
+            #a peak that could not be reset is the whole process's, so the stage only keeps what it grew by
+            record['memory'] = self.withPeaks(memory, record.pop('peaks'))
+            record['memory']['grewMB'] = round((exportMemory.residentMemory()[0] - rssStart) / exportMemory.MB, 1)
+            for key, peak in record['memory'].items():
+                if key in ['peakRssMB', 'pythonPeakMB']:
+                    self.peaks[key] = max(self.peaks.get(key, 0.0), peak)
+            self.stages.append(record)
+
+    #raises the peaks kept on stage records to the ones in a memory record, before the peaks are reset again
+    def keepPeaks(self, records, memory):
+        for record in records:
+            for key in record['peaks']:
+                record['peaks'][key] = max(record['peaks'][key], memory.get(key, 0.0))
+
+    #returns a memory record with its peaks swapped for the ones given
+    def withPeaks(self, memory, peaks):
+        memory = dict((key, value) for key, value in memory.items() if key not in ['peakRssMB', 'pythonPeakMB'])
+        memory.update(peaks)
+        return memory
+
+    #the process's memory for a job record, its peaks are the most any of the trace's stages held
+    def memoryRecord(self):
+        return self.withPeaks(exportMemory.memoryRecord(), self.peaks)
+
+    #adds to a count on the stage that is running, or on the trace's last stage when none is
+    def count(self, name, amount = 1):
+        record = self.openStages[-1] if self.openStages else self.stages[-1]
+        record['counts'][name] = record['counts'].get(name, 0) + amount
+
+    #returns the total wall and cpu time and counts for each stage name, in the order they first ran
+    def summary(self):
+        return summarize(self.stages)
+
+    #returns the stages as chrome trace events
+    def events(self, pid = None):
+        pid = os.getpid() if pid is None else pid
+        events = []
+        for record in self.stages:
+            args = dict(record['labels'])
+            args.update(record['counts'])
+            args['cpu ms'] = round(record['cpu'] * 1000.0, 3)
+            events.append({
+                'name': record['name'],
+                'cat': self.name,
+                'ph': 'X',
+                'ts': record['start'] * 1000000.0,
+                'dur': record['wall'] * 1000000.0,
+                'pid': pid,
+                'tid': self.lane,
+                'args': args,
+            })
+            #the memory at the end of each stage is drawn as a graph above the process's stages
+            if 'memory' in record:
+                events.append({
+                    'name': 'memory',
+                    'ph': 'C',
+                    'ts': (record['start'] + record['wall']) * 1000000.0,
+                    'pid': pid,
+                    'args': {'rss MB': record['memory']['rssMB']},
+                })
+        return events
+
+#adds up stage records by name
+def summarize(stages):
+    totals = {}
+    order = []
+    for record in stages:
+        if record['name'] not in totals:
+            totals[record['name']] = {'calls': 0, 'wall': 0.0, 'cpu': 0.0, 'counts': {}, 'grewMB': 0.0}
+            order.append(record['name'])
+        total = totals[record['name']]
+        total['calls'] += 1
+        total['wall'] += record['wall']
+        total['cpu'] += record['cpu']
+        #the most memory the stage held, where the peaks can be reset, and how much the stage added
+        if 'memory' in record:
+            total['grewMB'] = round(total['grewMB'] + record['memory']['grewMB'], 1)
+            for key in ['peakRssMB', 'pythonPeakMB']:
+                if key in record['memory']:
+                    total[key] = max(total.get(key, 0.0), record['memory'][key])
+        for name, amount in record['counts'].items():
+            total['counts'][name] = total['counts'].get(name, 0) + amount
+    return [dict(totals[name], name = name) for name in order]
+
+#writes chrome trace events to a json file
+def writeChromeTrace(events, path):
+    with open(path, 'w') as traceFile:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, traceFile)
+    return path
+
+#makes a text table of a summary, slowest stage first
+def formatSummary(summary):
+    rows = sorted(summary, key = lambda total: total['wall'], reverse = True)
+    wallTotal = sum(total['wall'] for total in rows) or 1.0
+    lines = ['%-20s %6s %10s %10s %6s %9s %9s  %s' % ('stage', 'calls', 'wall s', 'cpu s', 'wall%', 'peak MB',
+                                                      'grew MB', 'counts')]
+    for total in rows:
+        counts = ', '.join('%s=%s' % (name, total['counts'][name]) for name in sorted(total['counts']))
+        #the peak is blank where it cannot be reset for each stage
+        peak = '%.1f' % total['peakRssMB'] if 'peakRssMB' in total else '-'
+        lines.append('%-20s %6d %10.3f %10.3f %5.1f%% %9s %9.1f  %s' % (total['name'], total['calls'], total['wall'],
+                                                                        total['cpu'], 100.0 * total['wall'] / wallTotal,
+                                                                        peak, total.get('grewMB', 0.0), counts))
+    return '\n'.join(lines)
@@ -0,0 +1,187 @@
+"""
+#############################################################################
+filename    exportWorkers.py
+author      Iris Rahmel
+email    irisra@live.com
+
+date modified    October 18, 2026
+Brief Description:
+    This is the pool of worker processes the batch exporter and the export
+    daemon run their tasks on. Each worker starts maya once and runs one
+    task at a time. Workers that crash or go over a memory limit are
+    replaced, and the pool gives up when maya will not start.
+#############################################################################
+"""
+import collections
+import multiprocessing
+import os
+import threading
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+#seconds between checks that the workers are still alive
+WATCH_INTERVAL = 1.0
+#how many times a task stopped by the hard memory limit is run again on a fresh worker
+MEMORY_RETRIES = 1
+#workers that die before finishing a task this many times in a row stop the pool, maya is not starting
+MAX_START_FAILURES = 3
+
+#runs in each worker process, starts maya with the initializer then runs tasks until it gets None
+#a worker over a memory limit after a task hands back the record and exits so a fresh one can take its place
+def workerMain(tasks, results, initializer, initArgs, runner, limits = None):
+    initializer(*initArgs)
+    ran = 0
+    while True:
+        task = tasks.get()
+        if task is None:
+            return
+        record = runner(task)
+        exceeded = limits.exceeded() if limits else None
+        if record.get('memoryLimit') == 'hard':
+            exceeded = 'hard'
+        if exceeded:
+            record['memoryLimit'] = exceeded
+            record['recycled'] = True
+        results.put({'worker': os.getpid(), 'record': record, 'fresh': ran == 0})
+        ran += 1
+        if exceeded:
+            return
+
+class WorkerPool(object):
+    #callback is called on the pool's thread with each task's record
+    #failedRecord(task, error) makes the record for a task whose worker died
+    def __init__(self, workers, initializer, initArgs, runner, callback, failedRecord, limits = None):
+        self.workerCount = workers
+        self.initializer = initializer
+        self.initArgs = initArgs
+        self.runner = runner
+        self.callback = callback
+        self.failedRecord = failedRecord
+        self.limits = limits
+        self.results = multiprocessing.Queue()
+        self.lock = threading.Lock()
+        #tasks waiting for a worker, and each worker by pid with its task queue and the task it is on
+        self.pending = collections.deque()
+        self.workers = {}
+        self.startFailures = 0
+        self.recycled = 0
+        self.closing = False
+        for i in range(workers):
+            self.startWorker()
+        self.collector = threading.Thread(target = self.collect, name = 'workerPool')
+        self.collector.daemon = True
+        self.collector.start()
+
+    def startWorker(self):
+        tasks = multiprocessing.Queue()
+        process = multiprocessing.Process(target = workerMain, args = (tasks, self.results, self.initializer, self.initArgs,
+                                                                       self.runner, self.limits))
+        process.daemon = True
+        process.start()
+        self.workers[process.pid] = {'process': process, 'tasks': tasks, 'task': None, 'ran': 0}
+
+    #queues a task, it is handed to the first worker with nothing to do
+    def submit(self, task):
+        with self.lock:
+            if self.startFailures >= MAX_START_FAILURES:
+                self.callback(self.failedRecord(task, 'workers could not be started'))
+                return
+            self.pending.append(task)
+            self.assignTasks()
+
+    #called with the lock held
+    def assignTasks(self):
+        for worker in self.workers.values():
+            if not self.pending:
+                return
+            if worker['task'] is None and worker['process'].is_alive():
+                worker['task'] = self.pending.popleft()
+                worker['tasks'].put(worker['task'])
+
+    #hands records back and keeps the pool topped up until it is closed and every worker is gone
+    def collect(self):
+        while not (self.closing and not self.workers):
+            try:
+                message = self.results.get(timeout = WATCH_INTERVAL)
+            except queue.Empty:
+                message = None
+            with self.lock:
+                if message:
+                    self.handleResult(message)
+                self.checkWorkers()
+
+    #called with the lock held
+    def handleResult(self, message):
+        worker = self.workers.get(message['worker'])
+        task = worker['task'] if worker else None
+        if worker:
+            worker['task'] = None
+            worker['ran'] += 1
+        self.startFailures = 0
+        record = message['record']
+        retries = task.get('memoryRetries', 0) if task else MEMORY_RETRIES
+        if record.get('memoryLimit') == 'hard' and not message['fresh'] and retries < MEMORY_RETRIES:
+            #run again first, on the fresh worker that replaces this one
+            self.pending.appendleft(dict(task, memoryRetries = retries + 1))
+        else:
+            if task and task.get('memoryRetries'):
+                record['memoryRetries'] = task['memoryRetries']
+            self.callback(record)
+        if record.get('recycled') and worker:
+            worker['process'].join()
+            del self.workers[message['worker']]
+            self.recycled += 1
+            if not self.closing:
+                self.startWorker()
+        self.assignTasks()
+
+    #called with the lock held, fails the task of a worker that died and starts another
+    def checkWorkers(self):
+        dead = [pid for pid, worker in self.workers.items() if not worker['process'].is_alive()]
+        if not dead:
+            return
+        #a worker puts its last record on the queue before it exits, so those are handed back first
+        while True:
+            try:
+                self.handleResult(self.results.get_nowait())
+            except queue.Empty:
+                break
+        for pid in dead:
+            worker = self.workers.pop(pid, None)
+            if worker is None:
+                continue
+            if worker['task'] is not None:
+                self.callback(self.failedRecord(worker['task'], 'worker %d exited with code %s while running this task'
+                                                % (pid, worker['process'].exitcode)))
+            if worker['ran'] == 0 and not self.closing:
+                self.startFailures += 1
+            if self.closing:
+                continue
+            if self.startFailures >= MAX_START_FAILURES:
+                #maya is not starting, the tasks left would only kill more workers
+                while self.pending:
+                    self.callback(self.failedRecord(self.pending.popleft(), 'workers could not be started'))
+                continue
+            self.startWorker()
+        self.assignTasks()
+
+    #returns whether any task is waiting for a worker or running on one
+    def busy(self):
+        with self.lock:
+            return bool(self.pending) or any(worker['task'] is not None for worker in self.workers.values())
+
+    #returns the task each worker is on by pid, and the tasks waiting for a worker
+    def tasks(self):
+        with self.lock:
+            return dict((pid, worker['task']) for pid, worker in self.workers.items()), list(self.pending)
+
+    #stops each worker once it is done with its task and waits for them
+    def close(self):
+        with self.lock:
+            self.closing = True
+            workers = list(self.workers.values())
+        for worker in workers:
+            worker['tasks'].put(None)
+        self.collector.join()
@@ -0,0 +1,644 @@
+"""
+#############################################################################
+filename    fakeMaya.py
+author      Iris Rahmel
+email    irisra@live.com
+
+date modified    October 18, 2026
+Brief Description:
+    This is a small pure python stand-in for the pymel, maya.cmds and
+    maya.api calls the exporter makes, so the export pipeline can be
+    benchmarked on a machine without maya. It holds a synthetic scene: a
+    skeleton under j_root whose channels are driven by constraints to
+    controls under prnt_world, inside a rig reference, plus prop
+    references the export does not need.
+    It only models what the exporter uses. Timings measure the exporter's
+    own python and numpy work, not how long maya takes to evaluate a rig.
+
+    install() puts the fake modules in sys.modules, it has to be called
+    before exportAnim is imported.
+#############################################################################
+"""
+import bisect
+import math
+import os
+import random
+import sys
+import types
+
+#channels on every transform, values are kept in maya's internal units (centimeters and radians)
+CHANNELS = ['translateX', 'translateY', 'translateZ',
+            'rotateX', 'rotateY', 'rotateZ',
+            'scaleX', 'scaleY', 'scaleZ']
+COMPOUNDS = {'translate': CHANNELS[0:3], 'rotate': CHANNELS[3:6], 'scale': CHANNELS[6:9]}
+#the curve type maya picks for each kind of channel
+CURVE_TYPES = {'translate': 'animCurveTL', 'rotate': 'animCurveTA', 'scale': 'animCurveTU'}
+
+#the scene the fake modules work on, replaced by newScene
+scene = None
+
+#------------------
+#Scene
+#------------------
+
+class FakeNode(object):
+    def __init__(self, name, nodeType, parent = None, reference = None):
+        self.name = name
+        self.type = nodeType
+        self.parent = parent
+        self.children = []
+        self.reference = reference
+        self.attrs = dict((channel, 1.0 if channel.startswith('scale') else 0.0) for channel in CHANNELS)
+        self.attrs.update({'rotateAxis': (0.0, 0.0, 0.0), 'jointOrient': (0.0, 0.0, 0.0)})
+        #channel to the node driving it, a constraint or an anim curve
+        self.inputs = {}
+        self.locked = set()
+        #constraint targets and the function that drives the constrained channels
+        self.targets = []
+        self.drive = None
+        #anim curve keys
+        self.times = []
+        self.values = []
+        if parent:
+            parent.children.append(self)
+
+    def longName(self):
+        return (self.parent.longName() if self.parent else '') + '|' + self.name
+
+    def isTransform(self):
+        return self.type in ['transform', 'joint']
+
+    #whether the node is the type or derives from it, like in maya constraints and ik effectors are transforms too
+    def isA(self, nodeType):
+        if nodeType == 'transform':
+            return self.isTransform() or self.isA('constraint') or self.type == 'ikEffector'
+        if nodeType == 'constraint':
+            return self.type.endswith('Constraint')
+        return self.type == nodeType
+
+    def descendants(self):
+        found = []
+        for child in self.children:
+            found.append(child)
+            found.extend(child.descendants())
+        return found
+
+class FakeReference(object):
+    def __init__(self, refNode, path, namespace, parent = None):
+        self.refNode = refNode
+        self.path = path
+        self.namespace = namespace
+        self.parent = parent
+        #the nodes of an unloaded reference are kept here, out of the scene
+        self.unloadedNodes = None
+
+class FakeScene(object):
+    def __init__(self, path = '/fake/scene.ma'):
+        self.path = path
+        self.time = 0.0
+        self.nodes = []
+        self.references = []
+        #nodes by long name and by short name
+        self.names = {}
+
+    def add(self, node):
+        self.nodes.append(node)
+        self.names[node.longName()] = node
+        self.names.setdefault(node.name, node)
+        return node
+
+    #finds a node by long name, short name or plug path
+    def find(self, name):
+        name = str(name).split('.')[0]
+        if name not in self.names:
+            raise ValueError('no object matches name: %s' % name)
+        return self.names[name]
+
+    def remove(self, node):
+        for child in list(node.children):
+            self.remove(child)
+        if node.parent:
+            node.parent.children.remove(node)
+        for other in self.nodes:
+            for channel, source in list(other.inputs.items()):
+                if source is node:
+                    #the channel keeps the value it had when the driver went away
+                    other.attrs[channel] = self.evaluate(other, channel)
+                    del other.inputs[channel]
+        self.nodes.remove(node)
+        for name in [node.longName(), node.name]:
+            if self.names.get(name) is node:
+                del self.names[name]
+
+    #returns a channel's value in internal units at a time, the current time by default
+    def evaluate(self, node, channel, time = None):
+        time = self.time if time is None else time
+        source = node.inputs.get(channel)
+        if source is None:
+            return node.attrs[channel]
+        if source.drive:
+            return source.drive(node, channel, time)
+        return evaluateCurve(source, time)
+
+    #takes a reference's nodes out of the scene without touching their connections, they come back when it is loaded
+    def unloadReference(self, reference):
+        reference.unloadedNodes = [node for node in self.nodes if node.reference == reference.refNode]
+        for node in reference.unloadedNodes:
+            self.nodes.remove(node)
+            for name in [node.longName(), node.name]:
+                if self.names.get(name) is node:
+                    del self.names[name]
+
+    def loadReference(self, reference):
+        for node in reference.unloadedNodes:
+            self.add(node)
+        reference.unloadedNodes = None
+
+    def transformsBelow(self, root):
+        return [root] + [node for node in root.descendants() if node.isTransform()]
+
+#linear interpolation between a curve's keys
+def evaluateCurve(curve, time):
+    index = bisect.bisect_left(curve.times, time)
+    if index < len(curve.times) and curve.times[index] == time:
+        return curve.values[index]
+    if index == 0:
+        return curve.values[0]
+    if index == len(curve.times):
+        return curve.values[-1]
+    t0, t1 = curve.times[index - 1], curve.times[index]
+    v0, v1 = curve.values[index - 1], curve.values[index]
+    return v0 + (v1 - v0) * (time - t0) / (t1 - t0)
+
+#makes a drive function that moves each constrained channel on its own sine wave
+def makeDrive(rng):
+    waves = {}
+    for channel in CHANNELS[:6]:
+        scale = 5.0 if channel.startswith('translate') else 0.5
+        waves[channel] = (rng.uniform(-scale, scale), rng.uniform(0.02, 0.2), rng.uniform(0, math.pi))
+    def drive(node, channel, time):
+        amplitude, speed, phase = waves[channel]
+        return node.attrs[channel] + amplitude * math.sin(speed * time + phase)
+    return drive
+
+#builds a synthetic scene and makes it the one the fake modules use
+def newScene(jointCount = 60, depth = 8, referenceCount = 3, seed = 1):
+    global scene
+    rng = random.Random(seed)
+    scene = FakeScene()
+    rigRef = FakeReference('rigRN', '/fake/rigs/rig.ma', 'rig')
+    scene.references.append(rigRef)
+
+    world = scene.add(FakeNode('prnt_world', 'transform', reference = rigRef.refNode))
+    joints = []
+    depths = []
+    for i in range(jointCount):
+        #parents are picked from joints that are not already at the deepest level
+        candidates = [j for j, d in zip(joints, depths) if d < depth - 1]
+        parent = rng.choice(candidates) if candidates else None
+        joint = scene.add(FakeNode('j_root' if i == 0 else 'j_%03d' % i, 'joint', parent, rigRef.refNode))
+        joint.attrs['translateX'] = 0.0 if i == 0 else rng.uniform(2.0, 10.0)
+        joints.append(joint)
+        depths.append(depths[joints.index(parent)] + 1 if parent else 0)
+
+        ctrl = scene.add(FakeNode('ctrl_%03d' % i, 'transform', world, rigRef.refNode))
+        constraint = scene.add(FakeNode('%s_parentConstraint1' % joint.name, 'parentConstraint', joint, rigRef.refNode))
+        constraint.targets = [ctrl]
+        constraint.drive = makeDrive(rng)
+        for channel in CHANNELS[:6]:
+            joint.inputs[channel] = constraint
+
+    #props, cameras and sets that are not part of the skeleton
+    for r in range(referenceCount):
+        propRef = FakeReference('prop%dRN' % r, '/fake/props/prop%d.ma' % r, 'prop%d' % r)
+        scene.references.append(propRef)
+        group = scene.add(FakeNode('prop%d_grp' % r, 'transform', reference = propRef.refNode))
+        for p in range(10):
+            scene.add(FakeNode('prop%d_geo%d' % (r, p), 'transform', group, propRef.refNode))
+    return scene
+
+#------------------
+#pymel.core
+#------------------
+
+class FakePyNode(object):
+    def __init__(self, node):
+        self.node = node if isinstance(node, FakeNode) else scene.find(node)
+
+    def __str__(self):
+        return self.node.longName()
+
+    def __eq__(self, other):
+        return str(self) == str(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(str(self))
+
+    def name(self):
+        return self.node.name
+
+    def longName(self):
+        return self.node.longName()
+
+    def isReferenced(self):
+        return self.node.reference is not None
+
+class FakeRefNode(object):
+    def __init__(self, name):
+        self.refName = name
+
+    def name(self):
+        return self.refName
+
+class FakeFileReference(object):
+    def __init__(self, reference):
+        self.reference = reference
+        self.refNode = FakeRefNode(reference.refNode)
+        self.path = reference.path
+
+    def isLoaded(self):
+        return self.reference.unloadedNodes is None
+
+    def load(self, **kwargs):
+        if not self.isLoaded():
+            scene.loadReference(self.reference)
+
+    def importContents(self):
+        for node in scene.nodes:
+            if node.reference == self.reference.refNode:
+                node.reference = None
+        for child in scene.references:
+            if child.parent is self.reference:
+                child.parent = None
+        scene.references.remove(self.reference)
+
+    #takes the reference and the ones nested in it out of the scene with their nodes
+    def remove(self):
+        removed = [self.reference]
+        for child in scene.references:
+            parent = child.parent
+            while parent is not None and parent not in removed:
+                parent = parent.parent
+            if parent is not None:
+                removed.append(child)
+        refNodes = [reference.refNode for reference in removed]
+        for node in [node for node in scene.nodes if node.reference in refNodes]:
+            if node in scene.nodes:
+                scene.remove(node)
+        for reference in removed:
+            scene.references.remove(reference)
+
+def pmListReferences(recursive = False, **kwargs):
+    return [FakeFileReference(ref) for ref in scene.references if recursive or ref.parent is None]
+
+#opening with loadReferenceDepth none leaves every reference unloaded, the fake scene is the one already built
+def pmOpenFile(path, loadReferenceDepth = None, **kwargs):
+    if loadReferenceDepth == 'none':
+        for reference in scene.references:
+            if reference.unloadedNodes is None:
+                scene.unloadReference(reference)
+
+#the fake scene has no connections between references, so there are no connection edits
+def pmReferenceQuery(name, referenceNode = False, parent = False, editStrings = False, **kwargs):
+    if editStrings:
+        return []
+    if parent:
+        for ref in scene.references:
+            if ref.refNode == str(name):
+                return ref.parent.refNode if ref.parent else None
+        return None
+    return scene.find(name).reference
+
+def pmListConnections(name, source = True, destination = True, type = None):
+    if isinstance(name, list):
+        found = []
+        for each in name:
+            found.extend(n for n in pmListConnections(each, source, destination, type) if n not in found)
+        return found
+    name = str(name)
+    node = scene.find(name)
+    if name.endswith('.target'):
+        #the constraint's own weights feed its target list as well as the targets
+        return [FakePyNode(target) for target in node.targets] + [FakePyNode(node)]
+    found = []
+    if source:
+        for source in node.inputs.values():
+            if type is None or source.type == type or (type == 'constraint' and source.type.endswith('Constraint')):
+                if source not in found:
+                    found.append(source)
+    return [FakePyNode(n) for n in found]
+
+def pmListRelatives(name, allDescendents = False, allParents = False, type = None, **kwargs):
+    node = scene.find(name)
+    if allParents:
+        return [FakePyNode(node.parent)] if node.parent else []
+    nodes = node.descendants() if allDescendents else list(node.children)
+    if type is not None:
+        types = type if isinstance(type, list) else [type]
+        nodes = [n for n in nodes if any(n.isA(t) for t in types)]
+    return [FakePyNode(n) for n in nodes]
+
+def pmBakeResults(root, sm = True, hi = 'below', t = (0, 1), **kwargs):
+    start, end = int(t[0]), int(t[1])
+    for node in scene.transformsBelow(scene.find(root)):
+        for channel in CHANNELS:
+            values = [scene.evaluate(node, channel, frame) for frame in range(start, end + 1)]
+            makeCurve(node, channel, list(range(start, end + 1)), values)
+
+def pmKeyframe(name, hierarchy = None, query = False, keyframeCount = False, **kwargs):
+    nodes = scene.transformsBelow(scene.find(name)) if hierarchy == 'below' else [scene.find(name)]
+    return sum(len(source.times) for node in nodes for source in node.inputs.values() if source.drive is None)
+
+def pmLs(name = None, type = None, **kwargs):
+    if name is not None:
+        return [FakePyNode(n) for n in scene.nodes if n.name == str(name).split('|')[-1]]
+    return [FakePyNode(n) for n in scene.nodes
+            if type is None or n.type == type or (type == 'constraint' and n.type.endswith('Constraint'))]
+
+def pmCreateNode(nodeType, name = None, **kwargs):
+    base = name or nodeType
+    name = base
+    number = 1
+    #maya numbers a new node when its name is taken
+    while name in scene.names:
+        name = '%s%d' % (base, number)
+        number += 1
+    return FakePyNode(scene.add(FakeNode(name, nodeType)))
+
+def pmObjExists(name):
+    return len(pmLs(name)) > 0
+
+def pmDelete(*names, **kwargs):
+    if kwargs.get('staticChannels'):
+        for node in scene.transformsBelow(scene.find(names[0])):
+            for channel, source in list(node.inputs.items()):
+                if source.drive is None and max(source.values) - min(source.values) <= 1e-9:
+                    #the curve only drives this channel, so it is taken off without scene.remove searching every node
+                    node.attrs[channel] = source.values[0]
+                    del node.inputs[channel]
+                    scene.nodes.remove(source)
+                    scene.names.pop(source.longName(), None)
+                    scene.names.pop(source.name, None)
+        return
+    if kwargs.get('all') and kwargs.get('cn'):
+        names = [n for n in scene.nodes if n.type.endswith('Constraint')]
+    #pymel takes a list of nodes as well as separate arguments
+    names = [n for name in names for n in (name if isinstance(name, list) else [name])]
+    for name in names:
+        node = name if isinstance(name, FakeNode) else scene.find(name)
+        if node in scene.nodes:
+            scene.remove(node)
+
+#writes a stand-in file with one line per node so the save has some cost and the file exists
+#like maya it adds the extension to a path without one and returns the path with forward slashes
+def pmSaveAs(path, type = 'mayaAscii', **kwargs):
+    if not os.path.splitext(path)[1]:
+        path += '.mb' if type == 'mayaBinary' else '.ma'
+    path = path.replace('\\', '/')
+    with open(path, 'w') as f:
+        for node in scene.nodes:
+            f.write('%s %s %d\n' % (node.type, node.longName(), len(node.times)))
+    return path
+
+def makeCurve(node, channel, times, values):
+    group = [g for g in COMPOUNDS if channel.startswith(g)][0]
+    curve = scene.add(FakeNode('%s_%s' % (node.name, channel), CURVE_TYPES[group]))
+    curve.times = list(times)
+    curve.values = list(values)
+    node.inputs[channel] = curve
+    return curve
+
+#------------------
+#maya.cmds
+#------------------
+
+def cmdsListRelatives(name, allDescendents = False, type = None, fullPath = False, **kwargs):
+    nodes = [FakeNode.longName(n) for n in scene.find(name).descendants() if type is None or n.isA(type)]
+    #maya lists the deepest nodes first
+    return list(reversed(nodes))
+
+def cmdsLs(names, long = False, type = None, **kwargs):
+    names = names if isinstance(names, list) else [names]
+    nodes = [scene.find(name) for name in names]
+    types = type if isinstance(type, list) else [type]
+    return [node.longName() for node in nodes if type is None or any(node.isA(t) for t in types)]
+
+#splits a plug name into its node and attribute
+def splitPlug(plug):
+    name, attr = plug.rsplit('.', 1)
+    return scene.find(name), attr
+
+def toUiUnits(channel, value):
+    return math.degrees(value) if channel.startswith('rotate') else value
+
+def cmdsKeyframe(plug, query = False, valueChange = False, time = None, **kwargs):
+    node, channel = splitPlug(plug)
+    curve = node.inputs.get(channel)
+    if curve is None or curve.drive:
+        return None
+    return [toUiUnits(channel, v) for t, v in zip(curve.times, curve.values) if time[0] <= t <= time[1]]
+
+def cmdsGetAttr(plug, time = None):
+    node, attr = splitPlug(plug)
+    if attr in COMPOUNDS:
+        return [tuple(toUiUnits(channel, scene.evaluate(node, channel, time)) for channel in COMPOUNDS[attr])]
+    if attr in ['rotateAxis', 'jointOrient']:
+        return [node.attrs[attr]]
+    if attr == 'rotateOrder':
+        return 0
+    if attr == 'segmentScaleCompensate':
+        return True
+    if attr == 'radius':
+        return 1.0
+    return toUiUnits(attr, scene.evaluate(node, attr, time))
+
+def cmdsNodeType(name):
+    return scene.find(name).type
+
+def cmdsAbout(version = False):
+    return '2018'
+
+def cmdsCurrentUnit(query = False, time = False, **kwargs):
+    return 'film'
+
+#------------------
+#maya.api.OpenMaya and OpenMayaAnim
+#------------------
+
+class MObject(object):
+    def __init__(self, node):
+        self.fakeNode = node
+
+    def hasFn(self, fn):
+        return fn == MFn.kAnimCurve and self.fakeNode.type.startswith('animCurve')
+
+class MFn(object):
+    kAnimCurve = 'kAnimCurve'
+
+class MSelectionList(object):
+    def __init__(self):
+        self.items = []
+
+    def add(self, name):
+        self.items.append(scene.find(name))
+
+    def getDependNode(self, index):
+        return MObject(self.items[index])
+
+class MPlug(object):
+    def __init__(self, node, channel):
+        self.fakeNode = node
+        self.channel = channel
+
+    @property
+    def isKeyable(self):
+        return True
+
+    @property
+    def isLocked(self):
+        return self.channel in self.fakeNode.locked
+
+    @property
+    def isDestination(self):
+        return self.channel in self.fakeNode.inputs
+
+    def source(self):
+        return MPlug(self.fakeNode.inputs[self.channel], 'output')
+
+    def node(self):
+        return MObject(self.fakeNode)
+
+    def asDouble(self):
+        return scene.evaluate(self.fakeNode, self.channel)
+
+    def setDouble(self, value):
+        self.fakeNode.attrs[self.channel] = value
+
+class MFnDependencyNode(object):
+    def __init__(self, mobject):
+        self.fakeNode = mobject.fakeNode
+
+    def name(self):
+        return self.fakeNode.name
+
+    def findPlug(self, channel, wantNetworkedPlug):
+        return MPlug(self.fakeNode, channel)
+
+class MTime(object):
+    def __init__(self, value = 0.0, unit = 'film'):
+        self.value = value
+
+    @staticmethod
+    def uiUnit():
+        return 'film'
+
+class MTimeArray(list):
+    pass
+
+class MDGModifier(object):
+    def __init__(self):
+        self.disconnects = []
+        self.deletes = []
+
+    def disconnect(self, source, destination):
+        self.disconnects.append(destination)
+
+    def deleteNode(self, mobject):
+        self.deletes.append(mobject.fakeNode)
+
+    def doIt(self):
+        for plug in self.disconnects:
+            plug.fakeNode.inputs.pop(plug.channel, None)
+        for node in self.deletes:
+            if node in scene.nodes:
+                scene.remove(node)
+
+class MDistance(object):
+    def __init__(self, value, unit = 'cm'):
+        self.value = value
+
+    @staticmethod
+    def uiUnit():
+        return 'cm'
+
+    def asCentimeters(self):
+        return self.value
+
+class MAngle(object):
+    def __init__(self, value, unit = 'degrees'):
+        self.value = value
+
+    @staticmethod
+    def uiUnit():
+        return 'degrees'
+
+    def asRadians(self):
+        return math.radians(self.value)
+
+    def asDegrees(self):
+        return self.value
+
+class MAnimControl(object):
+    @staticmethod
+    def currentTime():
+        return MTime(scene.time)
+
+    @staticmethod
+    def setCurrentTime(time):
+        scene.time = time.value
+
+class MFnAnimCurve(object):
+    kTangentGlobal = 0
+    kTangentLinear = 2
+
+    def __init__(self):
+        self.curve = None
+
+    def create(self, plug):
+        self.curve = makeCurve(plug.fakeNode, plug.channel, [], [])
+        return MObject(self.curve)
+
+    def addKeys(self, times, values, tangentInType = 0, tangentOutType = 0):
+        self.curve.times.extend(t.value for t in times)
+        self.curve.values.extend(values)
+
+#------------------
+#Install
+#------------------
+
+#makes a module object holding the given functions and classes
+def makeModule(name, members):
+    module = types.ModuleType(name)
+    module.__dict__.update(members)
+    module.__file__ = os.path.abspath(__file__)
+    return module
+
+#puts the fake maya modules in sys.modules so the exporter imports them
+def install():
+    pymelCore = makeModule('pymel.core', {
+        'PyNode': FakePyNode, 'listReferences': pmListReferences, 'referenceQuery': pmReferenceQuery,
+        'listConnections': pmListConnections, 'listRelatives': pmListRelatives, 'bakeResults': pmBakeResults,
+        'keyframe': pmKeyframe, 'ls': pmLs, 'delete': pmDelete, 'saveAs': pmSaveAs,
+        'openFile': pmOpenFile, 'workspace': lambda *args, **kwargs: None, 'objExists': pmObjExists, 'createNode': pmCreateNode, 'sceneName': lambda: scene.path,
+    })
+    cmds = makeModule('maya.cmds', {
+        'listRelatives': cmdsListRelatives, 'ls': cmdsLs, 'keyframe': cmdsKeyframe, 'getAttr': cmdsGetAttr,
+        'nodeType': cmdsNodeType, 'about': cmdsAbout, 'currentUnit': cmdsCurrentUnit, 'objExists': pmObjExists,
+    })
+    openMaya = makeModule('maya.api.OpenMaya', {
+        'MFn': MFn, 'MSelectionList': MSelectionList, 'MFnDependencyNode': MFnDependencyNode,
+        'MTime': MTime, 'MTimeArray': MTimeArray, 'MDGModifier': MDGModifier,
+        'MDistance': MDistance, 'MAngle': MAngle,
+    })
+    openMayaAnim = makeModule('maya.api.OpenMayaAnim', {'MAnimControl': MAnimControl, 'MFnAnimCurve': MFnAnimCurve})
+    pymel = makeModule('pymel', {'core': pymelCore})
+    mayaApi = makeModule('maya.api', {'OpenMaya': openMaya, 'OpenMayaAnim': openMayaAnim})
+    maya = makeModule('maya', {'cmds': cmds, 'api': mayaApi})
+    sys.modules.update({
+        'pymel': pymel, 'pymel.core': pymelCore,
+        'maya': maya, 'maya.cmds': cmds, 'maya.api': mayaApi,
+        'maya.api.OpenMaya': openMaya, 'maya.api.OpenMayaAnim': openMayaAnim,
+    })
@@ -0,0 +1,83 @@
+"""
+#############################################################################
+filename    keyReduce.py
+author      Iris Rahmel
+email    irisra@live.com
+
+date modified    October 18, 2026
+Brief Description:
+    This removes redundant keys from a baked AnimClip. A key is removed
+    when linear interpolation between the keys that are left stays within
+    the tolerance of the baked value, per channel type.
+#############################################################################
+"""
+import numpy as np
+
+import animClip
+
+#how far a reduced curve may move from the baked value for each channel type
+DEFAULT_TOLERANCES = {'translate': 0.01, 'rotate': 0.05, 'scale': 0.001}
+
+#returns a mask of the keys to keep on one curve and the largest error the reduction adds
+def reduceCurve(values, tolerance):
+    values = np.asarray(values, dtype = np.float64)
+    frameCount = len(values)
+    keep = np.ones(frameCount, dtype = bool)
+    if frameCount <= 2:
+        return keep, 0.0
+
+    frames = np.arange(frameCount, dtype = np.float64)
+    parity = 0
+    #stops once dropping either the odd or the even keys has nothing left to remove
+    stalled = 0
+    while stalled < 2:
+        keptIndices = np.flatnonzero(keep)
+        #every other inner key, so each dropped key still has both of its neighbours
+        drop = keptIndices[1:-1][parity::2]
+        parity = 1 - parity
+        if len(drop) == 0:
+            stalled += 1
+            continue
+
+        trial = keep.copy()
+        trial[drop] = False
+        trialIndices = np.flatnonzero(trial)
+        error = np.abs(np.interp(frames, trialIndices, values[trialIndices]) - values)
+        #largest error between each kept key and the next one
+        spanError = np.maximum.reduceat(error, trialIndices)
+        span = np.searchsorted(trialIndices, drop) - 1
+        restore = drop[spanError[span] > tolerance]
+        if len(restore) == len(drop):
+            stalled += 1
+            continue
+        trial[restore] = True
+        keep = trial
+        stalled = 0
+
+    keptIndices = np.flatnonzero(keep)
+    maxError = np.abs(np.interp(frames, keptIndices, values[keptIndices]) - values).max()
+    return keep, float(maxError)
+
+#reduces every baked curve of a clip, returns the keep mask shaped like clip.values and a report per joint
+def reduceClip(clip, tolerances = None):
+    limits = dict(DEFAULT_TOLERANCES)
+    limits.update(tolerances or {})
+    groups = [animClip.channelGroup(channel) for channel in clip.channels]
+    #the clip holds rotations in radians
+    scales = np.array([np.radians(1.0) if group == 'rotate' else 1.0 for group in groups])
+
+    keep = np.zeros(clip.values.shape, dtype = bool)
+    report = []
+    for j, joint in enumerate(clip.joints):
+        jointReport = {'joint': joint, 'keysBefore': 0, 'keysRemoved': 0,
+                       'maxError': dict((group, 0.0) for group in limits)}
+        for c, group in enumerate(groups):
+            if not clip.keyed[j, c] or clip.static[j, c]:
+                continue
+            curveKeep, error = reduceCurve(clip.values[j, c], limits[group] * scales[c])
+            keep[j, c] = curveKeep
+            jointReport['keysBefore'] += clip.frameCount
+            jointReport['keysRemoved'] += clip.frameCount - int(curveKeep.sum())
+            jointReport['maxError'][group] = max(jointReport['maxError'][group], float(error / scales[c]))
+        report.append(jointReport)
+    return keep, report
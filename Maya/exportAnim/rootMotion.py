@@ -0,0 +1,109 @@
+"""
+#############################################################################
+filename    rootMotion.py
+author      Iris Rahmel
+email    irisra@live.com
+
+date modified    October 18, 2026
+Brief Description:
+    This takes root motion out of a baked AnimClip. The root joint's
+    movement across the ground and its heading are moved onto a separate
+    "root_motion" track, and the root is left with its height and the rest
+    of its rotation. Maya's y up axis is assumed.
+#############################################################################
+"""
+import numpy as np
+
+import animClip
+
+#name of the track the root motion is put on
+TRACK_NAME = 'root_motion'
+#maya's rotateOrder enum, the first axis in each is applied first
+ROTATE_ORDERS = ['xyz', 'yzx', 'zxy', 'xzy', 'yxz', 'zyx']
+#the axis the character faces down, its heading on the ground is the yaw that is taken out
+FORWARD_AXIS = 'z'
+
+#returns rotation matrices around one axis for an array of angles in radians, for row vectors like maya uses
+def axisMatrices(axis, angles):
+    angles = np.asarray(angles, dtype = np.float64)
+    cos = np.cos(angles)
+    sin = np.sin(angles)
+    matrices = np.zeros(angles.shape + (3, 3))
+    a, b = [(1, 2), (2, 0), (0, 1)][axis]
+    matrices[..., axis, axis] = 1.0
+    matrices[..., a, a] = cos
+    matrices[..., a, b] = sin
+    matrices[..., b, a] = -sin
+    matrices[..., b, b] = cos
+    return matrices
+
+#returns rotation matrices for euler angles shaped (frames, 3) in radians, applied in the rotate order given
+def eulerToMatrix(angles, order = 'xyz'):
+    angles = np.asarray(angles, dtype = np.float64).reshape(-1, 3)
+    matrix = None
+    for axisName in order:
+        axis = 'xyz'.index(axisName)
+        rotation = axisMatrices(axis, angles[:, axis])
+        matrix = rotation if matrix is None else np.matmul(matrix, rotation)
+    return matrix
+
+#returns euler angles shaped (frames, 3) in radians for rotation matrices in the rotate order given
+def matrixToEuler(matrices, order = 'xyz'):
+    i, j, k = ['xyz'.index(axisName) for axisName in order]
+    #orders that are not a rotation of xyz flip the signs
+    sign = 1.0 if (i, j, k) in [(0, 1, 2), (1, 2, 0), (2, 0, 1)] else -1.0
+    angles = np.zeros(matrices.shape[:-2] + (3,))
+    angles[..., i] = np.arctan2(sign * matrices[..., j, k], matrices[..., k, k])
+    angles[..., j] = np.arcsin(np.clip(-sign * matrices[..., i, k], -1.0, 1.0))
+    angles[..., k] = np.arctan2(sign * matrices[..., i, j], matrices[..., i, i])
+    return angles
+
+#makes euler angles continuous over time, starting on the same turn as the curve they replace
+def matchTurns(angles, original):
+    angles = np.unwrap(angles, axis = 0)
+    turns = np.round((original[0] - angles[0]) / (2.0 * np.pi))
+    return angles + turns * 2.0 * np.pi
+
+#moves the root's ground movement and heading onto a track of its own
+#the root is the clip's first joint, rotateOrder is maya's enum, jointOrient and rotateAxis are in radians
+#returns a new clip with the track added as the first joint and the root's curves changed
+def extractRootMotion(clip, rotateOrder = 0, jointOrient = (0.0, 0.0, 0.0), rotateAxis = (0.0, 0.0, 0.0),
+                      forwardAxis = FORWARD_AXIS):
+    order = ROTATE_ORDERS[rotateOrder]
+    translateIndices = [clip.channels.index(channel) for channel in animClip.CHANNELS[0:3]]
+    rotateIndices = [clip.channels.index(channel) for channel in animClip.CHANNELS[3:6]]
+    translate = clip.values[0, translateIndices].T
+    rotate = clip.values[0, rotateIndices].T
+
+    #the root's rotation in its parent's space, rotate axis then rotate then joint orient
+    axisMatrix = eulerToMatrix(rotateAxis)
+    orientMatrix = eulerToMatrix(jointOrient)
+    rotation = np.matmul(np.matmul(axisMatrix, eulerToMatrix(rotate, order)), orientMatrix)
+    #the heading of the forward axis on the ground
+    forward = rotation[:, 'xyz'.index(forwardAxis), :]
+    yaw = np.unwrap(np.arctan2(forward[:, 0], forward[:, 2]))
+
+    #what is left once the track is taken off, the root's matrix times the track's inverse
+    unYaw = axisMatrices(1, -yaw)
+    planar = translate * np.array([1.0, 0.0, 1.0])
+    rootTranslate = np.matmul((translate - planar)[:, np.newaxis, :], unYaw)[:, 0, :]
+    rootRotation = np.matmul(np.matmul(np.linalg.inv(axisMatrix), np.matmul(rotation, unYaw)), np.linalg.inv(orientMatrix))
+    rootRotate = matchTurns(matrixToEuler(rootRotation, order), rotate)
+
+    values = np.empty((len(clip.joints) + 1,) + clip.values.shape[1:], dtype = np.float64)
+    values[1:] = clip.values
+    values[1, translateIndices] = rootTranslate.T
+    values[1, rotateIndices] = rootRotate.T
+    #the track only moves on the ground and turns around y
+    track = np.zeros((len(clip.channels), clip.frameCount))
+    for c, channel in enumerate(clip.channels):
+        if animClip.channelGroup(channel) == 'scale':
+            track[c] = 1.0
+    track[clip.channels.index('translateX')] = planar[:, 0]
+    track[clip.channels.index('translateZ')] = planar[:, 2]
+    track[clip.channels.index('rotateY')] = yaw
+    values[0] = track
+
+    keyed = np.vstack([np.ones((1, len(clip.channels)), dtype = bool), clip.keyed])
+    keyed[1, translateIndices + rotateIndices] = True
+    return animClip.AnimClip([TRACK_NAME] + clip.joints, clip.startFrame, values, clip.channels, keyed)
@@ -0,0 +1,147 @@
+"""
+#############################################################################
+filename    skeletonFile.py
+author      Iris Rahmel
+email    irisra@live.com
+
+date modified    October 18, 2026
+Brief Description:
+    This writes the skinning skeleton under the root joint and its baked
+    curves straight to a maya ascii file, without importing, baking or
+    deleting anything in the working scene.
+#############################################################################
+"""
+import math
+
+import maya.api.OpenMaya as om
+import maya.cmds as cmds
+import numpy as np
+
+import animClip
+
+#animCurve node type for each kind of channel
+CURVE_TYPES = {'translate': 'animCurveTL', 'rotate': 'animCurveTA', 'scale': 'animCurveTU'}
+#the tangentType enum value maya ascii files use for linear tangents
+LINEAR_TANGENT = 2
+#how many keys are written on one line of a curve's setAttr
+KEYS_PER_LINE = 8
+
+#reads what the file needs about each joint, besides its curves
+def readSkeleton(joints):
+    rootParent = joints[0].rsplit('|', 1)[0]
+    #getAttr gives the scene's units, the file is written in centimeters and degrees
+    toCentimeters = om.MDistance(1.0, om.MDistance.uiUnit()).asCentimeters()
+    toDegrees = om.MAngle(1.0, om.MAngle.uiUnit()).asDegrees()
+    getVector = lambda attr, scale = 1.0: [v * scale for v in cmds.getAttr(attr)[0]]
+    indices = dict((joint, i) for i, joint in enumerate(joints))
+    skeleton = []
+    for joint in joints:
+        nodeType = cmds.nodeType(joint)
+        info = {
+            #paths start from the root, whatever the root was parented to is left out
+            'path': animClip.stripNamespaces(joint[len(rootParent):]),
+            'parent': indices.get(joint.rsplit('|', 1)[0], -1),
+            'type': nodeType,
+            'rotateOrder': cmds.getAttr(joint + '.rotateOrder'),
+            #the values for channels that were not baked
+            'translate': getVector(joint + '.translate', toCentimeters),
+            'rotate': getVector(joint + '.rotate', toDegrees),
+            'scale': getVector(joint + '.scale'),
+            'rotateAxis': getVector(joint + '.rotateAxis', toDegrees),
+        }
+        if nodeType == 'joint':
+            info['jointOrient'] = getVector(joint + '.jointOrient', toDegrees)
+            info['segmentScaleCompensate'] = cmds.getAttr(joint + '.segmentScaleCompensate')
+            info['radius'] = cmds.getAttr(joint + '.radius')
+        skeleton.append(info)
+    return skeleton
+
+def formatVector(values):
+    return ' '.join('%.9g' % v for v in values)
+
+#writes the skeleton and the clip's curves to a maya ascii file, keep picks the keys to write like keyReduce does
+def writeScene(path, skeleton, clip, keep = None, mayaVersion = '2018', timeUnit = 'film'):
+    lines = [
+        '//Maya ASCII %s scene' % mayaVersion,
+        'requires maya "%s";' % mayaVersion,
+        #values are written in maya's internal distance unit and in degrees
+        'currentUnit -l centimeter -a degree -t %s;' % timeUnit,
+    ]
+    #the value of a static curve replaces the joint's own value for that channel
+    skeleton = [dict(info) for info in skeleton]
+    for j, c in zip(*np.nonzero(clip.static & clip.keyed)):
+        channel = clip.channels[c]
+        group = animClip.channelGroup(channel)
+        value = clip.values[j, c, 0] * (180.0 / math.pi if group == 'rotate' else 1.0)
+        skeleton[j][group] = list(skeleton[j][group])
+        skeleton[j][group]['XYZ'.index(channel[-1])] = value
+
+    for info in skeleton:
+        name = info['path'].rsplit('|', 1)[-1]
+        if info['parent'] < 0:
+            lines.append('createNode %s -n "%s";' % (info['type'], name))
+        else:
+            lines.append('createNode %s -n "%s" -p "%s";' % (info['type'], name, skeleton[info['parent']]['path']))
+        lines.append('\tsetAttr ".t" -type "double3" %s ;' % formatVector(info['translate']))
+        lines.append('\tsetAttr ".r" -type "double3" %s ;' % formatVector(info['rotate']))
+        lines.append('\tsetAttr ".s" -type "double3" %s ;' % formatVector(info['scale']))
+        lines.append('\tsetAttr ".ro" %d;' % info['rotateOrder'])
+        lines.append('\tsetAttr ".ra" -type "double3" %s ;' % formatVector(info['rotateAxis']))
+        if info['type'] == 'joint':
+            lines.append('\tsetAttr ".jo" -type "double3" %s ;' % formatVector(info['jointOrient']))
+            lines.append('\tsetAttr ".ssc" %s;' % ('yes' if info['segmentScaleCompensate'] else 'no'))
+            lines.append('\tsetAttr ".radi" %.9g;' % info['radius'])
+
+    connections = []
+    usedNames = set()
+    frames = clip.frames()
+    for j, info in enumerate(skeleton):
+        shortName = info['path'].rsplit('|', 1)[-1]
+        for c, channel in enumerate(clip.channels):
+            if not clip.keyed[j, c] or clip.static[j, c]:
+                continue
+            group = animClip.channelGroup(channel)
+            curveName = '%s_%s' % (shortName, channel)
+            if curveName in usedNames:
+                curveName = '%s_%d' % (curveName, j)
+            usedNames.add(curveName)
+
+            indices = np.arange(clip.frameCount) if keep is None else np.flatnonzero(keep[j, c])
+            values = clip.values[j, c, indices]
+            #the clip holds radians
+            if group == 'rotate':
+                values = values * (180.0 / math.pi)
+            lines.append('createNode %s -n "%s";' % (CURVE_TYPES[group], curveName))
+            lines.append('\tsetAttr ".tan" %d;' % LINEAR_TANGENT)
+            lines.append('\tsetAttr ".wgt" no;')
+            keys = ['%.9g %.9g' % (frames[i], v) for i, v in zip(indices, values)]
+            keyLines = [' '.join(keys[k:k + KEYS_PER_LINE]) for k in range(0, len(keys), KEYS_PER_LINE)]
+            lines.append('\tsetAttr -s %d ".ktv[0:%d]" %s;' % (len(keys), len(keys) - 1, '\n\t\t'.join(keyLines)))
+            connections.append('connectAttr "%s.o" "%s.%s";' % (curveName, info['path'], channel))
+        #keeps the parent's scale from reaching the child the way maya's joint tool sets it up
+        if info['type'] == 'joint' and info['parent'] >= 0 and skeleton[info['parent']]['type'] == 'joint':
+            connections.append('connectAttr "%s.s" "%s.is";' % (skeleton[info['parent']]['path'], info['path']))
+
+    lines.extend(connections)
+    lines.append('// End of %s' % path.replace('\\', '/').rsplit('/', 1)[-1])
+    with open(path, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+    return path
+
+#returns the file's info for a track that is not in the scene, a plain transform at the top of the file
+def trackInfo(name):
+    return {'path': '|' + name, 'parent': -1, 'type': 'transform', 'rotateOrder': 0, 'translate': [0.0, 0.0, 0.0],
+            'rotate': [0.0, 0.0, 0.0], 'scale': [1.0, 1.0, 1.0], 'rotateAxis': [0.0, 0.0, 0.0]}
+
+#writes the joints under the root with the clip's curves without changing the working scene
+#clip joints in front of the skeleton's joints, like a root motion track, are written as tracks of their own
+def exportSkeleton(path, joints, clip, keep = None):
+    version = cmds.about(version = True).split()[0]
+    timeUnit = cmds.currentUnit(query = True, time = True)
+    tracks = clip.joints[:len(clip.joints) - len(joints)]
+    skeleton = [trackInfo(name) for name in tracks]
+    for info in readSkeleton(joints):
+        if info['parent'] >= 0:
+            info['parent'] += len(tracks)
+        skeleton.append(info)
+    return writeScene(path, skeleton, clip, keep, version, timeUnit)